@@ -1,6 +1,16 @@
-from algorithms.bfs import bfs
+from algorithms.bfs import bfs, bidirectional_bfs
+from algorithms.vector_bfs import vector_bfs, bfs_layers
 from algorithms.dfs import dfs
 from algorithms.ids import ids
-from algorithms.astar import astar
+from algorithms.astar import astar, anytime_astar, bidirectional_astar
+from algorithms.idastar import idastar
+from algorithms.distance_table import table_solve
+from algorithms.hda import hda_star
+from algorithms.sma import sma_star
+from algorithms.control import SearchControl, SearchAborted
+from algorithms.stats import SearchStats
+from algorithms.registry import SOLVERS, get_solver
+from algorithms.cache import SolutionCache, cached
+from algorithms.store import SolutionStore, stored
 
-__all__ = ['bfs', 'dfs', 'ids', 'astar']
\ No newline at end of file
+__all__ = ['bfs', 'bidirectional_bfs', 'vector_bfs', 'bfs_layers', 'dfs', 'ids', 'astar', 'anytime_astar', 'bidirectional_astar', 'idastar', 'table_solve', 'hda_star', 'sma_star', 'SearchControl', 'SearchAborted', 'SearchStats', 'SOLVERS', 'get_solver', 'SolutionCache', 'cached', 'SolutionStore', 'stored']
\ No newline at end of file
@@ -0,0 +1,279 @@
+from array import array
+
+from logic.puzzle_state import PuzzleState, OPPOSITE
+from logic.ranking import Bitset, can_rank, state_count, board_class, rank_index, unrank_index
+from logic.moves import MOVES
+
+# 2-bit move code of each action
+MOVE_CODES = {action: code for code, action in enumerate(MOVES)}
+
+# Parent index of a root node
+NO_PARENT = -1
+
+
+# Index slot holding no node
+EMPTY = -1
+
+# Index slots of a new arena; the table doubles whenever it is half full
+INITIAL_SLOTS = 1024
+
+
+class NodeArena:
+    """
+    Compact node store for graph searches.
+
+    Node i is described by parallel typed arrays instead of Python objects:
+        boards[i*cells:(i+1)*cells]  packed board
+        parents[i]                   index of the parent node, NO_PARENT for the root
+        costs[i]                     g, the cost of the best known path to the node
+        moves                        2-bit code of the action from the parent, four per byte
+    Boards are found through an open-addressing hash table of node indices, slots,
+    probed linearly from hash(tiles) and compared against the packed board. Each board
+    is stored once, and the index costs 4 to 8 bytes per node instead of a dict entry
+    and a bytes key.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.cells = size * size
+        self.boards = bytearray()
+        self.parents = array('i')
+        self.costs = array('H')
+        self.moves = bytearray()
+        self.closed = bytearray()
+        self.slots = array('i', [EMPTY]) * INITIAL_SLOTS
+        self.mask = INITIAL_SLOTS - 1
+        # (tiles, free slot) of the last get() that missed, so add() right after it needs no probe
+        self._miss = None
+
+    def __len__(self):
+        return len(self.parents)
+
+    def __contains__(self, tiles):
+        return self.get(tiles) is not None
+
+    def _probe(self, tiles):
+        """Slot of tiles in the index, or of the empty slot where it would go, and its node or None"""
+        cells = self.cells
+        boards = self.boards
+        slots = self.slots
+        mask = self.mask
+        slot = hash(tiles) & mask
+        while True:
+            node = slots[slot]
+            if node == EMPTY:
+                return slot, None
+            # Compares in place, without slicing out a copy
+            if boards.startswith(tiles, node * cells):
+                return slot, node
+            slot = (slot + 1) & mask
+
+    def _grow(self):
+        """Double the index and re-insert every node"""
+        cells = self.cells
+        boards = self.boards
+        slots = array('i', [EMPTY]) * (len(self.slots) * 2)
+        mask = len(slots) - 1
+        for node in range(len(self.parents)):
+            start = node * cells
+            slot = hash(bytes(boards[start:start + cells])) & mask
+            while slots[slot] != EMPTY:
+                slot = (slot + 1) & mask
+            slots[slot] = node
+        self.slots = slots
+        self.mask = mask
+
+    def get(self, tiles):
+        """Node index of a packed board, or None if it has never been added"""
+        # _probe inlined: this is the hottest call of every graph search
+        cells = self.cells
+        boards = self.boards
+        slots = self.slots
+        mask = self.mask
+        slot = hash(tiles) & mask
+        while True:
+            node = slots[slot]
+            if node == EMPTY:
+                self._miss = (tiles, slot)
+                return None
+            # Compares in place, without slicing out a copy
+            if boards.startswith(tiles, node * cells):
+                return node
+            slot = (slot + 1) & mask
+
+    def discover(self, tiles, parent, cost, action):
+        """Add tiles as a new node and return its index, or None if it was already added"""
+        slot, node = self._probe(tiles)
+        if node is not None:
+            return None
+        return self._add(slot, tiles, parent, cost, action)
+
+    def add(self, tiles, parent, cost, action):
+        """Store a new node and return its index; tiles must not have been added before"""
+        miss = self._miss
+        slot = miss[1] if miss is not None and miss[0] is tiles else self._probe(tiles)[0]
+        return self._add(slot, tiles, parent, cost, action)
+
+    def _add(self, slot, tiles, parent, cost, action):
+        node = len(self.parents)
+        self.slots[slot] = node
+        self._miss = None
+        self.boards += tiles
+        self.parents.append(parent)
+        self.costs.append(cost)
+        self.closed.append(0)
+        # A new node's move bits are still zero, so they only need to be set
+        code = MOVE_CODES[action] if action is not None else 0
+        if node & 3 == 0:
+            self.moves.append(code)
+        else:
+            self.moves[node >> 2] |= code << ((node & 3) * 2)
+        if (node + 1) * 2 > len(self.slots):
+            self._grow()
+        return node
+
+    def update(self, node, parent, cost, action):
+        """Re-parent an existing node after a cheaper path to it was found"""
+        self.parents[node] = parent
+        self.costs[node] = cost
+        self._set_move(node, action)
+
+    def _set_move(self, node, action):
+        code = MOVE_CODES[action] if action is not None else 0
+        shift = (node & 3) * 2
+        byte = node >> 2
+        self.moves[byte] = (self.moves[byte] & ~(3 << shift)) | (code << shift)
+
+    def close(self, node):
+        """Mark node as expanded"""
+        self.closed[node] = 1
+
+    def is_closed(self, node):
+        return self.closed[node] == 1
+
+    def clear_closed(self):
+        """Mark every node as unexpanded again"""
+        self.closed = bytearray(len(self.closed))
+
+    def move(self, node):
+        """Action that led from the parent to node"""
+        return MOVES[(self.moves[node >> 2] >> ((node & 3) * 2)) & 3]
+
+    def tiles(self, node):
+        """Packed board of node"""
+        start = node * self.cells
+        return bytes(self.boards[start:start + self.cells])
+
+    def state(self, node):
+        """PuzzleState of node"""
+        return PuzzleState.from_tiles(self.tiles(node), self.size)
+
+    def path(self, node):
+        """Actions from the root to node, reconstructed by walking parent indices"""
+        path = []
+        parents = self.parents
+        while parents[node] != NO_PARENT:
+            path.append(self.move(node))
+            node = parents[node]
+        path.reverse()
+        return path
+
+
+class RankedArena:
+    """
+    Node store for boards small enough to rank (see logic.ranking).
+
+    A node is the rank of its board, so no board or parent index is stored:
+        seen           one bit per reachable board
+        costs[i]       g of board i, one byte
+        moves          2-bit code of the action that reached board i, four per byte
+    The parent of a board is found by undoing its recorded move.
+    """
+
+    def __init__(self, start):
+        """start: PuzzleState whose reachability class is stored"""
+        self.size = start.size
+        self.klass = board_class(start.tiles, start.size)
+        count = state_count(start.size)
+        self.seen = Bitset(count)
+        self.costs = bytearray(count)
+        self.moves = bytearray((count + 3) >> 2)
+        self.root = None
+        self.count = 0
+        # Index distance between boards whose blanks are one cell apart in the same row
+        self.blank_step = state_count(start.size) // (start.size * start.size)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, tiles):
+        return rank_index(tiles, self.size) in self.seen
+
+    def get(self, tiles):
+        """Node index of a packed board, or None if it has never been added"""
+        node = rank_index(tiles, self.size)
+        return node if node in self.seen else None
+
+    def discover(self, tiles, parent, cost, action):
+        """Add tiles as a new node and return its index, or None if it was already added"""
+        if action == "Left" and parent != NO_PARENT:
+            # A horizontal move keeps the tile sequence, so only the blank term of the index changes
+            node = parent - self.blank_step
+        elif action == "Right" and parent != NO_PARENT:
+            node = parent + self.blank_step
+        else:
+            node = rank_index(tiles, self.size)
+        if node in self.seen:
+            return None
+        return self._add(node, parent, cost, action)
+
+    def add(self, tiles, parent, cost, action):
+        """Store a new node and return its index; parent is implied by the move"""
+        return self._add(rank_index(tiles, self.size), parent, cost, action)
+
+    def _add(self, node, parent, cost, action):
+        if parent == NO_PARENT:
+            self.root = node
+        self.seen.add(node)
+        self.count += 1
+        self.update(node, parent, cost, action)
+        return node
+
+    def update(self, node, parent, cost, action):
+        """Record a new cost and move for node"""
+        self.costs[node] = cost
+        code = MOVE_CODES[action] if action is not None else 0
+        shift = (node & 3) * 2
+        byte = node >> 2
+        self.moves[byte] = (self.moves[byte] & ~(3 << shift)) | (code << shift)
+
+    def move(self, node):
+        """Action that led from the parent to node"""
+        return MOVES[(self.moves[node >> 2] >> ((node & 3) * 2)) & 3]
+
+    def tiles(self, node):
+        """Packed board of node"""
+        return unrank_index(node, self.size, self.klass)
+
+    def state(self, node):
+        """PuzzleState of node"""
+        return PuzzleState.from_tiles(self.tiles(node), self.size)
+
+    def path(self, node):
+        """Actions from the root to node, found by undoing recorded moves"""
+        path = []
+        state = self.state(node)
+        while node != self.root:
+            action = self.move(node)
+            path.append(action)
+            state = getattr(state, "move_" + OPPOSITE[action].lower())()
+            node = rank_index(state.tiles, self.size)
+        path.reverse()
+        return path
+
+
+def make_arena(start):
+    """RankedArena when the board can be ranked, NodeArena otherwise"""
+    if can_rank(start.size):
+        return RankedArena(start)
+    return NodeArena(start.size)
@@ -1,79 +1,457 @@
-import heapq
+import time
+from array import array
+from fractions import Fraction
 
-class PriorityQueue:
-    """A priority queue implementation for A* search"""
+from logic.puzzle_state import PuzzleState
+from algorithms.arena import NodeArena, NO_PARENT
+from algorithms.paths import stitch_paths
+from algorithms.control import CHECK_MASK
+
+# Tie-breaking rules among entries with equal priority
+TIE_BREAKS = ('deep', 'shallow', 'lifo')
+
+# Weight schedule of anytime_astar, ending with an optimal search
+DEFAULT_WEIGHTS = (3, 2, 1.5, 1.25, 1)
+
+
+def weight_ratio(weight):
+    """
+    Weight as a small fraction num/den, so f = g + w*h can be kept as the integer
+    key g*den + num*h for the bucket queue
+    """
+    ratio = Fraction(weight).limit_denominator(16)
+    if ratio < 1:
+        raise ValueError(f"Weight must be at least 1, got {weight}")
+    return ratio.numerator, ratio.denominator
+
+
+def require_consistent(heuristic, algorithm):
+    """
+    Raise ValueError for a heuristic marked consistent = False, such as the pattern database;
+    heuristics without the attribute are taken to be consistent
+    """
+    if not getattr(heuristic, 'consistent', True):
+        name = getattr(heuristic, '__name__', heuristic)
+        raise ValueError(f"{algorithm} needs a consistent heuristic, and {name} is only admissible")
+
+
+class BucketQueue:
+    """
+    Open list for small non-negative integer priorities such as f = g + h.
+    
+    buckets[f] holds one sub-bucket per tie-break key, so put and get are O(1)
+    amortized. Entries with equal f are popped according to tie_break:
+        'deep': largest g first (nodes further along a path)
+        'shallow': smallest g first
+        'lifo': most recently added first
+    Stale duplicates are not searched for; callers skip them when popped.
+    """
     
-    def __init__(self):
-        self.elements = []
-        self.count = 0  # Tie-breaker for equal priorities
+    def __init__(self, tie_break='deep'):
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"Unknown tie-break rule: {tie_break}")
+        self.tie_break = tie_break
+        self.buckets = []
+        self.min_f = 0  # No bucket below this index holds entries
+        self.size = 0
+        self.peak_size = 0
     
     def empty(self):
-        return len(self.elements) == 0
+        return self.size == 0
     
-    def put(self, item, priority):
-        # Add count as a tie-breaker and to make the queue stable
-        entry = (priority, self.count, item)
-        heapq.heappush(self.elements, entry)
-        self.count += 1
+    def __len__(self):
+        return self.size
+    
+    def put(self, item, priority, g=0):
+        if self.tie_break == 'deep':
+            key = g
+        elif self.tie_break == 'shallow':
+            key = priority - g
+        else:
+            key = 0
+        
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+        bucket = buckets[priority]
+        while len(bucket) <= key:
+            bucket.append([])
+        bucket[key].append(item)
+        
+        if priority < self.min_f:
+            self.min_f = priority
+        self.size += 1
+        if self.size > self.peak_size:
+            self.peak_size = self.size
+    
+    def _advance(self):
+        # Move min_f up to the first non-empty bucket
+        buckets = self.buckets
+        while not buckets[self.min_f]:
+            self.min_f += 1
     
     def get(self):
-        # Return the item (3rd element in the tuple)
-        return heapq.heappop(self.elements)[2]
-    
-    def __contains__(self, item):
-        for _, _, element in self.elements:
-            if element == item:
-                return True
-        return False
+        self._advance()
+        bucket = self.buckets[self.min_f]
+        item = bucket[-1].pop()
+        
+        # Trim empty sub-buckets so the highest key is always at the end
+        while bucket and not bucket[-1]:
+            bucket.pop()
+        self.size -= 1
+        return item
+    
+    def min_priority(self):
+        # Priority of the next item without removing it
+        self._advance()
+        return self.min_f
 
-def astar(start, goal, heuristic):
 
-    # Initialize the frontier with the start state
-    frontier = PriorityQueue()
-    frontier.put(start, 0)
+def astar(start, goal, heuristic, tie_break='deep', stats=None, weight=1, control=None):
+    """
+    A* search from start to goal ordered by f(n) = g(n) + w*h(n).
     
-    # To keep track of parent states and actions that led to them
-    parent = {start.to_tuple(): (None, None)}
+        start: The initial PuzzleState
+        goal: The goal PuzzleState
+        heuristic: Function heuristic(state, goal). If it has a delta(parent, child, goal)
+            attribute, h is updated incrementally per move instead of being recomputed.
+        tie_break: Order among equal f values, one of TIE_BREAKS
+        stats: Optional SearchStats filled in when the search ends
+        weight: Heuristic weight w >= 1. Weighted A* returns a path at most w times
+            longer than optimal, usually after far fewer expansions; 1 is plain A*.
+        control: Optional SearchControl for cancellation and budgets
     
-    # To keep track of the cost to reach each state
-    cost_so_far = {start.to_tuple(): 0}
+    Returns:
+        tuple: (path, expansions)
+    """
+    # f = g + w*h scaled by den so every priority stays an integer
+    weight_num, weight_den = weight_ratio(weight)
     
-    # Counter for number of nodes expanded
-    expansions = 0
+    # Incremental heuristic update when supported, full recomputation otherwise
+    delta = getattr(heuristic, 'delta', None)
     
-    while not frontier.empty():
-        # Get the state with the lowest f(n) = g(n) + h(n)
-        current = frontier.get()
-        expansions += 1
-        
-        # Check if we've reached the goal
-        if current == goal:
-            # Reconstruct the path
-            path = []
-            while parent[current.to_tuple()][0] is not None:
-                path.append(parent[current.to_tuple()][1])
-                current = parent[current.to_tuple()][0]
-            path.reverse()
-            return path, expansions
-        
-        # Explore all possible next states
-        for action, next_state in current.get_successors():
-            # Calculate new cost to reach this state
-            new_cost = cost_so_far[current.to_tuple()] + 1
+    # Every generated node lives in the arena; the open list only holds node indices
+    arena = NodeArena(start.size)
+    start_node = arena.add(start.tiles, NO_PARENT, 0, None)
+    costs = arena.costs
+    closed = arena.closed
+    frontier = BucketQueue(tie_break)
+    
+    # Hot calls are timed only when stats ask for it
+    get_successors = PuzzleState.get_successors
+    put, get = frontier.put, frontier.get
+    if stats is not None:
+        stats.begin()
+        get_successors = stats.timed(get_successors, 'successors')
+        put, get = stats.timed(put, 'queue'), stats.timed(get, 'queue')
+        heuristic = stats.timed(heuristic, 'heuristic')
+        if delta is not None:
+            delta = stats.timed(delta, 'heuristic')
+    
+    # Initialize the frontier with the start node and its heuristic value
+    start_h = heuristic(start, goal)
+    put((start_node, start_h, 0), weight_num * start_h, 0)
+    
+    # Counters for number of nodes expanded and for stats
+    expansions = generated = duplicates = reopened = closed_count = 0
+    
+    try:
+        while not frontier.empty():
+            # Get the node with the lowest f(n) = g(n) + w*h(n)
+            node, current_h, current_cost = get()
             
-            # If this state is new or we found a better path to it
-            if next_state.to_tuple() not in cost_so_far or new_cost < cost_so_far[next_state.to_tuple()]:
-                # Update the cost
-                cost_so_far[next_state.to_tuple()] = new_cost
+            # Skip stale entries superseded by a cheaper path to the same state
+            if current_cost > costs[node]:
+                continue
+            expansions += 1
+            if control is not None and expansions & CHECK_MASK == 0:
+                control.check(expansions, len(arena), len(frontier), current_cost + current_h)
+            if not closed[node]:
+                closed[node] = 1
+                closed_count += 1
+            current = arena.state(node)
+            
+            # Check if we've reached the goal
+            if current == goal:
+                # Reconstruct the path by walking parent indices
+                return arena.path(node), expansions
+            
+            # Calculate new cost to reach the successors of this state
+            new_cost = current_cost + 1
+            
+            # Explore all possible next states
+            for action, next_state in get_successors(current):
+                generated += 1
+                next_node = arena.get(next_state.tiles)
+                
+                # If this state is new or we found a better path to it
+                if next_node is None:
+                    next_node = arena.add(next_state.tiles, node, new_cost, action)
+                elif new_cost < costs[next_node]:
+                    arena.update(next_node, node, new_cost, action)
+                    if closed[next_node]:
+                        # Only possible with an inconsistent heuristic or a weight above 1
+                        reopened += 1
+                else:
+                    duplicates += 1
+                    continue
                 
                 # Calculate priority using the heuristic
-                priority = new_cost + heuristic(next_state, goal)
+                if delta is not None:
+                    next_h = current_h + delta(current, next_state, goal)
+                else:
+                    next_h = heuristic(next_state, goal)
+                
+                # Add to frontier, carrying h and g along with the node
+                put((next_node, next_h, new_cost), new_cost * weight_den + weight_num * next_h, new_cost)
+        
+        # If we've exhausted the frontier without finding a goal, there's no solution
+        return [], expansions
+    finally:
+        if stats is not None:
+            stats.end(expansions, generated, duplicates, reopened, frontier.peak_size, closed_count)
+
+
+def anytime_astar(start, goal, heuristic, weights=DEFAULT_WEIGHTS, time_limit=None, max_expansions=None,
+                  control=None, stats=None):
+    """
+    Anytime Repairing A* (ARA*): a series of weighted A* searches with falling weights
+    that reuse each other's work, publishing every solution as soon as it is found.
+    
+    Each search stops once the goal's key is no larger than any open key. Nodes whose
+    cost drops after they were expanded in the current search are parked in an
+    inconsistent set and reopened by the next search instead of being expanded twice.
+    The suboptimality bound of each solution is min(w, cost / min(g + h)) over the
+    nodes still open or inconsistent.
+    
+        start: The initial PuzzleState
+        goal: The goal PuzzleState
+        heuristic: Function heuristic(state, goal), optionally with a delta attribute
+        weights: Falling weights, one search each; ending with 1 proves optimality
+        time_limit: Seconds after which no further solutions are searched for
+        max_expansions: Expansion budget over all searches
+        control: Optional SearchControl; unlike the budgets above, it raises SearchAborted
+        stats: Optional SearchStats filled in when the generator finishes or is closed;
+            reopened counts nodes parked as inconsistent, extra['searches'] the weights tried
+    
+    Yields:
+        tuple: (path, bound, expansions) for each solution, where the path is at most
+            bound times longer than optimal and expansions is the running total
+    """
+    delta = getattr(heuristic, 'delta', None)
+    deadline = time.time() + time_limit if time_limit is not None else None
+    
+    get_successors = PuzzleState.get_successors
+    if stats is not None:
+        stats.begin()
+        get_successors = stats.timed(get_successors, 'successors')
+        heuristic = stats.timed(heuristic, 'heuristic')
+        if delta is not None:
+            delta = stats.timed(delta, 'heuristic')
+    
+    arena = NodeArena(start.size)
+    costs = arena.costs
+    h_values = array('H')
+    start_node = arena.add(start.tiles, NO_PARENT, 0, None)
+    h_values.append(heuristic(start, goal))
+    goal_node = start_node if start == goal else None
+    
+    # Live open nodes and nodes improved after their expansion in the current search
+    open_nodes = {start_node}
+    inconsistent = set()
+    
+    # Counters for number of nodes expanded and for stats
+    expansions = generated = duplicates = reopened = peak_open = peak_closed = searches = 0
+    
+    # Cost and bound of the last published solution
+    published = None
+    
+    try:
+        for weight in weights:
+            weight_num, weight_den = weight_ratio(weight)
+            searches += 1
+            closed_count = 0
+            
+            # Reorder the open list for the new weight, reopening inconsistent nodes
+            open_nodes |= inconsistent
+            inconsistent = set()
+            arena.clear_closed()
+            frontier = BucketQueue()
+            put, get = frontier.put, frontier.get
+            if stats is not None:
+                put, get = stats.timed(put, 'queue'), stats.timed(get, 'queue')
+            for node in open_nodes:
+                cost = costs[node]
+                put((node, cost), cost * weight_den + weight_num * h_values[node], cost)
+            
+            # Expand until no open node has a smaller key than the goal
+            while not frontier.empty():
+                if goal_node is not None and costs[goal_node] * weight_den <= frontier.min_priority():
+                    break
+                node, current_cost = get()
+                if current_cost > costs[node] or arena.is_closed(node):
+                    continue
                 
-                # Add to frontier
-                frontier.put(next_state, priority)
+                # Stop publishing once the budget runs out; the last solution stands
+                if max_expansions is not None and expansions >= max_expansions:
+                    return
+                if deadline is not None and expansions & 255 == 0 and time.time() > deadline:
+                    return
+                expansions += 1
+                if control is not None and expansions & CHECK_MASK == 0:
+                    control.check(expansions, len(arena), len(open_nodes), current_cost + h_values[node])
+                if len(open_nodes) > peak_open:
+                    peak_open = len(open_nodes)
+                open_nodes.discard(node)
+                arena.close(node)
+                closed_count += 1
                 
-                # Remember how we got to this state
-                parent[next_state.to_tuple()] = (current, action)
+                current = arena.state(node)
+                current_h = h_values[node]
+                new_cost = current_cost + 1
+                for action, next_state in get_successors(current):
+                    generated += 1
+                    next_node = arena.get(next_state.tiles)
+                    if next_node is None:
+                        if delta is not None:
+                            next_h = current_h + delta(current, next_state, goal)
+                        else:
+                            next_h = heuristic(next_state, goal)
+                        next_node = arena.add(next_state.tiles, node, new_cost, action)
+                        h_values.append(next_h)
+                        if next_state == goal:
+                            goal_node = next_node
+                    elif new_cost < costs[next_node]:
+                        arena.update(next_node, node, new_cost, action)
+                    else:
+                        duplicates += 1
+                        continue
+                    
+                    if arena.is_closed(next_node):
+                        if next_node not in inconsistent:
+                            reopened += 1
+                            inconsistent.add(next_node)
+                    else:
+                        open_nodes.add(next_node)
+                        put((next_node, new_cost),
+                            new_cost * weight_den + weight_num * h_values[next_node], new_cost)
+            
+            peak_closed = max(peak_closed, closed_count)
+            if goal_node is None:
+                # The open list ran dry without reaching the goal: there is no solution
+                return
+            
+            cost = costs[goal_node]
+            lower = min((costs[node] + h_values[node] for node in open_nodes | inconsistent), default=cost)
+            bound = max(min(float(weight), cost / lower), 1.0) if lower > 0 else 1.0
+            if (cost, bound) != published:
+                published = (cost, bound)
+                yield arena.path(goal_node), bound, expansions
+            if bound == 1.0:
+                return
+    finally:
+        if stats is not None:
+            stats.end(expansions, generated, duplicates, reopened, peak_open, peak_closed, searches=searches)
+
+
+def bidirectional_astar(start, goal, heuristic, control=None, stats=None):
+    """
+    Bidirectional A* search: one A* search from the start towards the goal and one
+    from the goal towards the start, each guided by the heuristic to its own target.
+    
+    Every time a successor is reached by both searches, the best meeting cost mu is
+    updated. The search stops once the smallest f on either open list is at least mu,
+    which keeps the result optimal for consistent heuristics (Manhattan, linear conflict).
+    
+        start: The initial PuzzleState
+        goal: The goal PuzzleState
+        heuristic: Function heuristic(state, target), optionally with a delta attribute;
+            must be consistent, so heuristics marked consistent = False raise ValueError
+        control: Optional SearchControl for cancellation and budgets
+        stats: Optional SearchStats filled in when the search ends
+    
+    Returns:
+        tuple: (path, expansions) with expansions counted on both sides
+    """
+    require_consistent(heuristic, "Bidirectional A*")
+    if stats is not None:
+        stats.begin()
+    if start == goal:
+        if stats is not None:
+            stats.end(1)
+        return [], 1
+    
+    delta = getattr(heuristic, 'delta', None)
+    get_successors = PuzzleState.get_successors
+    if stats is not None:
+        get_successors = stats.timed(get_successors, 'successors')
+        heuristic = stats.timed(heuristic, 'heuristic')
+        if delta is not None:
+            delta = stats.timed(delta, 'heuristic')
+    
+    # Index 0 is the forward search, index 1 the backward search
+    targets = [goal, start]
+    frontiers = [BucketQueue(), BucketQueue()]
+    parents = [{start.tiles: (None, None)}, {goal.tiles: (None, None)}]
+    costs = [{start.tiles: 0}, {goal.tiles: 0}]
+    for side, root in enumerate((start, goal)):
+        root_h = heuristic(root, targets[side])
+        frontiers[side].put((root, root_h, 0), root_h, 0)
     
-    # If we've exhausted the frontier without finding a goal, there's no solution
-    return [], expansions
\ No newline at end of file
+    # Cost of the best path found so far and where its halves meet
+    best_cost = float('inf')
+    meet = None
+    
+    # Counters for number of nodes expanded and for stats
+    expansions = generated = duplicates = 0
+    
+    try:
+        while not frontiers[0].empty() and not frontiers[1].empty():
+            # No unexpanded node can lead to a cheaper path any more
+            if best_cost <= max(frontiers[0].min_priority(), frontiers[1].min_priority()):
+                break
+            
+            # Expand from the side with the smaller open list
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            frontier, parent, cost_so_far = frontiers[side], parents[side], costs[side]
+            other_cost = costs[1 - side]
+            target = targets[side]
+            
+            current, current_h, current_cost = frontier.get()
+            if current_cost > cost_so_far[current.tiles]:
+                continue
+            expansions += 1
+            if control is not None and expansions & CHECK_MASK == 0:
+                control.check(expansions, len(costs[0]) + len(costs[1]),
+                              len(frontiers[0]) + len(frontiers[1]), current_cost + current_h)
+            new_cost = current_cost + 1
+            
+            for action, next_state in get_successors(current):
+                generated += 1
+                next_key = next_state.tiles
+                
+                if new_cost < cost_so_far.get(next_key, new_cost + 1):
+                    cost_so_far[next_key] = new_cost
+                    parent[next_key] = (current, action)
+                    
+                    if delta is not None:
+                        next_h = current_h + delta(current, next_state, target)
+                    else:
+                        next_h = heuristic(next_state, target)
+                    frontier.put((next_state, next_h, new_cost), new_cost + next_h, new_cost)
+                    
+                    # The other search has reached this state too
+                    if next_key in other_cost and new_cost + other_cost[next_key] < best_cost:
+                        best_cost = new_cost + other_cost[next_key]
+                        meet = next_key
+                else:
+                    duplicates += 1
+        
+        if meet is None:
+            return [], expansions
+        forward_parent, backward_parent = parents
+        return stitch_paths(forward_parent, backward_parent, meet), expansions
+    finally:
+        if stats is not None:
+            stats.end(expansions, generated, duplicates, 0,
+                      frontiers[0].peak_size + frontiers[1].peak_size, expansions)
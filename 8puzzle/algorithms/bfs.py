@@ -1,6 +1,10 @@
 from collections import deque
+from logic.puzzle_state import PuzzleState
+from algorithms.arena import make_arena, NO_PARENT
+from algorithms.paths import stitch_paths
+from algorithms.control import CHECK_MASK
 
-def bfs(start, goal, max_depth=None):
+def bfs(start, goal, max_depth=None, control=None, stats=None):
     """
     Breadth-first search algorithm to find a path from start to goal state.
     
@@ -8,54 +12,160 @@ def bfs(start, goal, max_depth=None):
         start: Starting state object
         goal: Goal state object
         max_depth: Maximum search depth (optional)
+        control: Optional SearchControl for cancellation and budgets
+        stats: Optional SearchStats filled in when the search ends
     
     Returns:
         tuple: (path, expansions) where:
             - path is a list of actions to reach the goal
             - expansions is the number of nodes expanded during search
     """
-    # Initialize the FIFO queue with the start state and its depth (0)
-    queue = deque([(start, 0)])
+    # Every discovered state lives in the arena; the FIFO queue only holds node indices.
+    # Small boards use ranked arrays, so visited tests become bitset lookups.
+    arena = make_arena(start)
+    queue = deque([arena.add(start.tiles, NO_PARENT, 0, None)])
+    depths = arena.costs
     
-    # Set to track visited states
-    visited = set([start.to_tuple()])
+    # Counters for stats
+    expansions = generated = duplicates = peak_open = 0
     
-    # Dictionary to store parent states and actions
-    parent = {start.to_tuple(): (None, None)}
-    
-    # Counter for nodes expanded
-    expansions = 0
+    # Successor generation and queue operations are timed only when stats ask for it
+    get_successors = PuzzleState.get_successors
+    popleft, append = queue.popleft, queue.append
+    if stats is not None:
+        stats.begin()
+        get_successors = stats.timed(get_successors, 'successors')
+        popleft, append = stats.timed(popleft, 'queue'), stats.timed(append, 'queue')
     
     # BFS loop
-    while queue:
-        # Get the next state and its depth from the queue
-        state, depth = queue.popleft()
-        expansions += 1
-        
-        # Goal check
-        if state == goal:
-            # Reconstruct path
-            path = []
-            current = state
-            while parent[current.to_tuple()][0] is not None:
-                path.append(parent[current.to_tuple()][1])
-                current = parent[current.to_tuple()][0]
-            path.reverse()
-            return path, expansions
+    try:
+        while queue:
+            if len(queue) > peak_open:
+                peak_open = len(queue)
+            
+            # Get the next node from the queue
+            node = popleft()
+            state = arena.state(node)
+            expansions += 1
+            if control is not None and expansions & CHECK_MASK == 0:
+                control.check(expansions, len(arena), len(queue), depths[node])
+            
+            # Goal check
+            if state == goal:
+                # Reconstruct path by walking parent indices
+                return arena.path(node), expansions
+            
+            # If max_depth is specified and we've reached it, skip expansion
+            depth = depths[node]
+            if max_depth is not None and depth >= max_depth:
+                continue
+            
+            # Explore all possible next states
+            for action, next_state in get_successors(state):
+                generated += 1
+                # Only explore unvisited states
+                next_node = arena.discover(next_state.tiles, node, depth + 1, action)
+                if next_node is not None:
+                    append(next_node)
+                else:
+                    duplicates += 1
         
-        # If max_depth is specified and we've reached it, skip expansion
-        if max_depth is not None and depth >= max_depth:
-            continue
+        # No solution found
+        return [], expansions
+    finally:
+        if stats is not None:
+            stats.end(expansions, generated, duplicates, 0, peak_open, expansions)
+
+
+def bidirectional_bfs(start, goal, max_depth=None, control=None, stats=None):
+    """
+    Bidirectional breadth-first search from both the start and the goal state.
+    
+    Whole layers are expanded on the side with the smaller frontier. When a
+    generated state is already known to the other side, the layer is finished
+    and the shortest meeting path is returned, stitched from both halves.
+    
+    Args:
+        start: Starting state object
+        goal: Goal state object
+        max_depth: Maximum total path length (optional)
+        control: Optional SearchControl for cancellation and budgets
+        stats: Optional SearchStats filled in when the search ends
+    
+    Returns:
+        tuple: (path, expansions) where:
+            - path is a list of actions to reach the goal
+            - expansions is the number of nodes expanded on both sides
+    """
+    if stats is not None:
+        stats.begin()
+    if start == goal:
+        if stats is not None:
+            stats.end(1)
+        return [], 1
+    
+    # Per side: current layer, parent links and depth of every seen state
+    frontiers = [[start], [goal]]
+    parents = [{start.tiles: (None, None)}, {goal.tiles: (None, None)}]
+    depths = [{start.tiles: 0}, {goal.tiles: 0}]
+    layer_depths = [0, 0]
+    
+    # Counters for stats
+    expansions = generated = duplicates = peak_open = 0
+    
+    get_successors = PuzzleState.get_successors
+    if stats is not None:
+        get_successors = stats.timed(get_successors, 'successors')
+    
+    try:
+        while frontiers[0] and frontiers[1]:
+            # Stop once no path within max_depth is possible
+            if max_depth is not None and layer_depths[0] + layer_depths[1] >= max_depth:
+                break
+            
+            # Expand the smaller frontier
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            parent, depth, other_depth = parents[side], depths[side], depths[1 - side]
+            next_depth = layer_depths[side] + 1
+            
+            best_length = None
+            meet = None
+            next_layer = []
+            for state in frontiers[side]:
+                expansions += 1
+                if control is not None and expansions & CHECK_MASK == 0:
+                    control.check(expansions, len(depths[0]) + len(depths[1]),
+                                  len(frontiers[side]) + len(next_layer), layer_depths[0] + layer_depths[1])
+                for action, next_state in get_successors(state):
+                    generated += 1
+                    next_key = next_state.tiles
+                    if next_key in depth:
+                        duplicates += 1
+                        continue
+                    parent[next_key] = (state, action)
+                    depth[next_key] = next_depth
+                    next_layer.append(next_state)
+                    
+                    # The two searches meet at this state
+                    if next_key in other_depth:
+                        length = next_depth + other_depth[next_key]
+                        if best_length is None or length < best_length:
+                            best_length, meet = length, next_key
+            
+            # Both layers are held at once while the next one is built
+            peak_open = max(peak_open, len(frontiers[1 - side]) + len(frontiers[side]) + len(next_layer))
+            
+            if meet is not None:
+                if max_depth is not None and best_length > max_depth:
+                    break
+                forward_parent, backward_parent = parents
+                return stitch_paths(forward_parent, backward_parent, meet), expansions
+            
+            frontiers[side] = next_layer
+            layer_depths[side] = next_depth
         
-        # Explore all possible next states
-        for action, next_state in state.get_successors():
-            next_tuple = next_state.to_tuple()
-            
-            # Only explore unvisited states
-            if next_tuple not in visited:
-                visited.add(next_tuple)
-                parent[next_tuple] = (state, action)
-                queue.append((next_state, depth + 1))
-    
-    # No solution found
-    return [], expansions
\ No newline at end of file
+        # No solution found
+        return [], expansions
+    finally:
+        if stats is not None:
+            stats.end(expansions, generated, duplicates, 0, peak_open, expansions)
@@ -0,0 +1,155 @@
+"""
+Memoization of solved boards with path-suffix reuse.
+
+Every board on a solution path has the rest of that path as its own solution, and
+for an optimal path that rest is optimal too. SolutionCache indexes each board on a
+stored path by its packed tiles, so a later query for any of them is answered
+without searching. Entries share one tuple of actions per stored path plus an
+offset into it, so indexing a path of length L costs L small entries, not L^2 moves.
+
+    cache = SolutionCache(max_entries=100_000)
+    solve = cached(get_solver('astar-manhattan'), cache)
+    path, expansions = solve(start, goal)      # expansions is 0 on a hit
+
+The least recently used entries are evicted once max_entries boards are indexed.
+"""
+import threading
+from collections import OrderedDict
+
+from logic.puzzle_state import PuzzleState
+
+# Boards indexed by default; roughly 150 bytes each
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Moves of the blank, to walk a stored path
+MOVE_METHODS = {
+    "Up": PuzzleState.move_up,
+    "Down": PuzzleState.move_down,
+    "Left": PuzzleState.move_left,
+    "Right": PuzzleState.move_right,
+}
+
+
+class SolutionCache:
+    """
+    Bounded LRU map from (goal, board) to the remaining path to the goal.
+
+        max_entries: Most boards indexed at once
+    Counters:
+        hits, misses: Lookups answered and not answered
+        evictions: Boards dropped to stay within max_entries
+        stored: Paths added with put()
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("The cache must hold at least one entry")
+        self.max_entries = max_entries
+        # (goal tiles, board tiles) -> (actions, offset, optimal); the path is actions[offset:]
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stored = 0
+        # Searches may run on several threads, e.g. in the GUI
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, start, goal, optimal=True):
+        """
+        Remaining path from start to goal as a new list, or None on a miss.
+
+            optimal: Only accept paths stored as optimal
+        """
+        key = (goal.tiles, start.tiles)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or (optimal and not entry[2]):
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            actions, offset, _ = entry
+            return list(actions[offset:])
+
+    def put(self, start, path, goal, optimal=True):
+        """
+        Index every board on path, which leads from start to goal.
+
+            optimal: Whether path is an optimal solution; suffixes of a non-optimal path
+                never replace optimal entries, and optimal lookups ignore them
+        """
+        actions = tuple(path)
+        boards = [start.tiles]
+        state = start
+        for action in actions:
+            state = MOVE_METHODS[action](state)
+            if state is None:
+                raise ValueError(f"Path leaves the board at move {len(boards)}")
+            boards.append(state.tiles)
+        if state != goal:
+            raise ValueError("Path does not end at the goal")
+
+        goal_tiles = goal.tiles
+        entries = self.entries
+        with self._lock:
+            self.stored += 1
+            for offset, tiles in enumerate(boards):
+                key = (goal_tiles, tiles)
+                old = entries.get(key)
+                if old is not None:
+                    # Keep an existing entry that is at least as good: optimal beats not, then shorter wins
+                    old_actions, old_offset, old_optimal = old
+                    if (old_optimal and not optimal) or (
+                            old_optimal == optimal and len(old_actions) - old_offset <= len(actions) - offset):
+                        entries.move_to_end(key)
+                        continue
+                entries[key] = (actions, offset, optimal)
+                entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = self.stored = 0
+
+    def stats(self):
+        """Counters and size as a dict, read under the lock so they agree with each other"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'stored': self.stored,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def cached(solver, cache, optimal=True):
+    """
+    Wrap a solver with the common (start, goal, **options) -> (path, expansions)
+    signature so queries are answered from cache when possible and every solution
+    found is indexed.
+
+        optimal: Whether solver returns optimal paths; see SolutionCache.put
+    A hit returns (path, 0) without calling the solver, so options such as stats
+    are left untouched.
+    """
+    def solve(start, goal, **options):
+        path = cache.get(start, goal, optimal)
+        if path is not None:
+            return path, 0
+        path, expansions = solver(start, goal, **options)
+        # An empty path means no solution unless start is already the goal
+        if path or start == goal:
+            cache.put(start, path, goal, optimal)
+        return path, expansions
+
+    return solve
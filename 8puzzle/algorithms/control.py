@@ -0,0 +1,180 @@
+"""
+Cooperative cancellation and budgets for running searches.
+
+A SearchControl is shared between a search and whoever started it. The search calls
+check() every CHECK_INTERVAL expansions, which is cheap enough to leave in every main
+loop; check() blocks while the control is paused and raises SearchAborted once the
+control was cancelled or a budget ran out:
+
+    control = SearchControl(time_limit=10, max_nodes=2_000_000)
+    try:
+        path, expansions = astar(start, goal, heuristic_manhattan, control=control)
+    except SearchAborted as e:
+        print(e.reason, e.expansions)
+
+control.cancel() may be called from any thread.
+
+A progress callback receives a dict at most every progress_interval seconds, from
+inside check(), so it costs nothing between checks:
+    expansions  nodes expanded so far
+    nodes       nodes held in memory
+    frontier    size of the open list, stack or queue (None if the search has none)
+    bound       current f value, f bound or depth, depending on the search
+    elapsed     running seconds, not counting pauses
+    rate        expansions per second
+The callback runs on the search's thread and should hand the data off quickly.
+"""
+import os
+import time
+import threading
+
+# Expansions between two checks; a power of two so the test is a bit mask
+CHECK_INTERVAL = 1024
+CHECK_MASK = CHECK_INTERVAL - 1
+
+# Default seconds between two progress reports
+PROGRESS_INTERVAL = 0.5
+
+
+class SearchAborted(Exception):
+    """
+    Raised inside a search that was cancelled or ran out of budget.
+
+        reason: 'cancelled', 'time', 'expansions', 'nodes' or 'memory'
+        expansions: Nodes expanded before the search stopped
+    """
+
+    def __init__(self, reason, expansions=0):
+        super().__init__(f"Search aborted ({reason}) after {expansions} expansions")
+        self.reason = reason
+        self.expansions = expansions
+
+
+def memory_usage():
+    """Resident set size of this process in bytes, or 0 where it cannot be read"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak rather than current size; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def peak_memory_usage():
+    """Largest resident set size this process has had, in bytes, or 0 where it cannot be read"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+class SearchControl:
+    """
+    Cancellation token, pause switch and budgets for one search.
+
+        time_limit: Seconds of running time, counted from construction; paused time is not counted
+        max_expansions: Most nodes the search may expand
+        max_nodes: Most nodes the search may hold in memory
+        max_memory: Largest resident set size of the process in bytes
+        progress: Optional callback(dict) for progress reports
+        progress_interval: Least seconds between two progress reports
+    """
+
+    def __init__(self, time_limit=None, max_expansions=None, max_nodes=None, max_memory=None,
+                 progress=None, progress_interval=PROGRESS_INTERVAL):
+        self.time_limit = time_limit
+        self.max_expansions = max_expansions
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.started = time.monotonic()
+        self.paused_time = 0
+        self.last_report = self.started
+        self.deadline = self.started + time_limit if time_limit is not None else None
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        """Ask the search to stop at its next check"""
+        self._cancelled.set()
+        # A paused search has to wake up to notice
+        self._running.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def pause(self):
+        """Block the search at its next check until resume() or cancel()"""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def elapsed(self):
+        """Seconds since construction, not counting pauses"""
+        return time.monotonic() - self.started - self.paused_time
+
+    def check(self, expansions, nodes=0, frontier=None, bound=None):
+        """
+        Called by searches every CHECK_INTERVAL expansions.
+
+            expansions: Nodes expanded so far
+            nodes: Nodes currently held in memory
+            frontier: Size of the open list, for progress reports
+            bound: Current f value, f bound or depth, for progress reports
+        """
+        if not self._running.is_set():
+            paused_at = time.monotonic()
+            self._running.wait()
+            paused = time.monotonic() - paused_at
+            self.paused_time += paused
+            if self.deadline is not None:
+                self.deadline += paused
+
+        if self._cancelled.is_set():
+            raise SearchAborted('cancelled', expansions)
+
+        if self.progress is not None:
+            now = time.monotonic()
+            if now - self.last_report >= self.progress_interval:
+                self.last_report = now
+                elapsed = self.elapsed()
+                self.progress({
+                    'expansions': expansions,
+                    'nodes': nodes,
+                    'frontier': frontier,
+                    'bound': bound,
+                    'elapsed': elapsed,
+                    'rate': expansions / elapsed if elapsed > 0 else 0.0,
+                })
+
+        if self.max_expansions is not None and expansions >= self.max_expansions:
+            raise SearchAborted('expansions', expansions)
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise SearchAborted('time', expansions)
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            raise SearchAborted('nodes', expansions)
+        if self.max_memory is not None and memory_usage() > self.max_memory:
+            raise SearchAborted('memory', expansions)
@@ -1,50 +1,31 @@
-def dfs(start, goal, max_depth=50):
-    
-    # Stack to keep track of states to explore (state, depth)
-    stack = [(start, 0)]
-    
-    # Set to keep track of explored states
-    explored = set()
-    
-    # To keep track of parent states and actions that led to them
-    parent = {start.to_tuple(): (None, None)}
-    
-    # Counter for number of nodes expanded
-    expansions = 0
-    
-    while stack:
-        # Get the next state and its depth from the stack
-        state, depth = stack.pop()
-        
-        # Increment expansion counter
-        expansions += 1
-        
-        # Check if we've reached the goal
-        if state == goal:
-            # Reconstruct the path
-            path = []
-            while parent[state.to_tuple()][0] is not None:
-                path.append(parent[state.to_tuple()][1])
-                state = parent[state.to_tuple()][0]
-            path.reverse()
-            return path, expansions
-        
-        # Mark the current state as explored
-        explored.add(state.to_tuple())
-        
-        # If we haven't reached the maximum depth, explore further
-        if depth < max_depth:
-            # Get successors (possible next states) in reverse order for DFS
-            successors = state.get_successors()
-            successors.reverse()  # Reverse to explore right-to-left first
-            
-            for action, successor in successors:
-                # If this state hasn't been seen before
-                if successor.to_tuple() not in explored:
-                    # Remember how we got to this state
-                    parent[successor.to_tuple()] = (state, action)
-                    # Add to stack for exploration
-                    stack.append((successor, depth + 1))
-    
-    # There is no solution
-    return [], expansions
\ No newline at end of file
+from algorithms.ids import depth_limited_search
+
+
+def dfs(start, goal, max_depth=50, control=None, stats=None):
+    """
+    Depth-first search down to max_depth, trying moves in the order Up, Down, Left, Right.
+
+    A single depth-limited search (see algorithms.ids) that closes a board once it is
+    entered: when a node is expanded its closed children are dropped and the rest are
+    queued, to be entered even if closed meanwhile through a sibling. The path
+    returned is the first one found, not necessarily the shortest.
+
+        start: The initial PuzzleState
+        goal: The goal PuzzleState
+        max_depth: Nodes at this depth are goal-tested but not expanded
+        control: Optional SearchControl for cancellation and budgets
+        stats: Optional SearchStats filled in when the search ends; peak_open is the
+            deepest path held. Successors are made in place, so no time is split out.
+
+    Returns:
+        tuple: (path, expansions)
+    """
+    if stats is not None:
+        stats.begin()
+
+    try:
+        path, expansions, _ = depth_limited_search(start, goal, max_depth, control, 0, stats, close_on_entry=True)
+        return path, expansions
+    finally:
+        if stats is not None:
+            stats.end()
@@ -0,0 +1,170 @@
+"""
+Complete distance table for boards small enough to rank (3x3).
+
+A backward breadth-first search from the goal records the optimal distance of
+every board in the goal's reachability class, one byte per ranked board
+(181,440 bytes for 3x3). The table is saved once and memory-mapped on load.
+Solving then needs no search: from any board, step to a neighbour that is one
+move closer until the goal is reached.
+
+Build the table for the standard goal ahead of time with:
+    python -m algorithms.distance_table --size 3
+"""
+import os
+import time
+import hashlib
+import argparse
+from functools import lru_cache
+
+from logic.puzzle_state import PuzzleState
+from logic.ranking import MAX_RANKED_SIZE, can_rank, state_count, board_class, rank_index
+from logic.storage import DATA_DIRECTORY, load_table, save_table
+from algorithms.control import CHECK_MASK
+
+# Where tables are stored unless a directory is given explicitly
+DEFAULT_DIRECTORY = os.path.join(DATA_DIRECTORY, 'distance')
+
+# Table value of a board the backward search never reached
+UNREACHED = 255
+
+
+def build_distance_table(goal):
+    """
+    Breadth-first search backwards from goal over every board in its class.
+
+    Returns:
+        bytearray where entry rank_index(board) is the optimal distance of board from goal
+    """
+    size = goal.size
+    table = bytearray([UNREACHED]) * state_count(size)
+    table[rank_index(goal.tiles, size)] = 0
+
+    layer = [goal]
+    distance = 0
+    while layer:
+        distance += 1
+        next_layer = []
+        for state in layer:
+            for _, next_state in state.get_successors():
+                index = rank_index(next_state.tiles, size)
+                if table[index] == UNREACHED:
+                    table[index] = distance
+                    next_layer.append(next_state)
+        layer = next_layer
+    return table
+
+
+def table_path(directory, goal):
+    """File name of the distance table for one goal"""
+    digest = hashlib.sha1(goal.tiles).hexdigest()[:10]
+    return os.path.join(directory, f"distance-{goal.size}x{goal.size}-{digest}.bin")
+
+
+@lru_cache(maxsize=4)
+def load_distance_table(goal, directory=DEFAULT_DIRECTORY, build=True):
+    """
+    Memory-map the distance table of goal, building and saving it first if it is missing.
+
+        goal: Goal PuzzleState; its board must be small enough to rank
+        directory: Where tables are loaded from and saved to
+        build: Build a missing table instead of raising FileNotFoundError
+    """
+    if not can_rank(goal.size):
+        raise ValueError(f"Distance tables are only available up to {MAX_RANKED_SIZE}x{MAX_RANKED_SIZE} boards")
+    path = table_path(directory, goal)
+    table = load_table(path, state_count(goal.size))
+    if table is None:
+        if not build:
+            raise FileNotFoundError(f"Distance table not found: {path}")
+        save_table(path, build_distance_table(goal))
+        table = load_table(path, state_count(goal.size))
+    return table
+
+
+def table_solve(start, goal, control=None, stats=None):
+    """
+    Optimal solver by greedy descent over a complete distance table.
+
+        start: The initial PuzzleState
+        goal: The goal PuzzleState
+        control: Optional SearchControl; only worth passing for uniformity, as a solve
+            takes at most a few dozen steps
+        stats: Optional SearchStats filled in when the solve ends; every step generates
+            just the board it moves to, and loading the table counts towards elapsed
+
+    Returns:
+        tuple: (path, expansions) where expansions is the number of boards stepped through
+    """
+    if stats is not None:
+        stats.begin()
+    if board_class(start.tiles, start.size) != board_class(goal.tiles, goal.size):
+        # The start cannot reach the goal
+        if stats is not None:
+            stats.end()
+        return [], 0
+
+    table = load_distance_table(goal)
+    size = start.size
+    board = bytearray(start.tiles)
+    blank = start.blank
+    index = rank_index(start.tiles, size)
+    distance = table[index]
+    # Index distance between boards whose blanks are one cell apart in the same row
+    blank_step = state_count(size) // (size * size)
+    path = []
+    expansions = 0
+
+    try:
+        while distance > 0:
+            expansions += 1
+            if control is not None and expansions & CHECK_MASK == 0:
+                control.check(expansions, 0, None, distance)
+            row, col = divmod(blank, size)
+            # Some neighbour of every non-goal board is exactly one move closer.
+            # Horizontal moves keep the tile order, so their index is found without ranking.
+            if col > 0 and table[index - blank_step] == distance - 1:
+                action, target, index = "Left", blank - 1, index - blank_step
+            elif col < size - 1 and table[index + blank_step] == distance - 1:
+                action, target, index = "Right", blank + 1, index + blank_step
+            else:
+                for action, target in (("Up", blank - size), ("Down", blank + size)):
+                    if not 0 <= target < size * size:
+                        continue
+                    board[blank], board[target] = board[target], 0
+                    next_index = rank_index(bytes(board), size)
+                    board[target], board[blank] = board[blank], 0
+                    if table[next_index] == distance - 1:
+                        index = next_index
+                        break
+
+            # Slide the chosen tile into the blank
+            board[blank], board[target] = board[target], 0
+            blank = target
+            path.append(action)
+            distance -= 1
+
+        return path, expansions
+    finally:
+        if stats is not None:
+            stats.end(expansions, expansions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the complete distance table for the standard goal")
+    parser.add_argument('--size', type=int, default=3, help="Board size (default: 3)")
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY, help="Output directory")
+    args = parser.parse_args()
+
+    size = args.size
+    goal = PuzzleState.from_tiles(bytes((i + 1) % (size * size) for i in range(size * size)), size)
+
+    start_time = time.time()
+    table = build_distance_table(goal)
+    elapsed = time.time() - start_time
+    path = table_path(args.directory, goal)
+    save_table(path, table)
+    print(f"{len(table)} boards, maximum distance {max(table)}, built in {elapsed:.2f}s -> {path}")
+
+
+if __name__ == "__main__":
+    main()
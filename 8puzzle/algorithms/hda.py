@@ -0,0 +1,236 @@
+"""
+Hash-distributed A* (HDA*) across worker processes.
+
+Every board is owned by exactly one worker, chosen by a CRC32 hash of its packed
+tiles. A worker keeps the open list and best-known costs for its own boards only;
+children owned by another worker are batched and sent to that worker's inbox.
+
+The search runs in bulk-synchronous rounds driven by the coordinator:
+    1. Each worker receives the incumbent cost, the global f bound and the number
+       of child batches sent to it in the previous round, reads exactly that many
+       from its inbox, then expands up to `budget` of its nodes whose f is at most
+       the bound and below the incumbent.
+    2. Each worker reports its expansions, any goal it reached, the batches it
+       sent, the smallest f it still holds (open or in flight) and its counters
+       for SearchStats.
+The coordinator keeps the cheapest goal as the incumbent, sets the next bound to the
+smallest f held anywhere, and stops once no open or in-flight node has f below the
+incumbent. The bound keeps workers from racing ahead into f layers a sequential A*
+would never reach. With a consistent heuristic every node on a cheaper
+path would have a smaller f, so the incumbent is optimal. Counting batches per round
+means no worker ever waits for a message that was not sent, and no message is lost.
+
+Nodes carry their own move path as bytes of move codes, so no cross-process parent
+links are needed to rebuild the solution.
+"""
+import os
+import zlib
+import queue
+import multiprocessing
+
+from logic.puzzle_state import PuzzleState, OPPOSITE
+from algorithms.astar import BucketQueue, require_consistent
+from algorithms.arena import MOVES, MOVE_CODES
+
+# Expansions per worker per round
+DEFAULT_BUDGET = 1000
+
+INFINITY = float('inf')
+
+
+def owner(tiles, workers):
+    """Worker that owns a packed board; stable across processes, unlike hash()"""
+    return zlib.crc32(tiles) % workers
+
+
+def _worker(worker_id, workers, goal_tiles, size, heuristic, commands, inboxes, results):
+    """Worker process: owns the boards that hash to worker_id"""
+    goal = PuzzleState.from_tiles(goal_tiles, size)
+    delta = getattr(heuristic, 'delta', None)
+    inbox = inboxes[worker_id]
+    frontier = BucketQueue()
+    costs = {}
+    # Successors generated and dropped as duplicates during the current round
+    counters = [0, 0]
+
+    def receive(tiles, g, h, path, incumbent):
+        # Keep a node only if it is the cheapest path to its board so far and can still beat the incumbent
+        if g < costs.get(tiles, g + 1) and g + h < incumbent:
+            costs[tiles] = g
+            frontier.put((tiles, h, g, path), g + h, g)
+        else:
+            counters[1] += 1
+
+    while True:
+        command, incumbent, bound, expected, budget = commands.get()
+
+        # Read exactly the batches other workers sent during the previous round
+        for _ in range(expected):
+            for tiles, g, h, path in inbox.get():
+                receive(tiles, g, h, path, incumbent)
+        if command == 'stop':
+            return
+
+        outgoing = [[] for _ in range(workers)]
+        found = None
+        expanded = 0
+        counters[0] = counters[1] = 0
+
+        while expanded < budget and not frontier.empty():
+            f = frontier.min_priority()
+            if f > bound or f >= incumbent:
+                break
+            tiles, h, g, path = frontier.get()
+
+            # Skip stale entries superseded by a cheaper path to the same board
+            if g > costs[tiles]:
+                continue
+            expanded += 1
+
+            if tiles == goal_tiles:
+                # Nothing left on this worker with f >= g can improve on it
+                incumbent = g
+                found = (g, path)
+                continue
+
+            current = PuzzleState.from_tiles(tiles, size)
+            new_cost = g + 1
+            for action, next_state in current.get_successors():
+                # Never undo the move that led here
+                if path and path[-1] == MOVE_CODES[OPPOSITE[action]]:
+                    counters[1] += 1
+                    continue
+                counters[0] += 1
+
+                if delta is not None:
+                    next_h = h + delta(current, next_state, goal)
+                else:
+                    next_h = heuristic(next_state, goal)
+                if new_cost + next_h >= incumbent:
+                    continue
+
+                next_path = path + bytes((MOVE_CODES[action],))
+                next_owner = owner(next_state.tiles, workers)
+                if next_owner == worker_id:
+                    receive(next_state.tiles, new_cost, next_h, next_path, incumbent)
+                else:
+                    outgoing[next_owner].append((next_state.tiles, new_cost, next_h, next_path))
+
+        # One batch per destination; remember the smallest f still in flight
+        sent = [0] * workers
+        min_f = frontier.min_priority() if not frontier.empty() else INFINITY
+        for destination, batch in enumerate(outgoing):
+            if batch:
+                inboxes[destination].put(batch)
+                sent[destination] = 1
+                min_f = min(min_f, min(g + h for _, g, h, _ in batch))
+
+        results.put((worker_id, expanded, found, sent, min_f, len(costs), counters[0], counters[1], len(frontier)))
+
+
+def _report(results, processes):
+    """Next worker report; raises instead of waiting forever if a worker has died"""
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            if not all(process.is_alive() for process in processes):
+                raise RuntimeError("An HDA* worker process exited unexpectedly")
+
+
+def hda_star(start, goal, heuristic, workers=None, budget=DEFAULT_BUDGET, stats=None, control=None):
+    """
+    Parallel A* with the state space partitioned over worker processes by board hash.
+
+        start: The initial PuzzleState
+        goal: The goal PuzzleState
+        heuristic: Module-level heuristic function(state, goal) so workers can unpickle it;
+            it must be consistent for the result to be optimal, so heuristics marked
+            consistent = False raise ValueError
+        workers: Number of worker processes (default: os.cpu_count())
+        budget: Expansions per worker between synchronisation rounds
+        stats: Optional SearchStats filled in when the search ends. Duplicates include
+            children dropped by their owner, peak_open is the most open nodes summed over
+            workers after a round, and extra receives 'worker_expansions' (one count per
+            worker) and 'rounds'. Time is not split, as the work happens in other processes.
+        control: Optional SearchControl, checked by the coordinator after every round
+            against the expansions and stored nodes of all workers together
+
+    Returns:
+        tuple: (path, expansions) with expansions summed over all workers
+    """
+    require_consistent(heuristic, "HDA*")
+    workers = workers or os.cpu_count() or 1
+    if stats is not None:
+        stats.begin()
+    context = multiprocessing.get_context()
+    commands = [context.Queue() for _ in range(workers)]
+    inboxes = [context.Queue() for _ in range(workers)]
+    results = context.Queue()
+
+    processes = [
+        context.Process(target=_worker, daemon=True,
+                        args=(worker_id, workers, goal.tiles, goal.size, heuristic,
+                              commands[worker_id], inboxes, results))
+        for worker_id in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    # The start node is the only batch in flight before the first round
+    bound = heuristic(start, goal)
+    expected = [0] * workers
+    start_owner = owner(start.tiles, workers)
+    inboxes[start_owner].put([(start.tiles, 0, bound, b"")])
+    expected[start_owner] = 1
+
+    incumbent = INFINITY
+    best_path = None
+    worker_expansions = [0] * workers
+    worker_nodes = [0] * workers
+    rounds = generated = duplicates = peak_open = 0
+
+    try:
+        while True:
+            rounds += 1
+            for worker_id in range(workers):
+                commands[worker_id].put(('expand', incumbent, bound, expected[worker_id], budget))
+
+            expected = [0] * workers
+            lower_bound = INFINITY
+            open_nodes = 0
+            for _ in range(workers):
+                worker_id, expanded, found, sent, min_f, nodes, made, dropped, frontier = _report(results, processes)
+                worker_expansions[worker_id] += expanded
+                worker_nodes[worker_id] = nodes
+                generated += made
+                duplicates += dropped
+                open_nodes += frontier
+                if found is not None and found[0] < incumbent:
+                    incumbent, best_path = found
+                for destination, count in enumerate(sent):
+                    expected[destination] += count
+                lower_bound = min(lower_bound, min_f)
+            peak_open = max(peak_open, open_nodes)
+
+            # No open or in-flight node can lead to a cheaper goal (or none is left at all)
+            if lower_bound >= incumbent:
+                break
+            bound = lower_bound
+            if control is not None:
+                control.check(sum(worker_expansions), sum(worker_nodes), None, bound)
+    finally:
+        # Workers drain their inboxes before exiting so no queue is left holding data
+        for worker_id in range(workers):
+            commands[worker_id].put(('stop', incumbent, bound, expected[worker_id], 0))
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        if stats is not None:
+            stats.end(sum(worker_expansions), generated, duplicates, 0, peak_open, sum(worker_expansions),
+                      worker_expansions=worker_expansions, rounds=rounds)
+
+    if best_path is None:
+        return [], sum(worker_expansions)
+    return [MOVES[code] for code in best_path], sum(worker_expansions)
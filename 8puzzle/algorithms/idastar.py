@@ -0,0 +1,114 @@
+from logic.puzzle_state import PuzzleState
+from logic.moves import MOVES, NO_MOVE, pruned_table
+from algorithms.control import CHECK_MASK
+
+# Returned by the bounded search once the goal has been reached
+FOUND = -1
+
+
+def idastar(start, goal, heuristic, max_depth=None, control=None, stats=None):
+    """
+    Iterative deepening A* search.
+
+    Runs depth-first searches bounded by f(n) = g(n) + h(n), raising the bound to the
+    smallest f that exceeded it after every iteration. A single mutable board is updated
+    in place and undone on backtrack, so memory use is proportional to the solution depth.
+
+        start: The initial PuzzleState
+        goal: The goal PuzzleState
+        heuristic: Function heuristic(state, goal). If it has a compile(goal) attribute whose
+            result offers tile_delta(tile, source, target), or move_delta(board, tile, source,
+            target) for heuristics that look at more than the moved tile, h is updated per
+            move without building states; otherwise a state is built for every node.
+        max_depth: Give up once the f bound exceeds this value (optional)
+        control: Optional SearchControl for cancellation and budgets
+        stats: Optional SearchStats filled in when the search ends. Moves undoing the
+            previous one count as duplicates, peak_open is the deepest path held and
+            extra['iterations'] the number of f bounds tried. Successors are made in
+            place, so only heuristic time is measured.
+
+    Returns:
+        tuple: (path, expansions)
+    """
+    size = start.size
+    goal_tiles = goal.tiles
+    # table[blank][previous move]: the moves that do not undo the previous one
+    table = pruned_table(size)
+    board = bytearray(start.tiles)
+
+    compiled = heuristic.compile(goal) if hasattr(heuristic, 'compile') else None
+    tile_delta = getattr(compiled, 'tile_delta', None)
+    move_delta = getattr(compiled, 'move_delta', None) if tile_delta is None else None
+    if stats is not None:
+        stats.begin()
+        heuristic = stats.timed(heuristic, 'heuristic')
+        if tile_delta is not None:
+            tile_delta = stats.timed(tile_delta, 'heuristic')
+        if move_delta is not None:
+            move_delta = stats.timed(move_delta, 'heuristic')
+
+    path = []
+    expansions = generated = duplicates = deepest = iterations = 0
+
+    def search(blank, g, h, bound, previous):
+        """Bounded depth-first search; returns FOUND or the smallest f above bound"""
+        nonlocal expansions, generated, duplicates, deepest
+
+        f = g + h
+        if f > bound:
+            return f
+        if board == goal_tiles:
+            return FOUND
+
+        expansions += 1
+        if control is not None and expansions & CHECK_MASK == 0:
+            control.check(expansions, len(path), None, bound)
+        if g > deepest:
+            deepest = g
+        minimum = float('inf')
+        if previous != NO_MOVE:
+            # The move undoing the one that led here is left out of the table
+            duplicates += 1
+        for code, target in table[blank][previous]:
+            generated += 1
+
+            # Make the move in place
+            tile = board[target]
+            board[blank] = tile
+            board[target] = 0
+            if tile_delta is not None:
+                next_h = h + tile_delta(tile, target, blank)
+            elif move_delta is not None:
+                next_h = h + move_delta(board, tile, target, blank)
+            else:
+                next_h = heuristic(PuzzleState.from_tiles(bytes(board), size, target), goal)
+            path.append(code)
+
+            result = search(target, g + 1, next_h, bound, code)
+            if result == FOUND:
+                return FOUND
+            if result < minimum:
+                minimum = result
+
+            # Unmake the move
+            path.pop()
+            board[target] = tile
+            board[blank] = 0
+
+        return minimum
+
+    start_h = heuristic(start, goal)
+    bound = start_h
+    try:
+        while True:
+            iterations += 1
+            result = search(start.blank, 0, start_h, bound, NO_MOVE)
+            if result == FOUND:
+                return [MOVES[code] for code in path], expansions
+            if result == float('inf') or (max_depth is not None and result > max_depth):
+                # No solution within the allowed depth
+                return [], expansions
+            bound = result
+    finally:
+        if stats is not None:
+            stats.end(expansions, generated, duplicates, 0, deepest, 0, iterations=iterations)
@@ -1,87 +1,175 @@
-def depth_limited_search(start, goal, depth_limit):
+from logic.moves import MoveEngine, NO_MOVE
+from logic.ranking import Bitset, can_rank, state_count, rank_index
+from algorithms.control import CHECK_MASK
+
+
+def depth_limited_search(start, goal, depth_limit, control=None, done=0, stats=None, close_on_entry=False):
     """
     Depth-limited search 
     
         start: The initial PuzzleState
         goal: The goal PuzzleState
         depth_limit: Maximum depth to explore
+        control: Optional SearchControl for cancellation and budgets
+        done: Expansions made by earlier iterations, counted against the budgets
+        stats: Optional SearchStats this iteration's counters are added to
+        close_on_entry: Mark boards when they are entered rather than when they are
+            discovered, as dfs does
     
+    A single board is changed in place by a MoveEngine and restored on backtrack, and
+    the move undoing the previous one is never generated. A board is explored at most
+    once: children already marked are dropped when their parent is expanded, so a
+    search never costs more than the boards within depth_limit, but the path found
+    need not be the shortest. By default children are marked as they are discovered;
+    with close_on_entry they are marked when entered, so a queued child is still
+    entered after a sibling reached it first. Boards small enough to rank are marked
+    in a Bitset indexed by rank_index, larger ones in a set of packed boards.
     """
-    # Stack to keep track of states to explore (state, depth)
-    stack = [(start, 0)]
+    size = start.size
+    engine = MoveEngine(start)
+    board = engine.board
+    table = engine.table
+    apply = engine.apply
+    undo = engine.undo
+    goal_tiles = goal.tiles
     
-    # Set to keep track of visited states
-    visited = set()
+    # Marked boards: ranks in a bitset when possible, so no per-board key is kept
+    ranked = can_rank(size)
+    if ranked:
+        marked = Bitset(state_count(size))
+        # Index distance between boards whose blanks are one cell apart in the same row
+        blank_step = state_count(size) // (size * size)
+    else:
+        marked = set()
+    mark = marked.add
     
-    # To keep track of parent states and actions that led to them
-    # Key: state tuple, Value: (parent state, action)
-    parent = {start.to_tuple(): (None, None)}
+    def children(blank, previous, current):
+        # (code, target, key) of the moves from the board, with key the rank or packed
+        # board of the child, for children not marked yet
+        nonlocal count
+        fresh = []
+        for code, target in table[blank][previous]:
+            if ranked and code > 1:
+                # A horizontal move keeps the tile sequence, so only the blank term of
+                # the index changes
+                child = current + (target - blank) * blank_step
+            else:
+                # Make the child board in place just long enough to key it
+                board[blank] = board[target]
+                board[target] = 0
+                child = rank_index(board, size) if ranked else bytes(board)
+                board[target] = board[blank]
+                board[blank] = 0
+            if child not in marked:
+                if not close_on_entry:
+                    mark(child)
+                    count += 1
+                fresh.append((code, target, child))
+        return fresh
     
-    # Counter for number of nodes expanded
-    expansions = 0
+    # Counters for number of nodes expanded and for stats; like bfs, every board
+    # entered and goal-tested counts as an expansion
+    expansions = count = 1
+    generated = duplicates = peak_open = 0
     
-    while stack:
-        # Get the next state and its depth from the stack
-        state, depth = stack.pop()
-        
-        # Skip if we've already visited this state
-        if state.to_tuple() in visited:
-            continue
-            
-        # Mark this state as visited
-        visited.add(state.to_tuple())
+    try:
+        # Check if the start is the goal
+        root = rank_index(start.tiles, size) if ranked else start.tiles
+        mark(root)
+        if board == goal_tiles:
+            return [], expansions, True
+        if depth_limit <= 0:
+            return [], expansions, False
         
-        # Increment expansion counter
-        expansions += 1
+        # Per depth, the new children of that node and how many of them have been tried
+        options = table[start.blank][NO_MOVE]
+        pending = [children(start.blank, NO_MOVE, root)]
+        tried = [0]
+        generated += len(options)
+        duplicates += len(options) - len(pending[0])
         
-        # Check if we've reached the goal
-        if state == goal:
-            # Reconstruct the path
-            path = []
-            current = state
-            while parent[current.to_tuple()][0] is not None:
-                path.append(parent[current.to_tuple()][1])
-                current = parent[current.to_tuple()][0]
-            path.reverse()
-            return path, expansions, True
-        
-        # If we haven't reached the maximum depth, explore further
-        if depth < depth_limit:
-            # Get successors (possible next states) in reverse order for DFS
-            successors = state.get_successors()
-            successors.reverse()  # Reverse to explore right-to-left first
+        while pending:
+            depth = len(pending) - 1
+            options = pending[-1]
+            index = tried[-1]
+            if index == len(options):
+                # Every child from here was tried: backtrack
+                pending.pop()
+                tried.pop()
+                if depth:
+                    undo()
+                continue
+            tried[-1] = index + 1
             
-            for action, successor in successors:
-                successor_tuple = successor.to_tuple()
-                # Only add states we haven't seen before
-                if successor_tuple not in parent:
-                    # Remember how we got to this state
-                    parent[successor_tuple] = (state, action)
-                    # Add to stack for exploration
-                    stack.append((successor, depth + 1))
-    
-    # If we've exhausted the stack without finding a goal at this depth
-    return [], expansions, False
+            # Make the move in place
+            code, target, current = options[index]
+            apply(code, target)
+            next_depth = depth + 1
+            
+            # Increment expansion counter
+            expansions += 1
+            if control is not None and expansions & CHECK_MASK == 0:
+                control.check(done + expansions, count, next_depth, depth_limit)
+            
+            # Check if we've reached the goal
+            if board == goal_tiles:
+                return engine.path(), expansions, True
+            
+            # Mark the board as explored
+            if close_on_entry and current not in marked:
+                mark(current)
+                count += 1
+            
+            # If we haven't reached the maximum depth, explore further
+            if next_depth < depth_limit:
+                made = len(table[target][code])
+                fresh = children(target, code, current)
+                generated += made
+                duplicates += made - len(fresh)
+                pending.append(fresh)
+                tried.append(0)
+                if next_depth > peak_open:
+                    peak_open = next_depth
+            else:
+                undo()
+        
+        # If we've exhausted the stack without finding a goal at this depth
+        return [], expansions, False
+    finally:
+        if stats is not None:
+            stats.add(expansions, generated, duplicates, 0, peak_open, count)
 
 
-def ids(start, goal, max_depth=50):
+def ids(start, goal, max_depth=50, control=None, stats=None):
     """
     Iterative Deepening Search algorithm 
     
         start: The initial PuzzleState
         goal: The goal PuzzleState
         max_depth: Maximum depth to explore
+        control: Optional SearchControl for cancellation and budgets
+        stats: Optional SearchStats filled in when the search ends; its expanded count
+            covers every iteration, extra['iterations'] and extra['last_expansions'] tell
+            how many depth limits were tried and what the final one cost
     
     """
     total_expansions = 0
+    iterations = expansions = 0
+    if stats is not None:
+        stats.begin()
     
-    # Iteratively increase the depth limit
-    for depth in range(max_depth + 1):
-        path, expansions, found = depth_limited_search(start, goal, depth)
-        total_expansions += expansions
+    try:
+        # Iteratively increase the depth limit
+        for depth in range(max_depth + 1):
+            path, expansions, found = depth_limited_search(start, goal, depth, control, total_expansions, stats)
+            total_expansions += expansions
+            iterations += 1
+            
+            if found:
+                return path, total_expansions
         
-        if found:
-            return path, total_expansions
-    
-    # If no solution found within max_depth
-    return [], total_expansions
\ No newline at end of file
+        # If no solution found within max_depth
+        return [], total_expansions
+    finally:
+        if stats is not None:
+            stats.end(iterations=iterations, last_expansions=expansions)
@@ -0,0 +1,31 @@
+from logic.puzzle_state import OPPOSITE
+
+
+def trace_path(parent, key):
+    """
+    Follow parent links back from key to the root.
+    parent maps packed tiles to (parent state, action); the root maps to (None, None).
+    Returns the actions from the root to key.
+    """
+    path = []
+    while parent[key][0] is not None:
+        state, action = parent[key]
+        path.append(action)
+        key = state.tiles
+    path.reverse()
+    return path
+
+
+def stitch_paths(forward_parent, backward_parent, meet):
+    """
+    Join the two halves of a bidirectional search at the packed state meet.
+    The backward search recorded the moves made from the goal side, so they are
+    replayed in reverse order with every action inverted.
+    """
+    path = trace_path(forward_parent, meet)
+    key = meet
+    while backward_parent[key][0] is not None:
+        state, action = backward_parent[key]
+        path.append(OPPOSITE[action])
+        key = state.tiles
+    return path
@@ -0,0 +1,86 @@
+"""
+Named solvers with the common (start, goal) -> (path, expansions) signature.
+
+Every entry is a module-level function or a functools.partial of one, so solvers
+can be sent to worker processes.
+"""
+from functools import partial
+
+from logic.puzzle_state import PuzzleState
+from algorithms.bfs import bfs, bidirectional_bfs
+from algorithms.vector_bfs import vector_bfs
+from algorithms.dfs import dfs
+from algorithms.ids import ids
+from algorithms.astar import astar, bidirectional_astar
+from algorithms.idastar import idastar
+from algorithms.sma import sma_star
+from algorithms.distance_table import table_solve, load_distance_table
+from heuristics.misplaced import misplaced_tiles
+from heuristics.manhattan import heuristic_manhattan
+from heuristics.linear_conflict import linear_conflict
+from heuristics.walking_distance import walking_distance
+from heuristics.pdb import pattern_database
+
+SOLVERS = {
+    'bfs': partial(bfs, max_depth=50),
+    'bidirectional-bfs': partial(bidirectional_bfs, max_depth=50),
+    'vector-bfs': partial(vector_bfs, max_depth=50),
+    'dfs': partial(dfs, max_depth=50),
+    'ids': partial(ids, max_depth=50),
+    'astar-misplaced': partial(astar, heuristic=misplaced_tiles),
+    'astar-manhattan': partial(astar, heuristic=heuristic_manhattan),
+    'astar-linear-conflict': partial(astar, heuristic=linear_conflict),
+    'astar-walking-distance': partial(astar, heuristic=walking_distance),
+    'astar-pdb': partial(astar, heuristic=pattern_database),
+    'weighted-astar-manhattan': partial(astar, heuristic=heuristic_manhattan, weight=1.5),
+    'idastar-manhattan': partial(idastar, heuristic=heuristic_manhattan),
+    'idastar-linear-conflict': partial(idastar, heuristic=linear_conflict),
+    'bidirectional-astar': partial(bidirectional_astar, heuristic=heuristic_manhattan),
+    'sma-manhattan': partial(sma_star, heuristic=heuristic_manhattan, max_nodes=100000),
+    'table': table_solve,
+}
+
+# Solvers whose paths are always shortest
+OPTIMAL = frozenset({
+    'bfs', 'bidirectional-bfs', 'vector-bfs', 'astar-misplaced', 'astar-manhattan', 'astar-linear-conflict',
+    'astar-walking-distance', 'astar-pdb', 'idastar-manhattan', 'idastar-linear-conflict',
+    'bidirectional-astar', 'table',
+})
+
+
+def get_solver(name):
+    """Solver registered under name"""
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown solver: {name}") from None
+
+
+def find_solver(function, **keywords):
+    """
+    Name of the registered solver that calls function with exactly these keywords, or
+    None; front ends that build their own solvers use it to share store entries.
+    """
+    for name, solver in SOLVERS.items():
+        if getattr(solver, 'func', solver) is function and getattr(solver, 'keywords', {}) == keywords:
+            return name
+    return None
+
+
+def prepare_solver(name, goal):
+    """
+    Build or load the tables the named solver needs for goal: the tables of its heuristic
+    and, for 'table', the distance table. Call it before timing a search, so the first
+    solve is not charged for a build that can take a minute on large boards.
+    """
+    solver = get_solver(name)
+    heuristic = getattr(solver, 'keywords', {}).get('heuristic')
+    if heuristic is not None:
+        heuristic(goal, goal)
+    if getattr(solver, 'func', solver) is table_solve:
+        load_distance_table(goal)
+
+
+def goal_state(size):
+    """The goal used throughout the project: tiles in order with the empty tile last"""
+    return PuzzleState.from_tiles(bytes((i + 1) % (size * size) for i in range(size * size)), size)
@@ -0,0 +1,232 @@
+"""
+Memory-bounded A* (SMA*).
+
+The search keeps an explicit tree of at most max_nodes nodes. When a new expansion
+pushes the tree over budget, the worst leaf (highest f, shallowest first) is dropped
+and its f is remembered by its parent, so the parent knows how good the forgotten
+subtree was. A parent whose children were forgotten goes back on the open list under
+that remembered f and regenerates them only if nothing better is left.
+
+f values are kept monotone along paths (a child's f is at least its parent's) and
+are backed up from children to parents, so they stay admissible lower bounds.
+A node that could only be extended by exceeding the budget gets f = infinity.
+With a consistent heuristic the result is optimal whenever the budget can hold the
+optimal path; if it cannot, no path is returned, but proving that can take as long
+as a full tree search of every f layer.
+"""
+import sys
+import heapq
+import itertools
+
+from logic.puzzle_state import PuzzleState, OPPOSITE
+from algorithms.control import CHECK_MASK
+
+INFINITY = float('inf')
+
+
+class Node:
+    """Search tree node; children maps actions to the live child nodes"""
+    __slots__ = ('tiles', 'g', 'h', 'f', 'depth', 'parent', 'action', 'children', 'forgotten', 'version', 'queued')
+
+    def __init__(self, tiles, g, h, f, parent, action):
+        self.tiles = tiles
+        self.g = g
+        self.h = h
+        self.f = f
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.parent = parent
+        self.action = action
+        self.children = {}
+        # Smallest f among dropped children, INFINITY if none were dropped
+        self.forgotten = INFINITY
+        # Bumped whenever the node's queue entries become stale
+        self.version = 0
+        self.queued = False
+
+
+def node_footprint(size):
+    """Estimated bytes held by one node: the object, its board, child map and queue entries"""
+    root = Node(bytes(size * size), 0, 0, 0, None, None)
+    entry = (0, 0, 0, 0, root)
+    return (sys.getsizeof(root) + sys.getsizeof(root.tiles) + sys.getsizeof(root.children)
+            + 2 * sys.getsizeof(entry))
+
+
+def sma_star(start, goal, heuristic, max_nodes=None, max_bytes=None, stats=None, control=None):
+    """
+    Simplified memory-bounded A* search from start to goal.
+
+        start: The initial PuzzleState
+        goal: The goal PuzzleState
+        heuristic: Function heuristic(state, goal), optionally with a delta attribute. It
+            only needs to be admissible: a child's f is at least its parent's (pathmax),
+            so inconsistent heuristics such as the pattern database stay optimal
+        max_nodes: Most nodes kept in memory at once (at least 2)
+        max_bytes: Memory budget in bytes, converted to a node budget with node_footprint;
+            the tighter of the two budgets applies. Without either, the search is unbounded.
+        stats: Optional SearchStats filled in when the search ends. peak_open is the largest
+            tree held, reopened counts parents queued again to regenerate forgotten children,
+            and extra receives 'nodes' and 'bytes' (the footprint when the search ended),
+            'peak_bytes' and 'evictions'
+        control: Optional SearchControl for cancellation and budgets
+
+    Returns:
+        tuple: (path, expansions); the path is empty if the budget cannot hold a solution
+    """
+    size = start.size
+    delta = getattr(heuristic, 'delta', None)
+    node_bytes = node_footprint(size)
+    limit = INFINITY
+    if max_nodes is not None:
+        limit = max_nodes
+    if max_bytes is not None:
+        limit = min(limit, max_bytes // node_bytes)
+    if limit < 2:
+        raise ValueError("The memory budget must hold at least two nodes")
+
+    # Min-heap for expansion (lowest f, deepest first) and max-heap for eviction
+    # (highest f, shallowest first); entries are dropped lazily when the version changes
+    open_heap = []
+    evict_heap = []
+    counter = itertools.count()
+
+    def push(node, key):
+        node.version += 1
+        node.queued = True
+        heapq.heappush(open_heap, (key, -node.depth, next(counter), node.version, node))
+        if not node.children:
+            heapq.heappush(evict_heap, (-key, node.depth, next(counter), node.version, node))
+
+    def unqueue(node):
+        node.version += 1
+        node.queued = False
+
+    get_successors = PuzzleState.get_successors
+    pop = heapq.heappop
+    if stats is not None:
+        stats.begin()
+        get_successors = stats.timed(get_successors, 'successors')
+        pop = stats.timed(pop, 'queue')
+        push, unqueue = stats.timed(push, 'queue'), stats.timed(unqueue, 'queue')
+        heuristic = stats.timed(heuristic, 'heuristic')
+        if delta is not None:
+            delta = stats.timed(delta, 'heuristic')
+
+    root_h = heuristic(start, goal)
+    root = Node(start.tiles, 0, root_h, root_h, None, None)
+    push(root, root.f)
+    count = 1
+    peak = 1
+    evictions = 0
+
+    # Counters for number of nodes expanded and for stats
+    expansions = generated = duplicates = reopened = 0
+    path = []
+
+    try:
+        while open_heap:
+            key, _, _, version, node = pop(open_heap)
+            if version != node.version:
+                continue
+            if key == INFINITY:
+                # Every remaining node needs more memory than the budget allows
+                break
+            unqueue(node)
+
+            if node.tiles == goal.tiles:
+                while node.parent is not None:
+                    path.append(node.action)
+                    node = node.parent
+                path.reverse()
+                break
+
+            expansions += 1
+            if control is not None and expansions & CHECK_MASK == 0:
+                control.check(expansions, count, len(open_heap), key)
+            current = PuzzleState.from_tiles(node.tiles, size)
+            node.forgotten = INFINITY
+            for action, next_state in get_successors(current):
+                # Never undo the move that led here, and keep children that are still in memory
+                if action in node.children or (node.action is not None and action == OPPOSITE[node.action]):
+                    duplicates += 1
+                    continue
+                generated += 1
+                if delta is not None:
+                    next_h = node.h + delta(current, next_state, goal)
+                else:
+                    next_h = heuristic(next_state, goal)
+                next_g = node.g + 1
+                if next_state.tiles != goal.tiles and node.depth + 2 >= limit:
+                    # Any extension of this child would need more nodes than the budget holds
+                    next_f = INFINITY
+                else:
+                    next_f = max(node.f, next_g + next_h)
+                child = Node(next_state.tiles, next_g, next_h, next_f, node, action)
+                node.children[action] = child
+                count += 1
+                push(child, child.f)
+
+            _backup(node)
+
+            # Drop the worst leaves until the tree fits the budget again
+            while count > limit:
+                leaf = _pop_worst_leaf(evict_heap, node)
+                if leaf is None:
+                    break
+                parent = leaf.parent
+                unqueue(leaf)
+                del parent.children[leaf.action]
+                parent.forgotten = min(parent.forgotten, leaf.f)
+                count -= 1
+                evictions += 1
+                # The parent must be revisited to regenerate what was forgotten
+                if not parent.queued:
+                    reopened += 1
+                push(parent, parent.forgotten)
+
+            peak = max(peak, count)
+
+            # Stale queue entries count against memory too; rebuild the heaps once they dominate
+            if len(open_heap) + len(evict_heap) > 4 * count + 64:
+                open_heap[:] = [entry for entry in open_heap if entry[3] == entry[-1].version]
+                evict_heap[:] = [entry for entry in evict_heap if entry[3] == entry[-1].version]
+                heapq.heapify(open_heap)
+                heapq.heapify(evict_heap)
+
+        return path, expansions
+    finally:
+        if stats is not None:
+            stats.end(expansions, generated, duplicates, reopened, peak, 0, nodes=count,
+                      bytes=count * node_bytes, peak_bytes=peak * node_bytes, evictions=evictions)
+
+
+def _pop_worst_leaf(evict_heap, expanded):
+    """
+    Highest-f, shallowest leaf other than the root, or None if there is none.
+    The last child of the node just expanded is kept so every expansion makes progress.
+    """
+    kept = None
+    leaf = None
+    while evict_heap:
+        entry = heapq.heappop(evict_heap)
+        candidate = entry[-1]
+        if entry[3] != candidate.version or candidate.children or not candidate.queued or candidate.parent is None:
+            continue
+        if candidate.parent is expanded and len(expanded.children) == 1:
+            kept = entry
+            continue
+        leaf = candidate
+        break
+    if kept is not None:
+        heapq.heappush(evict_heap, kept)
+    return leaf
+
+
+def _backup(node):
+    """Raise f values towards the root to the best f of their children and forgotten subtrees"""
+    while node is not None:
+        best = min([child.f for child in node.children.values()] + [node.forgotten])
+        if best <= node.f:
+            return
+        node.f = best
+        node = node.parent
@@ -0,0 +1,141 @@
+"""
+Counters and timings collected by a search.
+
+Pass a SearchStats as the stats argument of any algorithm and it is filled in when
+the search returns or is aborted. Counters are kept in local variables during the
+search and copied over once, so collecting them costs next to nothing.
+
+Timings are opt-in: with timing=True the search wraps its successor generation,
+heuristic evaluation and queue operations in timers. The wrappers slow the search
+down, so the split is meant for comparing hot paths, not for absolute speed.
+With trace_memory=True the peak Python allocation during the search is measured
+with tracemalloc, which slows the search down considerably.
+"""
+import time
+import tracemalloc
+
+# Timed parts of a search
+TIMED = ('successors', 'heuristic', 'queue')
+
+
+class SearchStats:
+    """
+    Statistics of one search, or the sum of several after merge().
+
+        expanded: Nodes whose successors were generated (goal tests included)
+        generated: Successors produced
+        duplicates: Successors dropped because their board was already known at no higher cost
+            (or, for searches without duplicate detection, because they undid the last move)
+        reopened: Expanded nodes put back on the open list after a cheaper path was found
+        peak_open: Largest open list, queue or stack
+        peak_closed: Most expanded nodes held at once
+        peak_memory: Peak traced allocation in bytes, None unless trace_memory was set
+        elapsed: Wall time of the search in seconds
+        times: Seconds spent per part of TIMED, all zero unless timing was set
+        extra: Algorithm-specific values, e.g. per-worker expansions of hda_star
+        searches: Number of searches summed into this object
+    """
+
+    def __init__(self, timing=False, trace_memory=False):
+        self.timing = timing
+        self.trace_memory = trace_memory
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.reopened = 0
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.peak_memory = None
+        self.elapsed = 0.0
+        self.times = {part: 0.0 for part in TIMED}
+        self.extra = {}
+        self.searches = 0
+        self._started = None
+        self._tracing = False
+
+    def begin(self):
+        """Called by the search when it starts"""
+        if self.trace_memory:
+            # Leave tracing alone if the caller already runs tracemalloc
+            self._tracing = not tracemalloc.is_tracing()
+            if self._tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+
+    def end(self, expanded=0, generated=0, duplicates=0, reopened=0, peak_open=0, peak_closed=0, **extra):
+        """Called by the search when it returns or is aborted, with its final counters"""
+        if self._started is not None:
+            self.elapsed += time.perf_counter() - self._started
+            self._started = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peak_memory = max(self.peak_memory or 0, peak)
+            if self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+        self.add(expanded, generated, duplicates, reopened, peak_open, peak_closed)
+        self.extra.update(extra)
+        self.searches += 1
+
+    def add(self, expanded=0, generated=0, duplicates=0, reopened=0, peak_open=0, peak_closed=0):
+        """Add counters of one part of a search, such as one iteration of ids"""
+        self.expanded += expanded
+        self.generated += generated
+        self.duplicates += duplicates
+        self.reopened += reopened
+        self.peak_open = max(self.peak_open, peak_open)
+        self.peak_closed = max(self.peak_closed, peak_closed)
+
+    def timed(self, function, part):
+        """function itself, or a wrapper adding its running time to times[part] when timing is on"""
+        if not self.timing:
+            return function
+        clock = time.perf_counter
+        times = self.times
+
+        def wrapper(*args):
+            started = clock()
+            try:
+                return function(*args)
+            finally:
+                times[part] += clock() - started
+
+        return wrapper
+
+    def merge(self, other):
+        """Add the counters of another SearchStats; peaks keep the maximum"""
+        self.expanded += other.expanded
+        self.generated += other.generated
+        self.duplicates += other.duplicates
+        self.reopened += other.reopened
+        self.peak_open = max(self.peak_open, other.peak_open)
+        self.peak_closed = max(self.peak_closed, other.peak_closed)
+        if other.peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, other.peak_memory)
+        self.elapsed += other.elapsed
+        for part in TIMED:
+            self.times[part] += other.times[part]
+        self.searches += other.searches
+        return self
+
+    def as_dict(self):
+        """Plain dict of every statistic, e.g. for JSON output"""
+        return {
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'duplicates': self.duplicates,
+            'reopened': self.reopened,
+            'peak_open': self.peak_open,
+            'peak_closed': self.peak_closed,
+            'peak_memory': self.peak_memory,
+            'elapsed': self.elapsed,
+            'times': dict(self.times),
+            'extra': dict(self.extra),
+            'searches': self.searches,
+        }
+
+    def __repr__(self):
+        return (f"SearchStats(expanded={self.expanded}, generated={self.generated}, "
+                f"duplicates={self.duplicates}, reopened={self.reopened}, peak_open={self.peak_open}, "
+                f"peak_closed={self.peak_closed}, peak_memory={self.peak_memory}, elapsed={self.elapsed:.3f})")
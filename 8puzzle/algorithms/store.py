@@ -0,0 +1,164 @@
+"""
+Persistent solution store shared between runs and processes.
+
+Solutions are kept in an SQLite database keyed by board size, packed start board,
+packed goal board and algorithm name. Paths are packed at 2 bits per move with the
+move codes of algorithms.arena, so a 31-move 3x3 solution takes 8 bytes.
+
+The database runs in write-ahead-log mode: any number of processes can read while
+one writes, and writers wait for each other up to the busy timeout instead of
+failing. Every thread gets its own connection, so one SolutionStore can be shared
+by the threads of a process; worker processes should open their own.
+
+    store = SolutionStore()
+    hit = store.get(start, goal, 'astar-manhattan')
+    if hit is None:
+        path, expansions = astar(start, goal, heuristic_manhattan)
+        store.put(start, goal, 'astar-manhattan', path, expansions)
+"""
+import os
+import time
+import sqlite3
+import threading
+
+from logic.storage import DATA_DIRECTORY
+from algorithms.arena import MOVES, MOVE_CODES
+
+# Database used unless a path is given
+DEFAULT_PATH = os.path.join(DATA_DIRECTORY, 'solutions.sqlite')
+
+# Seconds a writer waits for another one before giving up
+BUSY_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    size INTEGER NOT NULL,
+    board BLOB NOT NULL,
+    goal BLOB NOT NULL,
+    algorithm TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    moves BLOB NOT NULL,
+    expansions INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (size, board, goal, algorithm)
+) WITHOUT ROWID
+"""
+
+
+def pack_path(path):
+    """Moves packed four per byte, first move in the lowest bits"""
+    packed = bytearray((len(path) + 3) >> 2)
+    for i, action in enumerate(path):
+        packed[i >> 2] |= MOVE_CODES[action] << ((i & 3) * 2)
+    return bytes(packed)
+
+
+def unpack_path(packed, length):
+    """Inverse of pack_path for a path of length moves"""
+    return [MOVES[(packed[i >> 2] >> ((i & 3) * 2)) & 3] for i in range(length)]
+
+
+class SolutionStore:
+    """
+    Solutions on disk, keyed by (size, board, goal, algorithm).
+
+        path: Database file, created with its directory if missing
+        timeout: Seconds to wait for a concurrent writer
+    Counters of this object:
+        hits, misses: Lookups answered and not answered
+        writes: Solutions stored
+    """
+
+    def __init__(self, path=DEFAULT_PATH, timeout=BUSY_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Create the schema up front so readers never see a missing table
+        self._connection()
+
+    def _connection(self):
+        """This thread's connection, opened on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # WAL keeps committed data safe across crashes without syncing on every write
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def get(self, start, goal, algorithm):
+        """(path, expansions, seconds) stored for start, goal and algorithm, or None"""
+        row = self._connection().execute(
+            "SELECT length, moves, expansions, seconds FROM solutions "
+            "WHERE size = ? AND board = ? AND goal = ? AND algorithm = ?",
+            (start.size, start.tiles, goal.tiles, algorithm)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        length, moves, expansions, seconds = row
+        return unpack_path(moves, length), expansions, seconds
+
+    def put(self, start, goal, algorithm, path, expansions=0, seconds=0.0):
+        """
+        Store a solution. An existing entry is only replaced by a shorter path, so
+        concurrent writers of the same board cannot make it worse.
+        """
+        self._connection().execute(
+            "INSERT INTO solutions (size, board, goal, algorithm, length, moves, expansions, seconds, created) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (size, board, goal, algorithm) DO UPDATE SET "
+            "length = excluded.length, moves = excluded.moves, expansions = excluded.expansions, "
+            "seconds = excluded.seconds, created = excluded.created "
+            "WHERE excluded.length < solutions.length",
+            (start.size, start.tiles, goal.tiles, algorithm, len(path), pack_path(path), expansions, seconds,
+             time.time()))
+        self.writes += 1
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        """Close this thread's connection; other threads close theirs when they exit"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def stored(solver, store, algorithm):
+    """
+    Wrap a solver with the common (start, goal, **options) -> (path, expansions)
+    signature so solutions are read from and written to store under algorithm.
+    A hit returns the stored expansions without calling the solver.
+    """
+    def solve(start, goal, **options):
+        hit = store.get(start, goal, algorithm)
+        if hit is not None:
+            return hit[0], hit[1]
+        start_time = time.time()
+        path, expansions = solver(start, goal, **options)
+        # An empty path means no solution unless start is already the goal
+        if path or start == goal:
+            store.put(start, goal, algorithm, path, expansions, time.time() - start_time)
+        return path, expansions
+
+    return solve
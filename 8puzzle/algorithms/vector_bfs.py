@@ -0,0 +1,224 @@
+"""
+Layer-synchronous breadth-first search over NumPy arrays.
+
+Instead of taking states off a queue one at a time, the search holds a whole depth
+layer as a sorted uint64 array with every board packed into one integer, 4 bits per
+cell, cell i in bits 4i..4i+3. Boards up to 4x4 fit. All children of a layer are
+made with a few array operations per move direction: the tile next to the blank is
+shifted into the blank's nibble.
+
+Duplicates are removed with sorted-array set operations: np.unique within the new
+layer, then searchsorted against the layer before the parent layer. Every move
+flips the row+column parity of the blank, so no child can lie in its parents' own
+layer, and the move undoing a node's own move is never made.
+
+For every layer only the parent index and 2-bit move code of each node are kept for
+path reconstruction, plus the packed boards of the last two layers:
+
+    path, expansions = vector_bfs(start, goal)
+    for depth, boards in enumerate(bfs_layers(goal)):
+        print(depth, len(boards))
+
+Needs NumPy.
+"""
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed by this search
+    np = None
+
+from logic.moves import MOVES, INVERSE, NO_MOVE
+
+# Bits per cell of a packed board
+CELL_BITS = 4
+
+# Largest board size whose packed boards fit in 64 bits
+MAX_VECTOR_SIZE = 4
+
+
+def _require(size):
+    if np is None:
+        raise ImportError("NumPy is required for the vectorized BFS")
+    if size > MAX_VECTOR_SIZE:
+        raise ValueError(f"The vectorized BFS packs boards into 64 bits, so it only handles boards up to "
+                         f"{MAX_VECTOR_SIZE}x{MAX_VECTOR_SIZE}")
+
+
+def encode_board(tiles):
+    """A packed board (bytes) as one integer, cell i in bits 4i..4i+3"""
+    key = 0
+    for index, value in enumerate(tiles):
+        key |= value << (CELL_BITS * index)
+    return key
+
+
+def decode_boards(keys, size):
+    """Inverse of encode_board for an array of keys: a (count, size*size) uint8 array"""
+    _require(size)
+    shifts = np.arange(size * size, dtype=np.uint64) * np.uint64(CELL_BITS)
+    return ((np.asarray(keys, dtype=np.uint64)[:, None] >> shifts) & np.uint64(15)).astype(np.uint8)
+
+
+def _move_offsets(size):
+    """For every move code, the blank's index offset and a test of its row and column for legality"""
+    return (
+        (-size, lambda rows, cols: rows > 0),
+        (size, lambda rows, cols: rows < size - 1),
+        (-1, lambda rows, cols: cols > 0),
+        (1, lambda rows, cols: cols < size - 1),
+    )
+
+
+def expand_layer(keys, blanks, moves, size):
+    """
+    All children of a layer, one move direction after the other.
+
+        keys: Packed boards of the layer (uint64)
+        blanks: Blank index of every board (uint8)
+        moves: Move code that led to every board, NO_MOVE for the root (uint8)
+    Returns (children, child blanks, parent indices, move codes); the move undoing
+    a board's own move is left out.
+    """
+    rows, cols = np.divmod(blanks, size)
+    children, child_blanks, parents, codes = [], [], [], []
+    for code, (offset, legal) in enumerate(_move_offsets(size)):
+        mask = legal(rows, cols) & (moves != INVERSE[code])
+        parent = np.flatnonzero(mask)
+        if not len(parent):
+            continue
+        blank = blanks[parent].astype(np.uint64)
+        target = (blanks[parent].astype(np.int64) + offset).astype(np.uint64)
+        key = keys[parent]
+        target_shift = target * np.uint64(CELL_BITS)
+        # Slide the tile at target into the blank's cell, which holds 0
+        tile = (key >> target_shift) & np.uint64(15)
+        children.append((key - (tile << target_shift)) | (tile << (blank * np.uint64(CELL_BITS))))
+        child_blanks.append(target.astype(np.uint8))
+        parents.append(parent.astype(np.int32))
+        codes.append(np.full(len(parent), code, dtype=np.uint8))
+    if not children:
+        return (np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint8),
+                np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.uint8))
+    return np.concatenate(children), np.concatenate(child_blanks), np.concatenate(parents), np.concatenate(codes)
+
+
+def new_boards(children, older):
+    """
+    Indices of the first occurrence of every distinct child not in older, ordered by
+    the packed board so the children they select come out sorted.
+
+        children: Packed children of one layer
+        older: Sorted packed boards of the layer before the parent layer
+    """
+    unique, first = np.unique(children, return_index=True)
+    if len(older):
+        position = np.searchsorted(older, unique)
+        position[position == len(older)] = 0
+        first = first[older[position] != unique]
+    return first
+
+
+def _layers(start, max_depth=None, stats=None):
+    """
+    Yield (depth, keys, blanks, parents, moves, made) for every layer reachable from
+    start, with keys sorted; parents index the previous layer's keys and made is the
+    number of children generated to build the layer, duplicates included.
+    """
+    size = start.size
+    keys = np.array([encode_board(start.tiles)], dtype=np.uint64)
+    blanks = np.array([start.blank], dtype=np.uint8)
+    moves = np.array([NO_MOVE], dtype=np.uint8)
+    older = np.zeros(0, dtype=np.uint64)
+    expand = expand_layer
+    if stats is not None:
+        expand = stats.timed(expand, 'successors')
+
+    depth = 0
+    yield depth, keys, blanks, np.zeros(1, dtype=np.int32), moves, 0
+    while len(keys) and (max_depth is None or depth < max_depth):
+        children, child_blanks, parents, codes = expand(keys, blanks, moves, size)
+        first = new_boards(children, older)
+        older = keys
+        keys, blanks, moves = children[first], child_blanks[first], codes[first]
+        depth += 1
+        yield depth, keys, blanks, parents[first], moves, len(children)
+
+
+def vector_bfs(start, goal, max_depth=None, control=None, stats=None):
+    """
+    Breadth-first search one whole depth layer at a time.
+
+        start: Starting PuzzleState, at most 4x4
+        goal: Goal PuzzleState
+        max_depth: Maximum search depth (optional)
+        control: Optional SearchControl, checked once per layer
+        stats: Optional SearchStats filled in when the search ends; peak_open is the
+            largest layer, peak_closed the boards discovered and extra['layers'] the
+            number of layers made. Only child generation is timed.
+
+    Returns:
+        tuple: (path, expansions); expansions counts the boards of every layer
+            expanded, not the goal itself
+    """
+    _require(start.size)
+    goal_key = np.uint64(encode_board(goal.tiles))
+
+    # Counters for stats
+    expansions = generated = duplicates = discovered = peak_open = layers = 0
+    previous = 0  # Boards in the previous layer
+
+    # Per layer, the parent index and move code of every board
+    history = []
+
+    if stats is not None:
+        stats.begin()
+    try:
+        for depth, keys, _, parents, moves, made in _layers(start, max_depth, stats):
+            layers = depth + 1
+            history.append((parents, moves))
+            expansions += previous
+            generated += made
+            duplicates += made - len(keys)
+            discovered += len(keys)
+            previous = len(keys)
+            if previous > peak_open:
+                peak_open = previous
+
+            # Goal check: keys are sorted
+            position = np.searchsorted(keys, goal_key)
+            if position < len(keys) and keys[position] == goal_key:
+                # Walk the parent indices back to the start
+                path = []
+                node = int(position)
+                for parents, moves in reversed(history[1:]):
+                    path.append(MOVES[moves[node]])
+                    node = int(parents[node])
+                path.reverse()
+                return path, expansions
+
+            if control is not None:
+                control.check(expansions, discovered, previous, depth)
+
+        # No solution found
+        return [], expansions
+    finally:
+        if stats is not None:
+            stats.end(expansions, generated, duplicates, 0, peak_open, discovered, layers=layers)
+
+
+def bfs_layers(start, max_depth=None, control=None):
+    """
+    Yield the packed boards of every depth layer from start, as sorted uint64 arrays;
+    decode_boards turns them back into rows of tiles.
+
+        control: Optional SearchControl, checked once per layer
+    """
+    _require(start.size)
+    boards = 0
+    for depth, keys, _, _, _, _ in _layers(start, max_depth):
+        if not len(keys):
+            # Every reachable board has been found
+            return
+        yield keys
+        boards += len(keys)
+        if control is not None:
+            control.check(boards, boards, len(keys), depth)
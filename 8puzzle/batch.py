@@ -0,0 +1,327 @@
+"""
+Solve many boards across a pool of worker processes.
+
+Boards are read from a file or stdin in one of three formats:
+    text    rows of whitespace-separated numbers, boards separated by blank lines
+            (a single board is the format PuzzleGUI.load_puzzle reads)
+    jsonl   one JSON value per line: a list of rows, a flat list, or an object
+            whose "board" key holds either
+    binary  records of one size byte followed by size*size tile bytes
+
+Results are written as JSON lines, in input order or as soon as each chunk finishes:
+    python batch.py boards.jsonl --solver astar-manhattan --workers 8 --chunksize 64
+    cat boards.txt | python batch.py --format text --order completion
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from math import isqrt
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from logic.puzzle_state import PuzzleState
+from logic.ranking import board_class
+from algorithms.registry import SOLVERS, OPTIMAL, get_solver, goal_state, prepare_solver
+from algorithms.control import SearchControl, SearchAborted
+from algorithms.cache import SolutionCache
+from algorithms.store import SolutionStore, DEFAULT_PATH as DEFAULT_STORE
+
+FORMATS = ('text', 'jsonl', 'binary')
+ORDERS = ('input', 'completion')
+
+# Seconds between two progress lines on stderr
+PROGRESS_INTERVAL = 1.0
+
+# Input formats guessed from file extensions
+EXTENSIONS = {'.txt': 'text', '.jsonl': 'jsonl', '.json': 'jsonl', '.bin': 'binary'}
+
+# Solution cache and persistent store of this worker process, set up by _init_worker
+_cache = None
+_store = None
+
+# (solver, size) pairs whose tables this process has already built or loaded
+_prepared = set()
+
+
+def read_text(stream):
+    """Yield flat tile lists from blocks of text rows separated by blank lines"""
+    rows = []
+    for line in stream:
+        line = line.strip()
+        if line:
+            rows.append(line.split())
+        elif rows:
+            yield [int(x) for row in rows for x in row]
+            rows = []
+    if rows:
+        yield [int(x) for row in rows for x in row]
+
+
+def read_jsonl(stream):
+    """Yield flat tile lists from JSON lines"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        board = json.loads(line)
+        if isinstance(board, dict):
+            board = board["board"]
+        if board and isinstance(board[0], list):
+            board = [num for row in board for num in row]
+        yield board
+
+
+def read_binary(stream):
+    """Yield flat tile lists from size-prefixed binary records"""
+    while True:
+        header = stream.read(1)
+        if not header:
+            return
+        cells = header[0] * header[0]
+        tiles = stream.read(cells)
+        if len(tiles) != cells:
+            raise ValueError("Truncated binary record")
+        yield list(tiles)
+
+
+def write_binary(stream, boards):
+    """Write flat tile lists as size-prefixed binary records"""
+    for board in boards:
+        stream.write(bytes([isqrt(len(board))]) + bytes(board))
+
+
+def read_boards(path=None, fmt=None):
+    """
+    Yield flat tile lists from a file, or from stdin when path is None or '-'.
+
+        path: Input file
+        fmt: One of FORMATS; guessed from the file extension when None (text for stdin)
+    """
+    if fmt is None:
+        extension = os.path.splitext(path)[1].lower() if path not in (None, '-') else ''
+        fmt = EXTENSIONS.get(extension, 'text')
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    readers = {'text': read_text, 'jsonl': read_jsonl, 'binary': read_binary}
+
+    if path in (None, '-'):
+        stream = sys.stdin.buffer if fmt == 'binary' else sys.stdin
+        yield from readers[fmt](stream)
+        return
+    with open(path, 'rb' if fmt == 'binary' else 'r') as stream:
+        yield from readers[fmt](stream)
+
+
+def solve_board(solver, number, board, time_limit=None):
+    """
+    Solve one flat board and describe the outcome as a JSON-ready dict.
+    Invalid and unsolvable boards, and searches stopped by the time limit,
+    produce an "error" entry instead of raising.
+    """
+    result = {"index": number, "board": board, "solver": solver}
+    size = isqrt(len(board))
+    if size < 2 or size * size != len(board) or sorted(board) != list(range(size * size)):
+        result["error"] = "Board must be square and contain each number from 0 to size*size-1 once"
+        return result
+
+    start = PuzzleState.from_tiles(bytes(board), size)
+    goal = goal_state(size)
+    if board_class(start.tiles, size) != board_class(goal.tiles, size):
+        result["error"] = "Not solvable"
+        return result
+
+    if _cache is not None:
+        # Boards on earlier solutions of this worker are answered without searching
+        path = _cache.get(start, goal, solver in OPTIMAL)
+        if path is not None:
+            result.update(time=0.0, path=path, length=len(path), expansions=0, cached=True)
+            return result
+    if _store is not None:
+        # Solved by an earlier run with the same solver
+        hit = _store.get(start, goal, solver)
+        if hit is not None:
+            path, expansions, seconds = hit
+            result.update(time=seconds, path=path, length=len(path), expansions=expansions, stored=True)
+            if _cache is not None:
+                _cache.put(start, path, goal, solver in OPTIMAL)
+            return result
+
+    if (solver, size) not in _prepared:
+        # Tables are built or loaded once per worker, outside the timed search
+        try:
+            prepare_solver(solver, goal)
+        except ValueError as e:
+            result["error"] = str(e)
+            return result
+        _prepared.add((solver, size))
+
+    control = SearchControl(time_limit=time_limit) if time_limit is not None else None
+    start_time = time.time()
+    try:
+        path, expansions = get_solver(solver)(start, goal, control=control)
+    except SearchAborted as e:
+        result["time"] = time.time() - start_time
+        result["expansions"] = e.expansions
+        result["error"] = f"Aborted ({e.reason})"
+        return result
+    result["time"] = time.time() - start_time
+    result["path"] = path
+    result["length"] = len(path)
+    result["expansions"] = expansions
+    if not path and start != goal:
+        result["error"] = "No solution found"
+    else:
+        if _cache is not None:
+            _cache.put(start, path, goal, solver in OPTIMAL)
+        if _store is not None:
+            _store.put(start, goal, solver, path, expansions, result["time"])
+    return result
+
+
+def solve_chunk(solver, chunk, time_limit=None):
+    """Solve a list of (index, board) pairs in one worker call"""
+    return [solve_board(solver, number, board, time_limit) for number, board in chunk]
+
+
+def _init_worker(cache_size, store_path=None):
+    """
+    Give the worker process its own solution cache of cache_size boards (none if 0)
+    and its own connection to the solution store at store_path (none if None)
+    """
+    global _cache, _store
+    _cache = SolutionCache(cache_size) if cache_size else None
+    _store = SolutionStore(store_path) if store_path else None
+
+
+def _chunks(boards, chunksize):
+    """Group boards into lists of (index, board) pairs"""
+    chunk = []
+    for number, board in enumerate(boards):
+        chunk.append((number, board))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_batch(boards, solver='astar-manhattan', workers=None, chunksize=16, order='input', time_limit=None,
+                cache_size=0, store_path=None):
+    """
+    Solve an iterable of flat boards across worker processes, yielding result dicts.
+
+        boards: Iterable of flat tile lists; consumed lazily
+        solver: Name of a solver in algorithms.registry.SOLVERS
+        workers: Number of processes (default: os.cpu_count())
+        chunksize: Boards sent to a worker per task
+        order: 'input' yields results in input order,
+               'completion' yields each chunk's results as soon as it finishes
+        time_limit: Seconds each board may take before its search is stopped
+        cache_size: Boards each worker keeps in its SolutionCache; results answered
+               from it carry "cached": true. 0 disables the cache.
+        store_path: SolutionStore database shared with other runs; results read
+               from it carry "stored": true and the time of the original solve
+    """
+    get_solver(solver)
+    if order not in ORDERS:
+        raise ValueError(f"Unknown order: {order}")
+    workers = workers or os.cpu_count() or 1
+    # Chunks in flight at once; enough to keep every worker busy without reading all input up front
+    window = workers * 2
+
+    chunks = _chunks(boards, chunksize)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_size, store_path)) as executor:
+        try:
+            if order == 'input':
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(solve_chunk, solver, chunk, time_limit))
+                    if len(pending) >= window:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            else:
+                pending = set()
+                for chunk in chunks:
+                    pending.add(executor.submit(solve_chunk, solver, chunk, time_limit))
+                    if len(pending) >= window:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield from future.result()
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+        except GeneratorExit:
+            # The caller stopped reading, e.g. a closed pipe: drop the chunks not started yet
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a batch of boards in parallel")
+    parser.add_argument('input', nargs='?', default='-', help="Input file (default: stdin)")
+    parser.add_argument('--format', choices=FORMATS, help="Input format (default: from the file extension, text for stdin)")
+    parser.add_argument('--solver', choices=sorted(SOLVERS), default='astar-manhattan',
+                        help="Solver to use (default: astar-manhattan)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=int, default=16, help="Boards per worker task (default: 16)")
+    parser.add_argument('--order', choices=ORDERS, default='input', help="Result order (default: input)")
+    parser.add_argument('--time-limit', type=float, default=None, help="Seconds allowed per board (default: none)")
+    parser.add_argument('--output', default='-', help="Output JSONL file (default: stdout)")
+    parser.add_argument('--progress', action='store_true', help="Report boards done and throughput on stderr")
+    parser.add_argument('--cache', type=int, default=0,
+                        help="Boards each worker remembers from earlier solution paths (default: 0, no cache)")
+    parser.add_argument('--store', nargs='?', const=DEFAULT_STORE, default=None,
+                        help=f"Reuse and record solutions in a solution database (default file: {DEFAULT_STORE})")
+    args = parser.parse_args()
+
+    boards = read_boards(args.input, args.format)
+    results = solve_batch(boards, args.solver, args.workers, args.chunksize, args.order, args.time_limit, args.cache,
+                          args.store)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        solved = failed = expansions = cached = stored = 0
+        start_time = last_report = time.time()
+        for result in results:
+            try:
+                output.write(json.dumps(result) + "\n")
+            except BrokenPipeError:
+                # Reading only the first results, e.g. through head, is fine
+                results.close()
+                sys.stderr.close()
+                return
+            if "error" in result:
+                failed += 1
+            else:
+                solved += 1
+            expansions += result.get("expansions", 0)
+            cached += result.get("cached", False)
+            stored += result.get("stored", False)
+
+            if args.progress and time.time() - last_report >= PROGRESS_INTERVAL:
+                last_report = time.time()
+                elapsed = last_report - start_time
+                print(f"  ... {solved + failed} boards ({failed} failed) | {(solved + failed) / elapsed:,.1f} boards/s | "
+                      f"{expansions / elapsed:,.0f} nodes/s", file=sys.stderr)
+        try:
+            output.flush()
+        except BrokenPipeError:
+            sys.stderr.close()
+            return
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    summary = f"Solved {solved} boards, {failed} failed, in {time.time() - start_time:.2f}s"
+    if args.cache:
+        summary += f" ({cached} from cache)"
+    if args.store:
+        summary += f" ({stored} from store)"
+    print(summary, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Micro-benchmarks of the solver hot paths, with regression tracking.
+
+Every benchmark runs one operation over a fixed pool of boards scrambled from a fixed
+seed, on 3x3, 5x5 and 7x7 boards, and reports:
+    ops_per_sec   best of several timed rounds
+    peak_bytes    largest traced allocation of a single call (tracemalloc), i.e. the
+                  garbage one call produces before it is freed
+
+Timings depend on the machine, so no baseline is shipped. Record one on your own
+machine before making changes, then compare later runs against it:
+    python benchmark.py --output data/bench.json
+    python benchmark.py --baseline data/bench.json --threshold 0.1
+A benchmark regresses when its speed drops, or its allocation grows, by more than the
+threshold; the exit status is 1 if any did. Runs are only compared when --baseline
+is given.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+
+from logic.puzzle_state import PuzzleState
+from logic.moves import MoveEngine
+from algorithms.astar import BucketQueue
+from algorithms.registry import goal_state
+from heuristics.manhattan import heuristic_manhattan
+from heuristics.misplaced import misplaced_tiles
+
+SIZES = (3, 5, 7)
+SEED = 2024
+
+# Boards per pool and random moves used to scramble each one
+POOL_SIZE = 64
+SCRAMBLE_MOVES = 200
+
+# Timed rounds per benchmark; the fastest counts
+ROUNDS = 5
+
+# Relative change that counts as a regression
+DEFAULT_THRESHOLD = 0.10
+
+
+def make_pool(size, seed=SEED, count=POOL_SIZE):
+    """Boards scrambled by random moves from the goal, the same for every run with the same seed"""
+    rng = random.Random(f"{seed}-{size}")
+    state = goal_state(size)
+    pool = []
+    for _ in range(count):
+        for _ in range(SCRAMBLE_MOVES):
+            _, state = rng.choice(state.get_successors())
+        pool.append(state)
+    return pool
+
+
+def _is_solvable():
+    # gui needs tkinter; without it the benchmark is skipped
+    try:
+        from gui import is_solvable
+    except ImportError:
+        return None
+    return is_solvable
+
+
+def make_benchmarks(size, seed=SEED):
+    """
+    Map benchmark names to (function, arguments) pairs; one call of function(argument)
+    is one operation. Every argument list is built before timing starts.
+    """
+    pool = make_pool(size, seed)
+    goal = goal_state(size)
+    goals = [goal] * len(pool)
+
+    benchmarks = {
+        'get_successors': (PuzzleState.get_successors, [(state,) for state in pool]),
+        'move_up': (PuzzleState.move_up, [(state,) for state in pool]),
+        'move_down': (PuzzleState.move_down, [(state,) for state in pool]),
+        'move_left': (PuzzleState.move_left, [(state,) for state in pool]),
+        'move_right': (PuzzleState.move_right, [(state,) for state in pool]),
+        'to_tuple': (PuzzleState.to_tuple, [(state,) for state in pool]),
+        'hash': (hash, [(state,) for state in pool]),
+        'heuristic_manhattan': (heuristic_manhattan, list(zip(pool, goals))),
+        'misplaced_tiles': (misplaced_tiles, list(zip(pool, goals))),
+    }
+
+    # One put and one get on an open list holding a realistic number of entries
+    frontier = BucketQueue()
+    priorities = [(heuristic_manhattan(state, goal), depth % 8) for depth, state in enumerate(pool)]
+    for depth, (h, g) in enumerate(priorities * 16):
+        frontier.put(depth, g + h, g)
+
+    def put_get(priority, g):
+        frontier.put(None, priority, g)
+        return frontier.get()
+
+    benchmarks['queue_put_get'] = (put_get, [(g + h, g) for h, g in priorities])
+
+    # The in-place counterpart of get_successors: make and unmake every move
+    def make_unmake(engine):
+        for code, target in engine.options():
+            engine.apply(code, target)
+            engine.undo()
+
+    benchmarks['make_unmake'] = (make_unmake, [(MoveEngine(state),) for state in pool])
+
+    is_solvable = _is_solvable()
+    if is_solvable is not None:
+        benchmarks['is_solvable'] = (is_solvable, [(list(state.tiles),) for state in pool])
+    return benchmarks
+
+
+def time_benchmark(function, arguments, min_time=0.2, rounds=ROUNDS):
+    """Operations per second: best of rounds, each running the pool enough times to take min_time"""
+    clock = time.perf_counter
+    # Grow the repetition count until one round is long enough to time reliably
+    repeat = 1
+    while True:
+        start = clock()
+        for _ in range(repeat):
+            for args in arguments:
+                function(*args)
+        elapsed = clock() - start
+        if elapsed >= min_time:
+            break
+        repeat *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed * 1.2))
+
+    best = elapsed
+    for _ in range(rounds - 1):
+        start = clock()
+        for _ in range(repeat):
+            for args in arguments:
+                function(*args)
+        best = min(best, clock() - start)
+    return repeat * len(arguments) / best
+
+
+def measure_allocation(function, arguments):
+    """Largest traced allocation of a single call over the pool, in bytes"""
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        peak = 0
+        for args in arguments:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            function(*args)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+        return peak
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+def run_benchmarks(sizes=SIZES, seed=SEED, select=None, min_time=0.2):
+    """
+    Run every benchmark and return a JSON-ready dict.
+
+        sizes: Board sizes to benchmark
+        seed: Seed of the board pools
+        select: Optional substring; only benchmarks whose name contains it run
+        min_time: Least seconds per timed round
+    """
+    results = {}
+    for size in sizes:
+        for name, (function, arguments) in make_benchmarks(size, seed).items():
+            if select is not None and select not in name:
+                continue
+            key = f"{name}/{size}"
+            results[key] = {
+                'ops_per_sec': time_benchmark(function, arguments, min_time),
+                'peak_bytes': measure_allocation(function, arguments),
+            }
+            print(f"{key:<26} {results[key]['ops_per_sec']:>14,.0f} ops/s {results[key]['peak_bytes']:>8} B",
+                  file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'seed': seed,
+            'pool_size': POOL_SIZE,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare two run_benchmarks results. Returns a list of (name, metric, old, new, change)
+    for every benchmark that got slower, or allocates more, by more than threshold.
+    Benchmarks missing from either run are ignored.
+    """
+    regressions = []
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        if old['ops_per_sec'] > 0:
+            change = new['ops_per_sec'] / old['ops_per_sec'] - 1
+            if change < -threshold:
+                regressions.append((name, 'ops_per_sec', old['ops_per_sec'], new['ops_per_sec'], change))
+        # A few bytes either way are noise from small-object caches
+        if new['peak_bytes'] > old['peak_bytes'] * (1 + threshold) + 64:
+            change = new['peak_bytes'] / old['peak_bytes'] - 1 if old['peak_bytes'] else float('inf')
+            regressions.append((name, 'peak_bytes', old['peak_bytes'], new['peak_bytes'], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the solver hot paths")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help="Board sizes (default: 3 5 7)")
+    parser.add_argument('--seed', type=int, default=SEED, help=f"Seed of the board pools (default: {SEED})")
+    parser.add_argument('--select', help="Only run benchmarks whose name contains this text")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Least seconds per timed round (default: 0.2)")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--baseline', help="Compare against the results in this JSON file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Relative change flagged as a regression (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    current = run_benchmarks(args.sizes, args.seed, args.select, args.min_time)
+    if args.output:
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for name, metric, old, new, change in regressions:
+            print(f"REGRESSION {name} {metric}: {old:,.0f} -> {new:,.0f} ({change * 100:+.1f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold * 100:.0f}% against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,93 @@
 import time
 import random
+import argparse
 import statistics
 import threading
+import multiprocessing
+from collections import deque
+from functools import partial
+from multiprocessing.connection import wait
 from logic.puzzle_state import PuzzleState
 from algorithms.astar import astar
+from algorithms.control import SearchControl, SearchAborted, peak_memory_usage
+from algorithms.stats import SearchStats, TIMED
+from algorithms.store import SolutionStore, DEFAULT_PATH as DEFAULT_STORE
+from algorithms.registry import find_solver
 from heuristics.manhattan import heuristic_manhattan
+from heuristics.misplaced import misplaced_tiles
+from heuristics.linear_conflict import linear_conflict
+from heuristics.walking_distance import walking_distance
+from heuristics.pdb import pattern_database
+from heuristics.tables import compile_heuristic
+from logic.ranking import can_rank
+from generator import board_at_depth
+
+HEURISTICS = {
+    'manhattan': heuristic_manhattan,
+    'misplaced': misplaced_tiles,
+    'linear-conflict': linear_conflict,
+    'walking-distance': walking_distance,
+    'pdb': pattern_database,
+}
 
 class TimeoutError(Exception):
     pass
 
-def generate_random_puzzle(size, distance_from_goal=20):
+# Seconds between two progress lines during a trial
+PROGRESS_INTERVAL = 1.0
+
+# Seconds a cancelled search thread gets to stop before it is abandoned
+CANCEL_GRACE = 5.0
+
+# Seed of the per-trial puzzle generators
+DEFAULT_SEED = 0
+
+def trial_random(seed, size, distance_from_goal, trial):
+    # Every trial draws from its own generator, so its puzzle depends only on the seed and
+    # the trial's position, not on how many trials ran before it or on which worker
+    return random.Random(f"{seed}-{size}-{distance_from_goal}-{trial}")
+
+def generate_random_puzzle(size, distance_from_goal=20, rng=random):
     goal_board = [[(i * size + j + 1) % (size * size) for j in range(size)] for i in range(size)]
     state = PuzzleState(goal_board, size)
     moves_made = 0
     previous_states = set()
-    previous_states.add(tuple(map(tuple, state.board)))
+    previous_states.add(state.tiles)
 
     while moves_made < distance_from_goal:
         successors = state.get_successors()
         if not successors:
             break
         new_successors = [(move, new_state) for move, new_state in successors 
-                          if tuple(map(tuple, new_state.board)) not in previous_states]
+                          if new_state.tiles not in previous_states]
         if not new_successors and successors:
-            _, state = random.choice(successors)
+            _, state = rng.choice(successors)
         elif new_successors:
-            _, state = random.choice(new_successors)
+            _, state = rng.choice(new_successors)
         else:
             break
-        previous_states.add(tuple(map(tuple, state.board)))
+        previous_states.add(state.tiles)
         moves_made += 1
 
     return state.board, moves_made
 
-def run_with_timeout(func, args, timeout):
+def run_with_timeout(func, args, timeout, isolate=False, progress=None, stats=None):
+    # The search gets a control with the time limit and stops itself when it runs out;
+    # progress, if given, is called with the control's progress reports, and stats, if given,
+    # is a SearchStats the search fills in
+    if isolate:
+        return run_in_subprocess(func, args, timeout, progress, stats)
+
+    control = SearchControl(time_limit=timeout, progress=progress, progress_interval=PROGRESS_INTERVAL)
+    options = {'control': control}
+    if stats is not None:
+        options['stats'] = stats
     result = [None]
     exception = [None]
 
     def target():
         try:
-            result[0] = func(*args)
+            result[0] = func(*args, **options)
         except Exception as e:
             exception[0] = e
 
@@ -49,51 +97,252 @@ def run_with_timeout(func, args, timeout):
     thread.join(timeout)
 
     if thread.is_alive():
+        # Wait for the search to notice the cancellation so it stops using CPU and memory,
+        # but not forever: a search between two checks or inside a table build may not
+        # notice for a long time. An abandoned thread keeps running; --isolate kills instead.
+        control.cancel()
+        thread.join(CANCEL_GRACE)
+        if thread.is_alive():
+            print(f"Warning: the search did not stop within {CANCEL_GRACE:g}s of its timeout and was abandoned")
         raise TimeoutError()
+    if isinstance(exception[0], SearchAborted) and exception[0].reason in ('time', 'cancelled'):
+        raise TimeoutError()
+    # Other aborts (a memory, node or expansion budget) are errors that carry their reason
     if exception[0] is not None:
         raise exception[0]
     return result[0]
 
-def run_experiment(size, distance_from_goal, num_trials, timeout):
+def _subprocess_target(connection, func, args, report_progress, stats):
+    # Progress reports travel over the same pipe as the result; the filled-in stats, the search
+    # time and the process's peak resident set size travel with the result
+    options = {'control': None}
+    if report_progress:
+        options['control'] = SearchControl(progress=lambda progress: connection.send(("progress", progress)),
+                                           progress_interval=PROGRESS_INTERVAL)
+    if stats is not None:
+        options['stats'] = stats
+    try:
+        start_time = time.time()
+        result = func(*args, **options)
+        connection.send(("ok", (result, stats, time.time() - start_time, peak_memory_usage())))
+    except Exception as e:
+        connection.send(("error", e))
+    finally:
+        connection.close()
+
+def run_trials(func, trial_args, timeout, workers=1, progress=None, stats=None):
+    # Run func(*args) for every args in trial_args, each in its own process and at most workers at once.
+    # A process still running after timeout seconds is killed, so all its memory is returned.
+    # Yields (index, status, value, info) as trials finish, in completion order:
+    #   status 'ok' with the result, 'timeout' with None, or 'error' with the exception;
+    #   info holds the search 'time' and the process's 'peak_rss' for finished trials.
+    # progress, if given, is called as progress(index, report); stats, if given, holds one
+    # SearchStats per trial that is filled in for every trial that finishes.
+    pending = deque(range(len(trial_args)))
+    running = {}  # Pipe end -> (trial index, process, deadline)
+
+    def finish(receiver):
+        index, process, _ = running.pop(receiver)
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+        return index, process
+
+    try:
+        while pending or running:
+            # Keep every worker slot busy
+            while pending and len(running) < workers:
+                index = pending.popleft()
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                trial_stats = stats[index] if stats is not None else None
+                process = multiprocessing.Process(target=_subprocess_target, daemon=True,
+                                                  args=(sender, func, trial_args[index], progress is not None,
+                                                        trial_stats))
+                process.start()
+                sender.close()
+                running[receiver] = (index, process, time.time() + timeout)
+
+            next_deadline = min(deadline for _, _, deadline in running.values())
+            for receiver in wait(list(running), max(next_deadline - time.time(), 0)):
+                index = running[receiver][0]
+                try:
+                    status, value = receiver.recv()
+                except EOFError:
+                    _, process = finish(receiver)
+                    yield index, "error", RuntimeError(f"Search process exited with code {process.exitcode}"), {}
+                    continue
+                if status == "progress":
+                    progress(index, value)
+                    continue
+                finish(receiver)
+                if status == "error":
+                    yield index, "error", value, {}
+                    continue
+                value, child_stats, elapsed, peak_rss = value
+                if stats is not None:
+                    # The child filled in its own copy
+                    stats[index].merge(child_stats)
+                    stats[index].extra.update(child_stats.extra)
+                yield index, "ok", value, {'time': elapsed, 'peak_rss': peak_rss}
+
+            # Kill whatever ran out of time
+            now = time.time()
+            for receiver, (index, _, deadline) in list(running.items()):
+                if deadline <= now:
+                    finish(receiver)
+                    yield index, "timeout", None, {}
+    finally:
+        # Closing the generator early must not leave searches running
+        for receiver in list(running):
+            finish(receiver)
+
+def run_in_subprocess(func, args, timeout, progress=None, stats=None):
+    # Run the search in its own process, killed outright on timeout so all its memory is returned
+    report = (lambda index, value: progress(value)) if progress is not None else None
+    for _, status, value, _ in run_trials(func, [args], timeout, 1, report, [stats] if stats is not None else None):
+        pass
+    if status == "timeout":
+        raise TimeoutError()
+    if status == "error":
+        raise value
+    return value
+
+def print_progress(progress, timeout, trial=None):
+    bound = f" | f {progress['bound']}" if progress['bound'] is not None else ""
+    label = f" trial {trial + 1} |" if trial is not None else ""
+    print(f"  ...{label} {progress['elapsed']:.0f}/{timeout}s | {progress['expansions']:,} expanded | "
+          f"{progress['nodes']:,} stored | {progress['rate']:,.0f} nodes/s{bound}")
+
+def print_outcome(trial, num_trials, actual_distance, initial_h, status, value, info, timeout):
+    # Trials finishing out of order are labelled with their number and puzzle
+    prefix = ""
+    if actual_distance is not None:
+        prefix = f"Trial {trial + 1}/{num_trials} (distance {actual_distance}, Manhattan {initial_h}) "
+    if status == "ok":
+        path, expansions = value
+        rss = f" | Peak RSS: {info['peak_rss'] / 2**20:.0f} MiB" if info.get('peak_rss') else ""
+        print(f"{prefix}[OK] Path length: {len(path)} | Nodes: {expansions} | Time: {info['time']:.2f}s{rss}")
+    elif status == "timeout":
+        print(f"{prefix}[TIMEOUT] Trial timed out after {timeout} seconds")
+    else:
+        print(f"{prefix}[ERROR] {str(value)}")
+
+def run_experiment(size, distance_from_goal, num_trials, timeout, heuristic=heuristic_manhattan, weight=1, isolate=False,
+                   progress=False, timing=False, trace_memory=False, workers=1, seed=DEFAULT_SEED, exact_depth=False,
+                   store=None):
     results = {
         'time': [],
         'nodes_expanded': [],
         'path_length': [],
         'actual_distances': [],
+        'initial_h': [],
+        'search_stats': [],
+        'peak_rss': [],
         'timeouts': 0,
         'errors': 0
     }
 
-    for trial in range(num_trials):
-        try:
-            print(f"\nTrial {trial + 1}/{num_trials} for {size}x{size} puzzle with target distance {distance_from_goal}")
-            print("Generating puzzle...")
-            start_board, actual_distance = generate_random_puzzle(size, distance_from_goal)
-            start_state = PuzzleState(start_board, size)
+    goal_board = [[(i * size + j + 1) % (size * size) for j in range(size)] for i in range(size)]
+    goal_state = PuzzleState(goal_board, size)
 
-            goal_board = [[(i * size + j + 1) % (size * size) for j in range(size)] for i in range(size)]
-            goal_state = PuzzleState(goal_board, size)
+    # Generate every instance up front so the whole set is scored in one batch call.
+    # A random walk only bounds the distance from above; boards small enough for a
+    # distance table can be drawn at exactly the requested optimal distance instead.
+    print(f"Generating {num_trials} puzzles...")
+    if exact_depth and can_rank(size):
+        start_states = [PuzzleState.from_tiles(board_at_depth(goal_state, distance_from_goal,
+                                                              trial_random(seed, size, distance_from_goal, trial)), size)
+                        for trial in range(num_trials)]
+        instances = [(state.board, distance_from_goal) for state in start_states]
+    else:
+        instances = [generate_random_puzzle(size, distance_from_goal, trial_random(seed, size, distance_from_goal, trial))
+                     for trial in range(num_trials)]
+        start_states = [PuzzleState(board, size) for board, _ in instances]
+    results['initial_h'] = compile_heuristic('manhattan', goal_state).score_states(start_states)
 
-            print(f"Generated puzzle with actual distance: {actual_distance}")
-            results['actual_distances'].append(actual_distance)
+    solver = partial(astar, weight=weight)
+    search_stats = [SearchStats(timing, trace_memory) for _ in range(num_trials)]
+    # Per trial: ('ok', (path, expansions), info), ('timeout', None, {}) or ('error', exception, {})
+    outcomes = [None] * num_trials
 
+    # Build or load any per-goal heuristic tables before the timed trials start
+    skipped = None
+    try:
+        heuristic(goal_state, goal_state)
+    except ValueError as e:
+        # The heuristic has no tables for this size (walking distance stops at 4x4);
+        # every trial of this size counts as an error instead of ending the whole run
+        skipped = str(e)
+        print(f"Skipping {size}x{size}: {skipped}")
+        outcomes = [("error", e, {})] * num_trials
+
+    # Trials solved by an earlier run are read back with their original expansions and time.
+    # Solutions are stored under the registry name, shared with batch.py and the GUI, so
+    # heuristic and weight pairs without one are not stored
+    keywords = {'heuristic': heuristic} if weight == 1 else {'heuristic': heuristic, 'weight': weight}
+    algorithm = find_solver(astar, **keywords)
+    if store is not None and algorithm is None:
+        print(f"Not using the solution store: no registered solver for this heuristic and weight {weight:g}")
+    if store is not None and algorithm is not None and skipped is None:
+        for trial, start_state in enumerate(start_states):
+            hit = store.get(start_state, goal_state, algorithm)
+            if hit is not None:
+                path, expansions, seconds = hit
+                outcomes[trial] = ("ok", (path, expansions), {'time': seconds, 'peak_rss': None, 'stored': True})
+        if any(outcomes):
+            print(f"Read {sum(1 for outcome in outcomes if outcome)} of {num_trials} trials from the solution store")
+    todo = [trial for trial in range(num_trials) if outcomes[trial] is None]
+
+    if todo and (isolate or workers > 1):
+        # One process per trial, killed on timeout
+        print(f"Running {len(todo)} trials for {size}x{size} puzzle with target distance {distance_from_goal} "
+              f"on {workers} worker(s)...")
+        report = (lambda index, value: print_progress(value, timeout, todo[index])) if progress else None
+        trial_args = [(start_states[trial], goal_state, heuristic) for trial in todo]
+        for index, status, value, info in run_trials(solver, trial_args, timeout, workers, report,
+                                                     [search_stats[trial] for trial in todo]):
+            trial = todo[index]
+            outcomes[trial] = (status, value, info)
+            print_outcome(trial, num_trials, instances[trial][1], results['initial_h'][trial], status, value, info,
+                          timeout)
+    else:
+        for trial in todo:
+            print(f"\nTrial {trial + 1}/{num_trials} for {size}x{size} puzzle with target distance {distance_from_goal}")
+            print(f"Generated puzzle with actual distance: {instances[trial][1]} (Manhattan: {results['initial_h'][trial]})")
             print("Starting A* search...")
             start_time = time.time()
-            path, expansions = run_with_timeout(astar, (start_state, goal_state, heuristic_manhattan), timeout)
-            end_time = time.time()
+            report = partial(print_progress, timeout=timeout) if progress else None
+            try:
+                value = run_with_timeout(solver, (start_states[trial], goal_state, heuristic),
+                                         timeout, False, report, search_stats[trial])
+                outcomes[trial] = ("ok", value, {'time': time.time() - start_time, 'peak_rss': None})
+            except TimeoutError:
+                outcomes[trial] = ("timeout", None, {})
+            except Exception as e:
+                outcomes[trial] = ("error", e, {})
+            print_outcome(trial, num_trials, None, None, *outcomes[trial], timeout)
 
-            results['time'].append(end_time - start_time)
+    # Aggregate in trial order, so the statistics do not depend on the number of workers
+    for trial, (status, value, info) in enumerate(outcomes):
+        results['actual_distances'].append(instances[trial][1])
+        if status == "ok":
+            path, expansions = value
+            results['time'].append(info['time'])
             results['nodes_expanded'].append(expansions)
             results['path_length'].append(len(path))
-
-            print(f"[OK] Path length: {len(path)} | Nodes: {expansions} | Time: {end_time - start_time:.2f}s")
-
-        except TimeoutError:
+            if info.get('stored'):
+                continue
+            results['search_stats'].append(search_stats[trial])
+            if info['peak_rss'] is not None:
+                results['peak_rss'].append(info['peak_rss'])
+            # An empty path means no solution unless the start is already the goal
+            if store is not None and algorithm is not None and (path or start_states[trial] == goal_state):
+                store.put(start_states[trial], goal_state, algorithm, path, expansions, info['time'])
+        elif status == "timeout":
             results['timeouts'] += 1
-            print(f"[TIMEOUT] Trial timed out after {timeout} seconds")
-        except Exception as e:
+        else:
             results['errors'] += 1
-            print(f"[ERROR] {str(e)}")
 
     stats = {
         'avg_time': statistics.mean(results['time']) if results['time'] else float('inf'),
@@ -103,13 +352,49 @@ def run_experiment(size, distance_from_goal, num_trials, timeout):
         'avg_path': statistics.mean(results['path_length']) if results['path_length'] else float('inf'),
         'std_path': statistics.stdev(results['path_length']) if len(results['path_length']) > 1 else 0,
         'avg_distance': statistics.mean(results['actual_distances']) if results['actual_distances'] else 0,
+        'avg_initial_h': statistics.mean(results['initial_h']) if results['initial_h'] else 0,
         'timeouts': results['timeouts'],
         'errors': results['errors'],
         'success_rate': (num_trials - results['timeouts'] - results['errors']) / num_trials if num_trials > 0 else 0
     }
+    stats.update(aggregate_search_stats(results['search_stats']))
+    if results['peak_rss']:
+        stats['max_peak_rss'] = max(results['peak_rss'])
 
+    if skipped is not None:
+        stats['skipped'] = skipped
     return stats
 
+def aggregate_search_stats(search_stats):
+    # Averages of the SearchStats counters over the successful trials; peak memory is the
+    # largest of any trial and the time split is summed
+    if not search_stats:
+        return {}
+    total = SearchStats()
+    for trial_stats in search_stats:
+        total.merge(trial_stats)
+    return {
+        'avg_generated': total.generated / len(search_stats),
+        'avg_duplicates': total.duplicates / len(search_stats),
+        'avg_reopened': total.reopened / len(search_stats),
+        'avg_peak_open': statistics.mean(s.peak_open for s in search_stats),
+        'avg_peak_closed': statistics.mean(s.peak_closed for s in search_stats),
+        'peak_memory': total.peak_memory,
+        'time_split': dict(total.times),
+    }
+
+def print_search_stats(stats):
+    if 'avg_generated' not in stats:
+        return
+    print(f"Avg Generated: {stats['avg_generated']:.0f} | Duplicates: {stats['avg_duplicates']:.0f} | "
+          f"Reopened: {stats['avg_reopened']:.0f}")
+    print(f"Avg Peak Open: {stats['avg_peak_open']:.0f} | Avg Peak Closed: {stats['avg_peak_closed']:.0f}")
+    if stats['peak_memory'] is not None:
+        print(f"Peak Traced Memory: {stats['peak_memory'] / 2**20:.1f} MiB")
+    timed = sum(stats['time_split'].values())
+    if timed > 0:
+        print("Time Split: " + " | ".join(f"{part} {stats['time_split'][part] / timed * 100:.0f}%" for part in TIMED))
+
 def format_stat_with_ascii(value, std):
     if value == float('inf'):
         return "Timeout"
@@ -118,8 +403,36 @@ def format_stat_with_ascii(value, std):
     return f"{value:.3f}"
 
 def main():
-    print("A* Search Experiment with Manhattan Distance Heuristic")
-    print("======================================================")
+    parser = argparse.ArgumentParser(description="A* search experiment on random n-puzzle instances")
+    parser.add_argument('--heuristic', choices=sorted(HEURISTICS), default='manhattan',
+                        help="Heuristic used by A* (default: manhattan)")
+    parser.add_argument('--weight', type=float, default=1,
+                        help="Weighted A*: f = g + weight*h, paths at most weight times optimal (default: 1)")
+    parser.add_argument('--isolate', action='store_true',
+                        help="Run each trial in a subprocess that is killed on timeout")
+    parser.add_argument('--progress', action='store_true',
+                        help="Print search progress every second during long trials")
+    parser.add_argument('--timing', action='store_true',
+                        help="Split search time between successors, heuristic and queue (slows searches down)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Measure peak allocation with tracemalloc (slows searches down considerably)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Run trials in parallel, one process per trial (default: 1, trials in this process)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f"Seed of the generated puzzles (default: {DEFAULT_SEED})")
+    parser.add_argument('--store', nargs='?', const=DEFAULT_STORE, default=None,
+                        help=f"Reuse and record trial solutions in a solution database (default file: {DEFAULT_STORE})")
+    parser.add_argument('--exact-depth', action='store_true',
+                        help="Draw 3x3 puzzles at exactly the target optimal distance instead of by random walk")
+    args = parser.parse_args()
+    heuristic = HEURISTICS[args.heuristic]
+    store = SolutionStore(args.store) if args.store else None
+
+    title = f"A* Search Experiment with {args.heuristic} Heuristic"
+    if args.weight != 1:
+        title += f" (weight {args.weight:g})"
+    print(title)
+    print("=" * len(title))
 
     sizes = [3, 5, 7]
     distances = {3: 15, 5: 25, 7: 30}
@@ -130,10 +443,15 @@ def main():
 
     for size in sizes:
         print(f"\n--- Testing {size}x{size} puzzle ---")
-        stats = run_experiment(size, distances[size], trials[size], timeouts[size])
+        stats = run_experiment(size, distances[size], trials[size], timeouts[size], heuristic, args.weight, args.isolate,
+                               args.progress, args.timing, args.trace_memory, args.workers, args.seed,
+                               args.exact_depth, store)
         all_stats[size] = stats
 
         print(f"\nResults for {size}x{size} puzzle:")
+        if 'skipped' in stats:
+            print(f"Skipped: {stats['skipped']}")
+            continue
         print(f"Success rate: {stats['success_rate']*100:.1f}%")
         if stats['timeouts'] > 0:
             print(f"Timeouts: {stats['timeouts']}/{trials[size]}")
@@ -141,10 +459,14 @@ def main():
             print(f"Errors: {stats['errors']}/{trials[size]}")
 
         print(f"Average distance from goal: {stats['avg_distance']:.1f}")
+        print(f"Average initial Manhattan distance: {stats['avg_initial_h']:.1f}")
         if stats['avg_time'] != float('inf'):
             print(f"Avg Time: {stats['avg_time']:.2f} (+/-){stats['std_time']:.2f} sec")
             print(f"Avg Nodes: {stats['avg_nodes']:.0f} (+/-){stats['std_nodes']:.0f}")
             print(f"Avg Path Length: {stats['avg_path']:.1f} (+/-){stats['std_path']:.1f}")
+            print_search_stats(stats)
+            if 'max_peak_rss' in stats:
+                print(f"Max Peak RSS per trial: {stats['max_peak_rss'] / 2**20:.0f} MiB")
         else:
             print("No successful trials")
 
@@ -154,7 +476,9 @@ def main():
     print("-----|---------------|-----------|-------------------|---------------------|--------------")
     for size in sizes:
         s = all_stats[size]
-        if s['avg_time'] != float('inf'):
+        if 'skipped' in s:
+            print(f"{size}x{size}  |    Skipped: {s['skipped']}")
+        elif s['avg_time'] != float('inf'):
             time_str = format_stat_with_ascii(s['avg_time'], s['std_time'])
             nodes_str = format_stat_with_ascii(s['avg_nodes'], s['std_nodes'])
             path_str = format_stat_with_ascii(s['avg_path'], s['std_path'])
@@ -0,0 +1,158 @@
+"""
+Fast generation of benchmark boards.
+
+Two samplers, both streaming packed boards (bytes, row-major, 0 for the blank):
+    random_boards   uniformly random boards that can reach the goal, any board size.
+                    A random index of the goal's reachability class is unranked into
+                    a board; unrank_index flips the last two tiles when the parity
+                    is wrong, so every solvable board is equally likely.
+    boards_at_depth boards whose optimal distance to the goal is exactly depth, drawn
+                    uniformly from that layer of the backward breadth-first search
+                    stored in the distance table (boards up to 3x3).
+
+Unlike a random walk, the depth of every exact-depth board is its true optimal
+solution length, so boards of one depth are of comparable difficulty.
+
+    python generator.py --size 4 --count 1000 > boards.jsonl
+    python generator.py --depth 24 --count 100000 --format binary --output boards.bin
+Output is read directly by batch.py.
+"""
+import sys
+import json
+import random
+import argparse
+import itertools
+from array import array
+from functools import lru_cache
+
+from logic.puzzle_state import PuzzleState
+from logic.ranking import MAX_RANKED_SIZE, can_rank, state_count, board_class, unrank_index
+from algorithms.registry import goal_state
+from algorithms.distance_table import load_distance_table, UNREACHED
+
+FORMATS = ('jsonl', 'text', 'binary')
+
+
+def random_board(size, klass, rng=random):
+    """One uniformly random packed board of reachability class klass"""
+    return unrank_index(rng.randrange(state_count(size)), size, klass)
+
+
+def random_boards(size, count=None, seed=None, goal=None):
+    """
+    Yield uniformly random packed boards that can reach the goal.
+
+        size: Board size
+        count: Number of boards, unlimited when None
+        seed: Seed of the generator; the same seed always gives the same boards
+        goal: Goal PuzzleState (default: the standard goal of this size)
+    """
+    goal = goal or goal_state(size)
+    klass = board_class(goal.tiles, size)
+    rng = random.Random(seed)
+    # Bind the hot calls once; this loop is the whole cost of generation
+    randrange = rng.randrange
+    states = state_count(size)
+    for _ in itertools.repeat(None) if count is None else range(count):
+        yield unrank_index(randrange(states), size, klass)
+
+
+@lru_cache(maxsize=64)
+def depth_layer(goal, depth):
+    """Ranked indices of every board exactly depth moves from goal, as an array('I')"""
+    if not can_rank(goal.size):
+        raise ValueError(f"Exact depths are only available up to {MAX_RANKED_SIZE}x{MAX_RANKED_SIZE} boards")
+    if not 0 <= depth < UNREACHED:
+        raise ValueError(f"No boards at depth {depth}")
+    table = load_distance_table(goal)
+    layer = array('I')
+    marker = bytes([depth])
+    # bytes.find scans in C, so only the matches cost Python time
+    index = table.find(marker)
+    while index >= 0:
+        layer.append(index)
+        index = table.find(marker, index + 1)
+    return layer
+
+
+def max_depth(goal):
+    """Largest optimal distance of any board from goal (31 for the standard 3x3 goal)"""
+    table = load_distance_table(goal)
+    return max(depth for depth in range(UNREACHED) if table.find(bytes([depth])) >= 0)
+
+
+def board_at_depth(goal, depth, rng=random):
+    """One packed board drawn uniformly from the boards exactly depth moves from goal"""
+    layer = depth_layer(goal, depth)
+    if not layer:
+        raise ValueError(f"No boards at depth {depth}")
+    return unrank_index(layer[rng.randrange(len(layer))], goal.size, board_class(goal.tiles, goal.size))
+
+
+def boards_at_depth(depth, size=3, count=None, seed=None, goal=None):
+    """
+    Yield packed boards whose optimal distance to the goal is exactly depth.
+
+        depth: Optimal solution length
+        size: Board size; must be small enough to have a distance table
+        count: Number of boards, unlimited when None
+        seed: Seed of the generator; the same seed always gives the same boards
+        goal: Goal PuzzleState (default: the standard goal of this size)
+    """
+    goal = goal or goal_state(size)
+    layer = depth_layer(goal, depth)
+    if not layer:
+        raise ValueError(f"No boards at depth {depth}")
+    klass = board_class(goal.tiles, size)
+    randrange = random.Random(seed).randrange
+    for _ in itertools.repeat(None) if count is None else range(count):
+        yield unrank_index(layer[randrange(len(layer))], size, klass)
+
+
+def write_boards(stream, boards, size, fmt):
+    """Write packed boards in one of FORMATS, all readable by batch.read_boards"""
+    if fmt == 'binary':
+        header = bytes([size])
+        for tiles in boards:
+            stream.write(header + tiles)
+    elif fmt == 'jsonl':
+        for tiles in boards:
+            stream.write(json.dumps(list(tiles)) + "\n")
+    else:
+        for tiles in boards:
+            stream.write(str(PuzzleState.from_tiles(tiles, size)) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate random solvable boards or boards of exact optimal depth")
+    parser.add_argument('--size', type=int, default=3, help="Board size (default: 3)")
+    parser.add_argument('--depth', type=int, default=None,
+                        help=f"Exact optimal solution length (boards up to {MAX_RANKED_SIZE}x{MAX_RANKED_SIZE} only); "
+                             "uniformly random boards when omitted")
+    parser.add_argument('--count', type=int, default=None, help="Number of boards (default: unlimited)")
+    parser.add_argument('--seed', type=int, default=None, help="Seed of the generator (default: random)")
+    parser.add_argument('--format', choices=FORMATS, default='jsonl', help="Output format (default: jsonl)")
+    parser.add_argument('--output', default='-', help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.depth is None:
+        boards = random_boards(args.size, args.count, args.seed)
+    else:
+        boards = boards_at_depth(args.depth, args.size, args.count, args.seed)
+
+    if args.output == '-':
+        output = sys.stdout.buffer if args.format == 'binary' else sys.stdout
+    else:
+        output = open(args.output, 'wb' if args.format == 'binary' else 'w')
+    try:
+        write_boards(output, boards, args.size, args.format)
+    except BrokenPipeError:
+        # Reading only the first boards of an unlimited stream is fine
+        sys.stderr.close()
+    finally:
+        if output not in (sys.stdout, sys.stdout.buffer):
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,29 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import random
 from logic.puzzle_state import PuzzleState
+from algorithms.control import SearchControl, SearchAborted
+from algorithms.store import SolutionStore
+from algorithms.registry import get_solver, prepare_solver
+
+# Menu entries and the algorithms.registry solvers they run; solutions are stored under
+# the registry name, so batch.py and experiment.py runs share them
+ALGORITHMS = {
+    "Breadth First Search": 'bfs',
+    "Bidirectional BFS": 'bidirectional-bfs',
+    "Vectorized BFS": 'vector-bfs',
+    "Depth First Search": 'dfs',
+    "Iterative Deepening Search": 'ids',
+    "A* - Misplaced": 'astar-misplaced',
+    "A* - Manhattan": 'astar-manhattan',
+    "A* - Linear Conflict": 'astar-linear-conflict',
+    "A* - Walking Distance": 'astar-walking-distance',
+    "A* - Pattern Database": 'astar-pdb',
+    "IDA* - Manhattan": 'idastar-manhattan',
+    "IDA* - Linear Conflict": 'idastar-linear-conflict',
+    "Bidirectional A* - Manhattan": 'bidirectional-astar',
+    "SMA* - Manhattan": 'sma-manhattan',
+    "Distance Table (3x3)": 'table',
+}
 
 def is_solvable(board_flat):
     inv_count = 0
@@ -41,8 +64,10 @@ class PuzzleGUI:
         self.running = False
         self.paused = False
         self.search_thread = None
+        self.control = None  # SearchControl of the running search
         self.solution_queue = queue.Queue()
         self.update_queue = queue.Queue()  # Queue for iteration updates
+        self.store = SolutionStore()  # Solutions of earlier runs, per algorithm
         
         # Track if we're in tile setup mode
         self.setup_mode = False
@@ -63,13 +88,7 @@ class PuzzleGUI:
         algo_frame.pack(pady=10, fill=tk.X)
 
         self.algo_combo = ttk.Combobox(algo_frame, textvariable=self.algorithm, font=("Helvetica", 12))
-        self.algo_combo['values'] = (
-            "Breadth First Search",
-            "Depth First Search",
-            "Iterative Deepening Search",
-            "A* - Misplaced",
-            "A* - Manhattan"
-        )
+        self.algo_combo['values'] = tuple(ALGORITHMS)
         self.algo_combo.pack(padx=10, pady=10, ipady=5, fill=tk.X)
 
         # Control buttons
@@ -179,6 +198,11 @@ class PuzzleGUI:
                 if update_type == "iteration":
                     self.iteration = data
                     self.update_iteration()
+                elif update_type == "progress":
+                    self.iteration = data['expansions']
+                    self.update_iteration()
+                    if self.running and not self.paused:
+                        self.status_label.config(text=self.format_progress(data))
                 elif update_type == "state":
                     self.update_board_from_state(data)
         except queue.Empty:
@@ -186,9 +210,19 @@ class PuzzleGUI:
             if (self.search_thread and self.search_thread.is_alive()) or self.running:
                 self.root.after(100, self.check_updates_queue)
     
+    def format_progress(self, progress):
+        """Status line for a progress report from the running search"""
+        text = "Status: Searching..."
+        if progress['bound'] is not None:
+            text += f" bound {progress['bound']}"
+        if progress['frontier'] is not None:
+            text += f" | open {progress['frontier']:,}"
+        return text + f" | {progress['rate']:,.0f} nodes/s"
+
     def search_algorithm_thread(self):
         """Execute the selected algorithm in a separate thread"""
         algo = self.algorithm.get()
+        control = self.control
         
         start = PuzzleState(self.board, self.size)
         goal_board = [[(i * self.size + j + 1) % (self.size * self.size) for j in range(self.size)] for i in range(self.size)]
@@ -201,38 +235,37 @@ class PuzzleGUI:
         # Reset iteration counter
         self.update_queue.put(("iteration", 0))
         
+        # A board solved before, by this run or an earlier one, is only a lookup
+        name = ALGORITHMS.get(algo)
+        hit = self.store.get(start, goal, name) if name is not None else None
+
         try:
-            if algo == "Breadth First Search":
-                from algorithms.bfs import bfs
-                path, expansions = bfs(start, goal, max_depth=50)
-                
-            elif algo == "Depth First Search":
-                from algorithms.dfs import dfs
-                path, expansions = dfs(start, goal, max_depth=50)
-    
-            elif algo == "Iterative Deepening Search":
-                from algorithms.ids import ids
-                path, expansions = ids(start, goal, max_depth=50)
-    
-            elif algo == "A* - Misplaced":
-                from algorithms.astar import astar
-                from heuristics.misplaced import misplaced_tiles
-                path, expansions = astar(start, goal, misplaced_tiles)
-    
-            elif algo == "A* - Manhattan":
-                from algorithms.astar import astar
-                from heuristics.manhattan import heuristic_manhattan
-                path, expansions = astar(start, goal, heuristic_manhattan)
-                
+            if name is None:
+                raise ValueError(f"Unknown algorithm: {algo}")
+
+            if hit is not None:
+                path, expansions = hit[0], hit[1]
+            else:
+                # Tables are built or loaded before the clock starts, so the time shown is the search's
+                prepare_solver(name, goal)
+                start_time = time.time()
+                path, expansions = get_solver(name)(start, goal, control=control)
+
             # Update final iteration count
             self.update_queue.put(("iteration", expansions))
             
+        except SearchAborted:
+            # Cancelled by Reset, Random or Load File; the interface has already moved on
+            return
         except Exception as e:
             self.solution_queue.put(("error", str(e)))
             return
             
         end_time = time.time()
         elapsed_time = end_time - start_time
+
+        if path and hit is None:
+            self.store.put(start, goal, name, path, expansions, elapsed_time)
         
         # Put the solution path and statistics in the queue for the main thread to consume
         if path:
@@ -312,6 +345,9 @@ class PuzzleGUI:
         self.running = True
         
         # Start the search in a separate thread
+        # Progress reports are posted from the search thread and drawn by check_updates_queue
+        self.control = SearchControl(progress=lambda progress: self.update_queue.put(("progress", progress)),
+                                     progress_interval=0.25)
         self.search_thread = threading.Thread(target=self.search_algorithm_thread)
         self.search_thread.daemon = True
         self.search_thread.start()
@@ -362,6 +398,11 @@ class PuzzleGUI:
     def pause_search(self):
         """Pause or resume the search"""
         self.paused = not self.paused
+        if self.control is not None:
+            if self.paused:
+                self.control.pause()
+            else:
+                self.control.resume()
         if self.paused:
             self.pause_button.config(text="Resume")
             self.status_label.config(text="Status: Paused")
@@ -369,8 +410,15 @@ class PuzzleGUI:
             self.pause_button.config(text="Pause")
             self.status_label.config(text="Status: Running")
 
+    def cancel_search(self):
+        """Stop a running search at its next check"""
+        if self.control is not None:
+            self.control.cancel()
+            self.control = None
+
     def reset_puzzle(self):
         """Reset the puzzle to a new random state"""
+        self.cancel_search()
         nums = list(range(self.size * self.size))
         random.shuffle(nums)
 
@@ -434,6 +482,7 @@ class PuzzleGUI:
                 messagebox.showwarning("Warning", "This puzzle configuration is not solvable!")
                 return
 
+            self.cancel_search()
             self.size = size
             self.board = board
             self.iteration = 0
@@ -1,4 +1,9 @@
 from heuristics.misplaced import misplaced_tiles
 from heuristics.manhattan import heuristic_manhattan
+from heuristics.linear_conflict import linear_conflict
+from heuristics.walking_distance import walking_distance
+from heuristics.pdb import pattern_database
+from heuristics.tables import compile_heuristic, encode_states
 
-__all__ = ['misplaced_tiles', 'heuristic_manhattan']
\ No newline at end of file
+__all__ = ['misplaced_tiles', 'heuristic_manhattan', 'linear_conflict', 'walking_distance', 'pattern_database',
+           'compile_heuristic', 'encode_states']
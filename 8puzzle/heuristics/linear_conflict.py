@@ -0,0 +1,145 @@
+from functools import lru_cache
+from itertools import permutations
+
+from heuristics.tables import compile_heuristic
+
+
+def _longest_increasing(sequence):
+    """Length of the longest strictly increasing subsequence"""
+    tails = []
+    for value in sequence:
+        for k, tail in enumerate(tails):
+            if value <= tail:
+                tails[k] = value
+                break
+        else:
+            tails.append(value)
+    return len(tails)
+
+
+@lru_cache(maxsize=8)
+def _conflict_table(size):
+    """
+    Precomputed conflict penalty for every ordering a single line can hold.
+    The key is the tuple of goal offsets (within the line) of the tiles that belong
+    to that line, in board order. Every tile outside the longest increasing run has
+    to leave the line and come back, which costs at least two extra moves.
+    """
+    table = {}
+    for length in range(size + 1):
+        for sequence in permutations(range(size), length):
+            table[sequence] = 2 * (length - _longest_increasing(sequence))
+    return table
+
+
+class LinearConflict:
+    """Linear conflict tables compiled for one goal"""
+
+    def __init__(self, goal):
+        size = goal.size
+        self.size = size
+        self.conflicts = _conflict_table(size)
+        self.manhattan = compile_heuristic('manhattan', goal)
+
+        # Goal row and column of every tile; -1 for the empty tile so it never matches a line
+        self.goal_row = [-1] * (size * size)
+        self.goal_col = [-1] * (size * size)
+        for index, value in enumerate(goal.tiles):
+            if value != 0:
+                self.goal_row[value], self.goal_col[value] = divmod(index, size)
+
+    def row_conflicts(self, tiles, row):
+        """Conflict penalty of one board row"""
+        size = self.size
+        goal_row = self.goal_row
+        goal_col = self.goal_col
+        line = tiles[row * size:(row + 1) * size]
+        return self.conflicts[tuple(goal_col[t] for t in line if goal_row[t] == row)]
+
+    def col_conflicts(self, tiles, col):
+        """Conflict penalty of one board column"""
+        goal_row = self.goal_row
+        goal_col = self.goal_col
+        line = tiles[col::self.size]
+        return self.conflicts[tuple(goal_row[t] for t in line if goal_col[t] == col)]
+
+    def __call__(self, state):
+        tiles = state.tiles
+        total = self.manhattan(state)
+        for line in range(self.size):
+            total += self.row_conflicts(tiles, line) + self.col_conflicts(tiles, line)
+        return total
+
+    def delta(self, parent, child):
+        """
+        Change in h for the single move from parent to child.
+        A vertical move only changes the two rows involved and a horizontal move
+        only the two columns; the relative order inside every other line is unchanged.
+        """
+        size = self.size
+        change = self.manhattan.delta(parent, child)
+        old_row, old_col = divmod(parent.blank, size)
+        new_row, new_col = divmod(child.blank, size)
+        if old_row != new_row:
+            for row in (old_row, new_row):
+                change += self.row_conflicts(child.tiles, row) - self.row_conflicts(parent.tiles, row)
+        else:
+            for col in (old_col, new_col):
+                change += self.col_conflicts(child.tiles, col) - self.col_conflicts(parent.tiles, col)
+        return change
+
+    def move_delta(self, board, tile, source, target):
+        """
+        Change in h when tile slid from index source into the blank at target, for
+        searches that move tiles on one mutable board; board is the packed board after
+        the move, as a bytearray, and is left as it was.
+        """
+        size = self.size
+        manhattan = self.manhattan.table[tile]
+        change = manhattan[target] - manhattan[source]
+        source_row, source_col = divmod(source, size)
+        target_row, target_col = divmod(target, size)
+        # Only the two lines the tile moved between can change their conflicts
+        if source_row != target_row:
+            conflicts, lines = self.row_conflicts, (source_row, target_row)
+        else:
+            conflicts, lines = self.col_conflicts, (source_col, target_col)
+        for line in lines:
+            change += conflicts(board, line)
+        # Slide the tile back to count the conflicts before the move
+        board[source] = tile
+        board[target] = 0
+        for line in lines:
+            change -= conflicts(board, line)
+        board[target] = tile
+        board[source] = 0
+        return change
+
+
+@lru_cache(maxsize=16)
+def _compile(goal):
+    # PuzzleState hashes and compares by its packed tiles, so it can key the cache
+    return LinearConflict(goal)
+
+
+def linear_conflict(state, goal):
+    """
+    Linear conflict heuristic - Manhattan distance plus two moves for every tile that
+    must leave its goal row or column to let another tile of that line pass.
+
+        state: Current PuzzleState
+        goal: Goal PuzzleState
+
+    Returns:
+        Manhattan distance plus linear conflict penalty
+    """
+    return _compile(goal)(state)
+
+
+def linear_conflict_delta(parent, child, goal):
+    """Change in the linear conflict heuristic for the single move from parent to child"""
+    return _compile(goal).delta(parent, child)
+
+
+linear_conflict.delta = linear_conflict_delta
+linear_conflict.compile = _compile
@@ -1,17 +1,29 @@
+from functools import partial
+
+from heuristics.tables import compile_heuristic
+
+
 def misplaced_tiles(state, goal):
     """
     Misplaced tiles heuristic - counts the number of tiles not in their goal position.
-    
+
         state: Current PuzzleState
         goal: Goal PuzzleState
-    
+
     Returns:
         Number of misplaced tiles
     """
-    count = 0
-    for i in range(state.size):
-        for j in range(state.size):
-            # Skip the empty tile (0)
-            if state.board[i][j] != 0 and state.board[i][j] != goal.board[i][j]:
-                count += 1
-    return count
\ No newline at end of file
+    # The empty tile (0) is never counted by the compiled table
+    return compile_heuristic('misplaced', goal)(state)
+
+
+def misplaced_delta(parent, child, goal):
+    """
+    Change in the misplaced tile count caused by the single move from parent to child.
+    Only the tile that moved can change its misplaced status.
+    """
+    return compile_heuristic('misplaced', goal).delta(parent, child)
+
+
+misplaced_tiles.delta = misplaced_delta
+misplaced_tiles.compile = partial(compile_heuristic, 'misplaced')
@@ -0,0 +1,260 @@
+"""
+Additive pattern database heuristic.
+
+The tiles are split into disjoint groups. For every group a table holds, for each
+placement of the group's tiles, the minimum number of moves of those tiles needed
+to bring them home. Only moves of pattern tiles are counted, so the values of
+disjoint groups can be added and the sum stays admissible.
+
+Tables are built once by a backward 0-1 breadth-first search from the goal, saved
+as raw byte arrays and memory-mapped on load, so worker processes share the pages.
+
+The tables do not record the blank: each stores the cheapest cost over all blank
+positions. That keeps the sum admissible but not consistent, since one move can
+change h by more than 1. The function carries consistent = False:
+    astar          stays optimal because it reopens nodes reached by a cheaper path
+    sma_star       stays optimal because children inherit f = max(parent f, g + h)
+    bidirectional_astar and hda_star reject it, as their stopping rules need consistency
+Tables take a minute or more to build beyond 3x3; call pattern_database(goal, goal)
+or algorithms.registry.prepare_solver before timing a search.
+
+Build tables ahead of time with:
+    python -m heuristics.pdb --size 5 --group-size 3
+"""
+import os
+import time
+import hashlib
+import argparse
+from collections import deque
+from functools import lru_cache
+
+from logic.storage import DATA_DIRECTORY, load_table, save_table
+
+# Where tables are stored unless a directory is given explicitly
+DEFAULT_DIRECTORY = os.path.join(DATA_DIRECTORY, 'pdb')
+
+# Tiles per group by board size; larger groups prune better but cost cells**k bytes to store
+DEFAULT_GROUP_SIZES = {3: 4, 4: 4, 5: 4}
+
+# Table value of a placement the backward search never reached
+UNREACHED = 255
+
+
+def default_groups(size, group_size=None):
+    """Split tiles 1..size*size-1 into consecutive groups of group_size tiles"""
+    if group_size is None:
+        group_size = DEFAULT_GROUP_SIZES.get(size, 2)
+    tiles = list(range(1, size * size))
+    return tuple(tuple(tiles[i:i + group_size]) for i in range(0, len(tiles), group_size))
+
+
+def _neighbours(size):
+    """Board indices adjacent to every index"""
+    result = []
+    for index in range(size * size):
+        row, col = divmod(index, size)
+        adjacent = []
+        if row > 0:
+            adjacent.append(index - size)
+        if row < size - 1:
+            adjacent.append(index + size)
+        if col > 0:
+            adjacent.append(index - 1)
+        if col < size - 1:
+            adjacent.append(index + 1)
+        result.append(adjacent)
+    return result
+
+
+def build_table(goal_tiles, size, group):
+    """
+    Build the table of one tile group by backward 0-1 breadth-first search from the goal.
+
+    A placement of the group is indexed as sum(position[i] * cells**i). While searching,
+    the blank is tracked too; sliding a pattern tile costs 1, sliding any other tile is free.
+    The stored value of a placement is its cheapest cost over all blank positions.
+
+    Returns:
+        bytearray of length cells**len(group)
+    """
+    cells = size * size
+    powers = [cells ** i for i in range(len(group))]
+    neighbours = _neighbours(size)
+
+    table = bytearray([UNREACHED]) * (cells ** len(group))
+    cost = bytearray([UNREACHED]) * (cells ** len(group) * cells)
+
+    start_index = sum(goal_tiles.index(tile) * power for tile, power in zip(group, powers))
+    start = start_index * cells + goal_tiles.index(0)
+    cost[start] = 0
+    queue = deque([start])
+
+    while queue:
+        code = queue.popleft()
+        index, blank = divmod(code, cells)
+        current = cost[code]
+        if current < table[index]:
+            table[index] = current
+
+        # Decode where each pattern tile sits
+        positions = []
+        rest = index
+        for _ in powers:
+            rest, position = divmod(rest, cells)
+            positions.append(position)
+
+        for target in neighbours[blank]:
+            if target in positions:
+                # A pattern tile slides into the blank: one counted move
+                power = powers[positions.index(target)]
+                next_code = (index + (blank - target) * power) * cells + target
+                if current + 1 < cost[next_code]:
+                    cost[next_code] = current + 1
+                    queue.append(next_code)
+            else:
+                # Any other tile slides: free in the abstraction
+                next_code = index * cells + target
+                if current < cost[next_code]:
+                    cost[next_code] = current
+                    queue.appendleft(next_code)
+
+    return table
+
+
+def table_path(directory, goal_tiles, size, group):
+    """File name of a table, unique per board size, goal and tile group"""
+    digest = hashlib.sha1(goal_tiles).hexdigest()[:10]
+    name = f"pdb-{size}x{size}-{digest}-{'_'.join(str(tile) for tile in group)}.bin"
+    return os.path.join(directory, name)
+
+
+class PatternDatabase:
+    """Additive pattern database compiled for one goal"""
+
+    def __init__(self, goal, groups=None, directory=DEFAULT_DIRECTORY, build=True):
+        """
+            goal: Goal PuzzleState
+            groups: Disjoint tuples of tiles; default_groups(goal.size) when omitted
+            directory: Where tables are loaded from and saved to
+            build: Build and save missing tables instead of raising FileNotFoundError
+        """
+        size = goal.size
+        cells = size * size
+        self.size = size
+        self.groups = tuple(tuple(group) for group in (groups or default_groups(size)))
+
+        seen = [tile for group in self.groups for tile in group]
+        if len(seen) != len(set(seen)) or 0 in seen:
+            raise ValueError("Pattern groups must be disjoint and must not contain the empty tile")
+
+        self.tables = []
+        self.powers = []
+        # For every tile: (group number, power of its position in the group index)
+        self.tile_group = [None] * cells
+        for number, group in enumerate(self.groups):
+            path = table_path(directory, goal.tiles, size, group)
+            table = load_table(path, cells ** len(group))
+            if table is None:
+                if not build:
+                    raise FileNotFoundError(f"Pattern database table not found: {path}")
+                save_table(path, build_table(goal.tiles, size, group))
+                table = load_table(path, cells ** len(group))
+            powers = [cells ** i for i in range(len(group))]
+            self.tables.append(table)
+            self.powers.append(powers)
+            for tile, power in zip(group, powers):
+                self.tile_group[tile] = (number, power)
+
+    def __call__(self, state):
+        # Board index of every tile
+        where = [0] * len(state.tiles)
+        for index, value in enumerate(state.tiles):
+            where[value] = index
+
+        total = 0
+        for group, powers, table in zip(self.groups, self.powers, self.tables):
+            index = 0
+            for tile, power in zip(group, powers):
+                index += where[tile] * power
+            total += table[index]
+        return total
+
+    def delta(self, parent, child):
+        """Change in h for the single move from parent to child; only one group is affected"""
+        tile = parent.tiles[child.blank]
+        if self.tile_group[tile] is None:
+            return 0
+        number, moved_power = self.tile_group[tile]
+        tiles = child.tiles
+        index = 0
+        for group_tile, power in zip(self.groups[number], self.powers[number]):
+            index += tiles.index(group_tile) * power
+        table = self.tables[number]
+        # The moved tile went from the child's blank index to the parent's
+        return table[index] - table[index + (child.blank - parent.blank) * moved_power]
+
+
+@lru_cache(maxsize=8)
+def _compile(goal):
+    return PatternDatabase(goal)
+
+
+def pattern_database(state, goal):
+    """
+    Additive pattern database heuristic with the default tile groups for the board size.
+    Missing tables are built and saved on first use.
+
+        state: Current PuzzleState
+        goal: Goal PuzzleState
+
+    Returns:
+        Sum of the pattern costs of all tile groups
+    """
+    return _compile(goal)(state)
+
+
+def pattern_database_delta(parent, child, goal):
+    """Change in the pattern database heuristic for the single move from parent to child"""
+    return _compile(goal).delta(parent, child)
+
+
+pattern_database.delta = pattern_database_delta
+pattern_database.consistent = False
+
+
+def main():
+    from logic.puzzle_state import PuzzleState
+
+    parser = argparse.ArgumentParser(description="Build additive pattern database tables")
+    parser.add_argument('--size', type=int, default=3, help="Board size (default: 3)")
+    parser.add_argument('--group-size', type=int, default=None, help="Tiles per group")
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY, help="Output directory")
+    parser.add_argument('--force', action='store_true', help="Rebuild tables that already exist")
+    args = parser.parse_args()
+
+    size = args.size
+    goal_tiles = bytes((i + 1) % (size * size) for i in range(size * size))
+    goal = PuzzleState.from_tiles(goal_tiles, size)
+    groups = default_groups(size, args.group_size)
+
+    total_bytes = 0
+    total_time = 0.0
+    for group in groups:
+        path = table_path(args.directory, goal.tiles, size, group)
+        if os.path.exists(path) and not args.force:
+            print(f"Group {group}: exists ({os.path.getsize(path)} bytes) {path}")
+            total_bytes += os.path.getsize(path)
+            continue
+        start_time = time.time()
+        table = build_table(goal.tiles, size, group)
+        elapsed = time.time() - start_time
+        save_table(path, table)
+        total_bytes += len(table)
+        total_time += elapsed
+        print(f"Group {group}: {len(table)} bytes in {elapsed:.2f}s -> {path}")
+
+    print(f"{len(groups)} tables, {total_bytes} bytes, built in {total_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Goal-compiled heuristic tables.
+
+A goal is compiled once into a tile x board-index cost matrix. The compiled
+heuristic can then score a single state with table lookups, update its score
+for a single move, or score a whole array of encoded states in one NumPy call.
+"""
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the batch path
+    np = None
+
+
+def manhattan_table(goal_tiles, size):
+    """table[tile][index] = Manhattan distance of tile at index from its goal index"""
+    table = [[0] * (size * size) for _ in range(size * size)]
+    for goal_index, value in enumerate(goal_tiles):
+        if value == 0:  # The empty tile never contributes
+            continue
+        goal_i, goal_j = divmod(goal_index, size)
+        for index in range(size * size):
+            i, j = divmod(index, size)
+            table[value][index] = abs(i - goal_i) + abs(j - goal_j)
+    return table
+
+
+def misplaced_table(goal_tiles, size):
+    """table[tile][index] = 1 if tile sitting at index is not where the goal wants it"""
+    table = [[0] * (size * size) for _ in range(size * size)]
+    for value in range(1, size * size):
+        for index in range(size * size):
+            table[value][index] = int(goal_tiles[index] != value)
+    return table
+
+
+TABLE_BUILDERS = {
+    'manhattan': manhattan_table,
+    'misplaced': misplaced_table,
+}
+
+
+def encode_states(states):
+    """
+    Pack an iterable of PuzzleStates of one size into a (count, size*size) uint8 array.
+    """
+    if np is None:
+        raise ImportError("NumPy is required for batch heuristic evaluation")
+    states = list(states)
+    if not states:
+        return np.zeros((0, 0), dtype=np.uint8)
+    cells = len(states[0].tiles)
+    return np.frombuffer(b"".join(state.tiles for state in states), dtype=np.uint8).reshape(len(states), cells)
+
+
+class CompiledHeuristic:
+    """
+    A heuristic compiled against one goal.
+    The score of a state is the sum of table[tile][index] over every board index.
+    """
+
+    def __init__(self, name, goal_tiles, size):
+        self.name = name
+        self.goal_tiles = goal_tiles
+        self.size = size
+        self.table = TABLE_BUILDERS[name](goal_tiles, size)
+        self._matrix = None
+
+    def __call__(self, state):
+        """Scalar path: score one PuzzleState"""
+        table = self.table
+        total = 0
+        for index, value in enumerate(state.tiles):
+            total += table[value][index]
+        return total
+
+    def tile_delta(self, tile, source, target):
+        """Change in score when tile slides from index source to index target"""
+        row = self.table[tile]
+        return row[target] - row[source]
+
+    def delta(self, parent, child):
+        """Change in score for the single move from parent to child"""
+        row = self.table[parent.tiles[child.blank]]
+        return row[parent.blank] - row[child.blank]
+
+    @property
+    def matrix(self):
+        """The cost table as a (tiles, indices) NumPy array, built on first use"""
+        if self._matrix is None:
+            if np is None:
+                raise ImportError("NumPy is required for batch heuristic evaluation")
+            self._matrix = np.array(self.table, dtype=np.int32)
+        return self._matrix
+
+    def batch(self, encoded):
+        """
+        Batch path: score a (count, size*size) array of encoded states in one vectorized call.
+        Returns an int array of length count.
+        """
+        matrix = self.matrix
+        encoded = np.asarray(encoded)
+        return matrix[encoded, np.arange(encoded.shape[1])].sum(axis=1)
+
+    def score_states(self, states):
+        """Score a list of PuzzleStates, vectorized when NumPy is available"""
+        if np is None:
+            return [self(state) for state in states]
+        return self.batch(encode_states(states)).tolist()
+
+
+@lru_cache(maxsize=32)
+def _compile(name, goal_tiles, size):
+    return CompiledHeuristic(name, goal_tiles, size)
+
+
+def compile_heuristic(name, goal):
+    """
+    Compile (or fetch the cached) heuristic called name for the goal PuzzleState.
+
+        name: One of TABLE_BUILDERS ('manhattan', 'misplaced')
+        goal: Goal PuzzleState
+    """
+    if name not in TABLE_BUILDERS:
+        raise ValueError(f"Unknown table heuristic: {name}")
+    return _compile(name, goal.tiles, goal.size)
@@ -0,0 +1,94 @@
+from collections import deque
+from functools import lru_cache
+
+# Walking distance tables grow combinatorially; beyond 4x4 they no longer fit in memory
+MAX_WALKING_DISTANCE_SIZE = 4
+
+
+@lru_cache(maxsize=8)
+def _walking_table(size, blank_line):
+    """
+    Breadth-first search over line-count matrices, starting from the goal.
+
+    A matrix entry counts[line * size + goal_line] is the number of tiles sitting in a
+    board line that belong to goal_line. A move slides one tile from a line next to
+    the blank's line into it. Returns {counts tuple: minimum number of moves}.
+    """
+    goal_counts = [0] * (size * size)
+    for line in range(size):
+        goal_counts[line * size + line] = size - 1 if line == blank_line else size
+    start = tuple(goal_counts)
+
+    table = {start: 0}
+    queue = deque([(start, blank_line)])
+    while queue:
+        counts, blank = queue.popleft()
+        distance = table[counts] + 1
+        for neighbour in (blank - 1, blank + 1):
+            if not 0 <= neighbour < size:
+                continue
+            for goal_line in range(size):
+                if counts[neighbour * size + goal_line] == 0:
+                    continue
+                # One tile of goal_line walks from the neighbouring line into the blank's line
+                moved = list(counts)
+                moved[neighbour * size + goal_line] -= 1
+                moved[blank * size + goal_line] += 1
+                moved = tuple(moved)
+                if moved not in table:
+                    table[moved] = distance
+                    queue.append((moved, neighbour))
+    return table
+
+
+class WalkingDistance:
+    """Walking distance tables compiled for one goal"""
+
+    def __init__(self, goal):
+        size = goal.size
+        if size > MAX_WALKING_DISTANCE_SIZE:
+            raise ValueError(f"Walking distance is only available up to {MAX_WALKING_DISTANCE_SIZE}x{MAX_WALKING_DISTANCE_SIZE} boards")
+        self.size = size
+        blank_row, blank_col = divmod(goal.tiles.index(0), size)
+        self.row_table = _walking_table(size, blank_row)
+        self.col_table = _walking_table(size, blank_col)
+
+        # Goal row and column of every tile
+        self.goal_row = [0] * (size * size)
+        self.goal_col = [0] * (size * size)
+        for index, value in enumerate(goal.tiles):
+            self.goal_row[value], self.goal_col[value] = divmod(index, size)
+
+    def __call__(self, state):
+        size = self.size
+        goal_row = self.goal_row
+        goal_col = self.goal_col
+        rows = [0] * (size * size)
+        cols = [0] * (size * size)
+        for index, value in enumerate(state.tiles):
+            if value != 0:
+                row, col = divmod(index, size)
+                rows[row * size + goal_row[value]] += 1
+                cols[col * size + goal_col[value]] += 1
+        return self.row_table[tuple(rows)] + self.col_table[tuple(cols)]
+
+
+@lru_cache(maxsize=16)
+def _compile(goal):
+    return WalkingDistance(goal)
+
+
+def walking_distance(state, goal):
+    """
+    Walking distance heuristic - vertical moves needed when tiles only have to reach
+    their goal row, plus horizontal moves needed when they only have to reach their
+    goal column. Both halves are exact distances in a relaxed puzzle, read from tables
+    built once per board size.
+
+        state: Current PuzzleState
+        goal: Goal PuzzleState
+
+    Returns:
+        Sum of the row and column walking distances
+    """
+    return _compile(goal)(state)
@@ -1,3 +1,5 @@
-from logic.puzzle_state import PuzzleState
+from logic.puzzle_state import PuzzleState, OPPOSITE
+from logic.moves import MoveEngine, neighbor_table
+from logic.ranking import rank_index, unrank_index, board_class, Bitset
 
-__all__ = ['PuzzleState']
\ No newline at end of file
+__all__ = ['PuzzleState', 'OPPOSITE', 'MoveEngine', 'neighbor_table', 'rank_index', 'unrank_index', 'board_class', 'Bitset']
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Move generation on a single mutable board.
+
+PuzzleState.get_successors builds a new state for every move, which dominates
+depth-first searches whose nodes live only until the search backtracks. MoveEngine
+instead keeps one bytearray and slides the blank in place, remembering the moves
+made so they can be undone:
+
+    engine = MoveEngine(start)
+    for code, target in engine.options():
+        engine.apply(code, target)
+        ...
+        engine.undo()
+
+The legal moves of every blank position are precomputed once per board size.
+options() leaves out the move that would undo the previous one, so a search never
+walks straight back to the parent. Moves are identified by the 2-bit codes of
+algorithms.arena: 0 Up, 1 Down, 2 Left, 3 Right.
+"""
+from functools import lru_cache
+
+from logic.puzzle_state import PuzzleState
+
+# Actions in the order of their move codes
+MOVES = ("Up", "Down", "Left", "Right")
+
+# Code of the move that undoes each move
+INVERSE = (1, 0, 3, 2)
+
+# Previous move of a board no move has been made on; prunes nothing
+NO_MOVE = 4
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(size):
+    """For every blank index, the (move code, index the blank moves to) pairs in successor order"""
+    table = []
+    for blank in range(size * size):
+        row, col = divmod(blank, size)
+        options = []
+        if row > 0:
+            options.append((0, blank - size))
+        if row < size - 1:
+            options.append((1, blank + size))
+        if col > 0:
+            options.append((2, blank - 1))
+        if col < size - 1:
+            options.append((3, blank + 1))
+        table.append(tuple(options))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def pruned_table(size):
+    """
+    table[blank][previous]: the moves of neighbor_table without the inverse of
+    previous, for previous in 0..3 or NO_MOVE
+    """
+    return tuple(
+        tuple(tuple(option for option in options if previous == NO_MOVE or option[0] != INVERSE[previous])
+              for previous in range(NO_MOVE + 1))
+        for options in neighbor_table(size))
+
+
+class MoveEngine:
+    """
+    One board changed in place by apply() and restored by undo().
+
+        board: The packed board as a bytearray; read it, but change it only through apply and undo
+        blank: Index of the empty tile
+        codes: Codes of the moves made since the start, oldest first
+    """
+    __slots__ = ('size', 'board', 'blank', 'codes', 'blanks', 'table')
+
+    def __init__(self, start):
+        self.size = start.size
+        self.board = bytearray(start.tiles)
+        self.blank = start.blank
+        self.codes = []
+        self.blanks = []  # Blank index before each move, to undo it
+        self.table = pruned_table(start.size)
+
+    def __len__(self):
+        """Number of moves made"""
+        return len(self.codes)
+
+    def options(self):
+        """(code, target) pairs of the legal moves, except the one undoing the last move"""
+        codes = self.codes
+        return self.table[self.blank][codes[-1] if codes else NO_MOVE]
+
+    def apply(self, code, target):
+        """Slide the tile at target into the blank"""
+        board = self.board
+        blank = self.blank
+        board[blank] = board[target]
+        board[target] = 0
+        self.blanks.append(blank)
+        self.codes.append(code)
+        self.blank = target
+
+    def undo(self):
+        """Take back the last move"""
+        board = self.board
+        target = self.blank
+        blank = self.blanks.pop()
+        self.codes.pop()
+        board[target] = board[blank]
+        board[blank] = 0
+        self.blank = blank
+
+    def key(self):
+        """The current board as bytes, usable as a dict key"""
+        return bytes(self.board)
+
+    def state(self):
+        """The current board as a new PuzzleState"""
+        return PuzzleState.from_tiles(bytes(self.board), self.size, self.blank)
+
+    def path(self):
+        """The moves made since the start as action names"""
+        return [MOVES[code] for code in self.codes]
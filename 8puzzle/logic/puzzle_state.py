@@ -1,149 +1,143 @@
+# The action that undoes each action
+OPPOSITE = {"Up": "Down", "Down": "Up", "Left": "Right", "Right": "Left"}
+
+
 class PuzzleState:
     """
     Class representing a state of the n-puzzle game.
-    The board is represented as a 2D list where 0 represents the empty space.
+    The board is packed row-major into a single bytes buffer where 0 represents the empty space.
+    The hash and the index of the empty tile are computed once and cached on the instance.
     """
+    __slots__ = ('tiles', 'size', 'blank', '_hash')
+
     def __init__(self, board, size):
         """
         Initialize a puzzle state with the given board configuration
             board: 2D list representing the puzzle state
             size: Size of the puzzle (3, 5, 7, ... for 8-puzzle)
         """
-        self.board = [row[:] for row in board]  # Create a deep copy of the board
+        self.tiles = bytes(value for row in board for value in row)  # Packed copy of the board
         self.size = size
-        self.empty_pos = self._find_empty_position()
-    
+        self.blank = self._find_empty_position()
+        self._hash = hash(self.tiles)
+
+    @classmethod
+    def from_tiles(cls, tiles, size, blank=None):
+        """
+        Build a state directly from a packed row-major buffer without copying rows
+            tiles: bytes of length size*size
+            size: Size of the puzzle
+            blank: Index of the empty tile, looked up when omitted
+        """
+        state = cls.__new__(cls)
+        state.tiles = tiles
+        state.size = size
+        state.blank = tiles.index(0) if blank is None else blank
+        state._hash = hash(tiles)
+        return state
+
     def _find_empty_position(self):
-        """Find the position of the empty tile (0)"""
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == 0:
-                    return (i, j)
-        raise ValueError("No empty position (0) found in the puzzle board")
-    
+        """Find the index of the empty tile (0) in the packed board"""
+        blank = self.tiles.find(0)
+        if blank < 0:
+            raise ValueError("No empty position (0) found in the puzzle board")
+        return blank
+
+    @property
+    def board(self):
+        """The board as a freshly built 2D list"""
+        size = self.size
+        return [list(self.tiles[i:i + size]) for i in range(0, size * size, size)]
+
+    @property
+    def empty_pos(self):
+        """(row, col) position of the empty tile"""
+        return divmod(self.blank, self.size)
+
+    def _slide(self, target):
+        """Return a new state with the empty tile swapped with the tile at index target"""
+        tiles = bytearray(self.tiles)
+        tiles[self.blank] = tiles[target]
+        tiles[target] = 0
+        return PuzzleState.from_tiles(bytes(tiles), self.size, target)
+
     def move_up(self):
         """
         Move the empty tile up if possible
         Returns a new state if the move is valid, None otherwise
         """
-        row, col = self.empty_pos
-        if row == 0:  # Can't move up if already at the top row
+        if self.blank < self.size:  # Can't move up if already at the top row
             return None
-            
-        # Create a new state with the same board
-        new_state = PuzzleState(self.board, self.size)
-        
-        # Swap the empty tile with the tile above it
-        new_state.board[row][col], new_state.board[row-1][col] = new_state.board[row-1][col], new_state.board[row][col]
-        
-        # Update the empty position
-        new_state.empty_pos = (row-1, col)
-        
-        return new_state
-    
+        return self._slide(self.blank - self.size)
+
     def move_down(self):
         """
         Move the empty tile down if possible
         Returns a new state if the move is valid, None otherwise
         """
-        row, col = self.empty_pos
-        if row == self.size - 1:  # Can't move down if already at the bottom row
+        if self.blank >= self.size * (self.size - 1):  # Can't move down if already at the bottom row
             return None
-            
-        # Create a new state with the same board
-        new_state = PuzzleState(self.board, self.size)
-        
-        # Swap the empty tile with the tile below it
-        new_state.board[row][col], new_state.board[row+1][col] = new_state.board[row+1][col], new_state.board[row][col]
-        
-        # Update the empty position
-        new_state.empty_pos = (row+1, col)
-        
-        return new_state
-    
+        return self._slide(self.blank + self.size)
+
     def move_left(self):
         """
         Move the empty tile left if possible
         Returns a new state if the move is valid, None otherwise
         """
-        row, col = self.empty_pos
-        if col == 0:  # Can't move left if already at the leftmost column
+        if self.blank % self.size == 0:  # Can't move left if already at the leftmost column
             return None
-            
-        # Create a new state with the same board
-        new_state = PuzzleState(self.board, self.size)
-        
-        # Swap the empty tile with the tile to its left
-        new_state.board[row][col], new_state.board[row][col-1] = new_state.board[row][col-1], new_state.board[row][col]
-        
-        # Update the empty position
-        new_state.empty_pos = (row, col-1)
-        
-        return new_state
-    
+        return self._slide(self.blank - 1)
+
     def move_right(self):
         """
         Move the empty tile right if possible
         Returns a new state if the move is valid, None otherwise
         """
-        row, col = self.empty_pos
-        if col == self.size - 1:  # Can't move right if already at the rightmost column
+        if self.blank % self.size == self.size - 1:  # Can't move right if already at the rightmost column
             return None
-            
-        # Create a new state with the same board
-        new_state = PuzzleState(self.board, self.size)
-        
-        # Swap the empty tile with the tile to its right
-        new_state.board[row][col], new_state.board[row][col+1] = new_state.board[row][col+1], new_state.board[row][col]
-        
-        # Update the empty position
-        new_state.empty_pos = (row, col+1)
-        
-        return new_state
-    
+        return self._slide(self.blank + 1)
+
     def get_successors(self):
         """
         Get all possible next states by trying all valid moves
         Returns a list of (action, state) pairs
         """
         successors = []
-        
+        size = self.size
+        blank = self.blank
+        row, col = divmod(blank, size)
+
         # Try all four possible moves
-        up_state = self.move_up()
-        if up_state:
-            successors.append(("Up", up_state))
-            
-        down_state = self.move_down()
-        if down_state:
-            successors.append(("Down", down_state))
-            
-        left_state = self.move_left()
-        if left_state:
-            successors.append(("Left", left_state))
-            
-        right_state = self.move_right()
-        if right_state:
-            successors.append(("Right", right_state))
-            
+        if row > 0:
+            successors.append(("Up", self._slide(blank - size)))
+        if row < size - 1:
+            successors.append(("Down", self._slide(blank + size)))
+        if col > 0:
+            successors.append(("Left", self._slide(blank - 1)))
+        if col < size - 1:
+            successors.append(("Right", self._slide(blank + 1)))
+
         return successors
-    
+
     def __eq__(self, other):
         """Check if two puzzle states are equal"""
         if not isinstance(other, PuzzleState):
             return False
-        return self.board == other.board
-    
+        return self.tiles == other.tiles
+
     def __hash__(self):
         """Hash function for using PuzzleState in sets and as dictionary keys"""
-        return hash(self.to_tuple())
-    
+        return self._hash
+
     def to_tuple(self):
-        """Convert the board to a tuple of tuples for hashing"""
-        return tuple(tuple(row) for row in self.board)
-    
+        """Convert the board to a tuple of tuples (prefer the packed tiles as a key)"""
+        tiles = self.tiles
+        size = self.size
+        return tuple(tuple(tiles[i:i + size]) for i in range(0, size * size, size))
+
     def __str__(self):
         """String representation of the puzzle state"""
         result = ""
         for row in self.board:
             result += " ".join(str(x) for x in row) + "\n"
-        return result
\ No newline at end of file
+        return result
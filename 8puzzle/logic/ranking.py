@@ -0,0 +1,112 @@
+"""
+Permutation ranking for n-puzzle boards.
+
+A board is split into the index of the empty tile and the sequence of the other
+tiles in reading order. The sequence is ranked by its Lehmer code. Boards that
+can reach each other share the parity of that sequence (adjusted by the blank's
+row on even-width boards), and the two sequences that differ only in their last
+two tiles have consecutive ranks and opposite parities, so halving the rank gives
+a perfect hash of one reachability class:
+
+    index = blank * (cells - 1)! / 2 + lehmer_rank(sequence) // 2
+
+which numbers the 9!/2 = 181,440 reachable 3x3 boards 0..181,439.
+"""
+from math import factorial
+from functools import lru_cache
+
+# Largest board whose whole state space fits comfortably in flat arrays
+MAX_RANKED_SIZE = 3
+
+
+def can_rank(size):
+    """True if per-state arrays for this board size are small enough to allocate"""
+    return size <= MAX_RANKED_SIZE
+
+
+def state_count(size):
+    """Number of boards in one reachability class"""
+    return factorial(size * size) // 2
+
+
+def board_class(tiles, size):
+    """
+    Reachability class (0 or 1) of a packed board.
+    Two boards of one size can reach each other exactly when their classes match.
+    """
+    inversions = 0
+    seen = 0
+    for value in tiles:
+        if value:
+            # Tiles already seen that are larger than value each form an inversion
+            inversions += (seen >> value).bit_count()
+            seen |= 1 << value
+    if size % 2 == 0:
+        inversions += tiles.index(0) // size
+    return inversions & 1
+
+
+@lru_cache(maxsize=None)
+def _bases(size):
+    """
+    (cells - 1)! / 2, the number of sequence ranks per blank position, and the
+    factorial bases of the Lehmer digits, most significant first
+    """
+    length = size * size - 1
+    return factorial(length) // 2, tuple(factorial(length - 1 - i) for i in range(length))
+
+
+def rank_index(tiles, size):
+    """Index of a packed board within its reachability class"""
+    rank = 0
+    seen = 0
+    remaining = len(tiles) - 1
+    for value in tiles.replace(b"\x00", b""):
+        bit = 1 << value
+        # Lehmer digit: how many smaller tiles are still unused
+        rank = rank * remaining + value - 1 - (seen & (bit - 1)).bit_count()
+        remaining -= 1
+        seen |= bit
+    return tiles.index(0) * _bases(size)[0] + (rank >> 1)
+
+
+def unrank_index(index, size, klass):
+    """
+    Packed board with the given index in reachability class klass.
+    Inverse of rank_index for boards with board_class(tiles, size) == klass.
+    """
+    half_count, digit_bases = _bases(size)
+    blank, half = divmod(index, half_count)
+
+    # Lehmer digits of the even rank 2 * half
+    rank = half * 2
+    digits = []
+    parity = 0
+    for base in digit_bases:
+        digit, rank = divmod(rank, base)
+        digits.append(digit)
+        parity += digit
+
+    # The odd neighbour 2 * half + 1 only differs in the second-to-last digit
+    if size % 2 == 0:
+        parity += blank // size
+    if parity & 1 != klass:
+        digits[-2] = 1
+
+    available = list(range(1, size * size))
+    sequence = [available.pop(digit) for digit in digits]
+    sequence.insert(blank, 0)
+    return bytes(sequence)
+
+
+class Bitset:
+    """Fixed-size set of small non-negative integers backed by a bytearray"""
+
+    def __init__(self, count):
+        self.bits = bytearray((count + 7) >> 3)
+
+    def add(self, value):
+        self.bits[value >> 3] |= 1 << (value & 7)
+
+    def __contains__(self, value):
+        return self.bits[value >> 3] >> (value & 7) & 1 == 1
@@ -0,0 +1,26 @@
+"""Helpers for precomputed byte tables that are saved once and memory-mapped on load."""
+import os
+import mmap
+
+# Root directory for generated tables
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def load_table(path, expected_length):
+    """Memory-map a saved table read-only; returns None if it is missing or truncated"""
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size != expected_length:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+
+
+def save_table(path, table):
+    """Write a table atomically so concurrent builders never expose a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(table)
+    os.replace(temporary, path)
@@ -0,0 +1,24 @@
+import os
+import sys
+import random
+
+# The packages live next to this directory and are imported as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.registry import goal_state
+
+
+def scramble(size, moves, seed):
+    """Board reached from the goal by moves random moves"""
+    rng = random.Random(seed)
+    state = goal_state(size)
+    for _ in range(moves):
+        _, state = rng.choice(state.get_successors())
+    return state
+
+
+def follow(state, path):
+    """Board reached by making the moves of path from state"""
+    for action in path:
+        state = dict(state.get_successors())[action]
+    return state
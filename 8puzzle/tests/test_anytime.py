@@ -0,0 +1,45 @@
+import pytest
+
+from algorithms.astar import astar, anytime_astar
+from algorithms.registry import goal_state
+from heuristics.manhattan import heuristic_manhattan
+from conftest import scramble, follow
+
+
+@pytest.mark.parametrize("size, seed", [(3, 0), (3, 1), (4, 2), (4, 3)])
+def test_bounds_fall_to_the_optimum(size, seed):
+    goal = goal_state(size)
+    start = scramble(size, 60, seed)
+    optimal = len(astar(start, goal, heuristic_manhattan)[0])
+    solutions = list(anytime_astar(start, goal, heuristic_manhattan))
+    assert solutions
+    previous_length, previous_bound, previous_expansions = float('inf'), float('inf'), 0
+    for path, bound, expansions in solutions:
+        assert follow(start, path) == goal
+        assert len(path) <= bound * optimal + 1e-9
+        assert len(path) <= previous_length
+        assert bound <= previous_bound
+        assert expansions >= previous_expansions
+        previous_length, previous_bound, previous_expansions = len(path), bound, expansions
+    assert previous_bound == 1
+    assert previous_length == optimal
+
+
+def test_expansion_budget_stops_early():
+    goal = goal_state(4)
+    start = scramble(4, 60, 2)
+    solutions = list(anytime_astar(start, goal, heuristic_manhattan, max_expansions=1))
+    assert len(solutions) <= 1
+    for _, bound, _ in solutions:
+        assert bound >= 1
+
+
+@pytest.mark.parametrize("weight", [1.5, 2, 3])
+def test_weighted_paths_within_the_bound(weight):
+    goal = goal_state(4)
+    for seed in range(4):
+        start = scramble(4, 60, seed)
+        optimal = len(astar(start, goal, heuristic_manhattan)[0])
+        path, _ = astar(start, goal, heuristic_manhattan, weight=weight)
+        assert follow(start, path) == goal
+        assert len(path) <= weight * optimal
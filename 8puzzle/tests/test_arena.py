@@ -0,0 +1,93 @@
+from algorithms.arena import NodeArena, NO_PARENT, INITIAL_SLOTS
+from algorithms.registry import goal_state
+from logic.puzzle_state import OPPOSITE
+from conftest import follow
+
+
+def breadth_first(arena, start, count):
+    """
+    Add boards breadth-first from start until count are stored, through every insertion
+    path of the arena; returns a dict reference of tiles -> (parent tiles, cost, action)
+    """
+    reference = {start.tiles: (None, 0, None)}
+    arena.add(start.tiles, NO_PARENT, 0, None)
+    layer = [start]
+    while len(reference) < count:
+        next_layer = []
+        for state in layer:
+            node = arena.get(state.tiles)
+            cost = reference[state.tiles][1] + 1
+            for number, (action, child) in enumerate(state.get_successors()):
+                if child.tiles in reference:
+                    assert arena.get(child.tiles) is not None
+                    assert arena.discover(child.tiles, node, cost, action) is None
+                    continue
+                reference[child.tiles] = (state.tiles, cost, action)
+                next_layer.append(child)
+                # Alternate between add after a missed get, a cold add and discover
+                if number % 3 == 0:
+                    assert arena.get(child.tiles) is None
+                    arena.add(child.tiles, node, cost, action)
+                elif number % 3 == 1:
+                    arena.add(child.tiles, node, cost, action)
+                else:
+                    assert arena.discover(child.tiles, node, cost, action) is not None
+        layer = next_layer
+    return reference
+
+
+def reference_path(reference, tiles):
+    path = []
+    while reference[tiles][0] is not None:
+        parent, _, action = reference[tiles]
+        path.append(action)
+        tiles = parent
+    path.reverse()
+    return path
+
+
+def test_index_survives_several_grows():
+    goal = goal_state(4)
+    arena = NodeArena(4)
+    reference = breadth_first(arena, goal, 10000)
+    assert len(arena.slots) >= INITIAL_SLOTS * 8
+    assert len(arena) == len(reference)
+
+    for tiles, (_, cost, action) in reference.items():
+        node = arena.get(tiles)
+        assert node is not None
+        assert arena.tiles(node) == tiles
+        assert arena.costs[node] == cost
+        assert arena.path(node) == reference_path(reference, tiles)
+        assert follow(goal, arena.path(node)).tiles == tiles
+
+    # Boards never added are not found, whatever slot they hash to
+    missing = bytes(reversed(goal.tiles))
+    assert missing not in reference
+    assert arena.get(missing) is None
+    assert missing not in arena
+
+
+def test_update_reparents():
+    goal = goal_state(3)
+    arena = NodeArena(3)
+    reference = breadth_first(arena, goal, 3000)
+
+    # Re-parent every board with two neighbours one move closer to the goal onto the
+    # other one, as a search finding another path of equal cost would
+    updated = 0
+    for tiles, (parent, cost, _) in list(reference.items()):
+        state = arena.state(arena.get(tiles))
+        for action, neighbour in state.get_successors():
+            if neighbour.tiles != parent and reference.get(neighbour.tiles, (None, None))[1] == cost - 1:
+                back = OPPOSITE[action]
+                arena.update(arena.get(tiles), arena.get(neighbour.tiles), cost, back)
+                reference[tiles] = (neighbour.tiles, cost, back)
+                updated += 1
+                break
+    assert updated
+
+    for tiles in reference:
+        node = arena.get(tiles)
+        assert arena.path(node) == reference_path(reference, tiles)
+        assert follow(goal, arena.path(node)).tiles == tiles
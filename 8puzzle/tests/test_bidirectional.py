@@ -0,0 +1,61 @@
+import pytest
+
+from algorithms.astar import astar, bidirectional_astar
+from algorithms.bfs import bidirectional_bfs
+from algorithms.distance_table import table_solve
+from algorithms.registry import goal_state
+from heuristics.manhattan import heuristic_manhattan
+from heuristics.linear_conflict import linear_conflict
+from heuristics.pdb import pattern_database
+from conftest import scramble, follow
+
+
+def bidirectional_manhattan(start, goal):
+    return bidirectional_astar(start, goal, heuristic_manhattan)
+
+
+def bidirectional_linear_conflict(start, goal):
+    return bidirectional_astar(start, goal, linear_conflict)
+
+
+SEARCHES = [bidirectional_bfs, bidirectional_manhattan, bidirectional_linear_conflict]
+
+
+@pytest.mark.parametrize("search", SEARCHES)
+def test_paths_are_shortest_on_3x3(search):
+    goal = goal_state(3)
+    for seed in range(8):
+        start = scramble(3, 60, seed)
+        path, expansions = search(start, goal)
+        assert follow(start, path) == goal
+        assert len(path) == len(table_solve(start, goal)[0])
+        assert expansions > 0
+
+
+@pytest.mark.parametrize("search", SEARCHES)
+def test_paths_are_shortest_on_4x4(search):
+    goal = goal_state(4)
+    for seed in range(4):
+        start = scramble(4, 20, seed)
+        path, _ = search(start, goal)
+        assert follow(start, path) == goal
+        assert len(path) == len(astar(start, goal, heuristic_manhattan)[0])
+
+
+@pytest.mark.parametrize("search", SEARCHES)
+def test_start_is_goal(search):
+    goal = goal_state(3)
+    assert search(goal, goal)[0] == []
+
+
+def test_max_depth_cutoff():
+    goal = goal_state(3)
+    start = scramble(3, 60, 1)
+    optimal = len(table_solve(start, goal)[0])
+    assert len(bidirectional_bfs(start, goal, max_depth=optimal)[0]) == optimal
+    assert bidirectional_bfs(start, goal, max_depth=optimal - 1)[0] == []
+
+
+def test_rejects_inconsistent_heuristics():
+    with pytest.raises(ValueError):
+        bidirectional_astar(scramble(3, 20, 0), goal_state(3), pattern_database)
@@ -0,0 +1,163 @@
+import threading
+
+import pytest
+
+from algorithms.cache import SolutionCache, cached
+from algorithms.astar import astar
+from algorithms.registry import goal_state
+from heuristics.manhattan import heuristic_manhattan
+from conftest import scramble, follow
+
+
+def boards_along(start, path):
+    """Every board on path from start, start included"""
+    boards = [start]
+    for action in path:
+        boards.append(dict(boards[-1].get_successors())[action])
+    return boards
+
+
+def test_suffix_hits():
+    goal = goal_state(3)
+    start = scramble(3, 60, 0)
+    path, _ = astar(start, goal, heuristic_manhattan)
+    cache = SolutionCache()
+    cache.put(start, path, goal)
+    assert len(cache) == len(path) + 1
+    for offset, board in enumerate(boards_along(start, path)):
+        assert cache.get(board, goal) == path[offset:]
+    assert cache.hits == len(path) + 1
+    assert cache.get(scramble(3, 61, 1), goal) is None
+    assert cache.misses == 1
+
+
+def test_hits_are_copies():
+    goal = goal_state(3)
+    start = scramble(3, 20, 2)
+    path, _ = astar(start, goal, heuristic_manhattan)
+    cache = SolutionCache()
+    cache.put(start, path, goal)
+    cache.get(start, goal).append("Up")
+    assert cache.get(start, goal) == path
+
+
+def test_lru_eviction():
+    # A goal's own empty path indexes exactly one entry
+    goals = [goal_state(3)] + [state for _, state in goal_state(3).get_successors()]
+    goals.append(scramble(3, 12, 5))
+    assert len({goal.tiles for goal in goals}) == 4
+    cache = SolutionCache(max_entries=3)
+    for goal in goals[:3]:
+        cache.put(goal, [], goal)
+    assert len(cache) == 3 and cache.evictions == 0
+    # Touch the first so the second becomes the least recently used
+    assert cache.get(goals[0], goals[0]) == []
+    cache.put(goals[3], [], goals[3])
+    assert len(cache) == 3
+    assert cache.evictions == 1
+    assert cache.get(goals[1], goals[1]) is None
+    for goal in (goals[0], goals[2], goals[3]):
+        assert cache.get(goal, goal) == []
+
+
+def test_long_paths_evict_their_oldest_boards():
+    goal = goal_state(3)
+    start = scramble(3, 60, 9)
+    path, _ = astar(start, goal, heuristic_manhattan)
+    cache = SolutionCache(max_entries=5)
+    cache.put(start, path, goal)
+    assert len(cache) == 5
+    assert cache.evictions == len(path) + 1 - 5
+    # The boards nearest the goal were indexed last, so they are kept
+    boards = boards_along(start, path)
+    assert cache.get(boards[0], goal) is None
+    assert cache.get(boards[-5], goal) == path[-4:]
+
+
+def test_non_optimal_never_replaces_optimal():
+    goal = goal_state(3)
+    start = scramble(3, 30, 3)
+    optimal, _ = astar(start, goal, heuristic_manhattan)
+    detour = ["Up", "Down"] if "Up" in dict(start.get_successors()) else ["Down", "Up"]
+    longer = detour + optimal
+    cache = SolutionCache()
+    cache.put(start, optimal, goal, optimal=True)
+    cache.put(start, longer, goal, optimal=False)
+    assert cache.get(start, goal) == optimal
+    assert cache.get(start, goal, optimal=False) == optimal
+
+
+def test_optimal_lookups_ignore_non_optimal_entries():
+    goal = goal_state(3)
+    start = scramble(3, 30, 4)
+    path, _ = astar(start, goal, heuristic_manhattan, weight=3)
+    cache = SolutionCache()
+    cache.put(start, path, goal, optimal=False)
+    assert cache.get(start, goal) is None
+    assert cache.get(start, goal, optimal=False) == path
+    # An optimal path replaces the non-optimal one
+    best, _ = astar(start, goal, heuristic_manhattan)
+    cache.put(start, best, goal, optimal=True)
+    assert cache.get(start, goal) == best
+
+
+def test_put_checks_the_path():
+    goal = goal_state(3)
+    cache = SolutionCache()
+    with pytest.raises(ValueError):
+        cache.put(goal, ["Down"], goal)
+    with pytest.raises(ValueError):
+        cache.put(goal, ["Up"], goal)
+
+
+def test_clear_resets_counters():
+    goal = goal_state(3)
+    start = scramble(3, 20, 6)
+    cache = SolutionCache()
+    cache.put(start, astar(start, goal, heuristic_manhattan)[0], goal)
+    cache.get(start, goal)
+    cache.get(scramble(3, 21, 7), goal)
+    cache.clear()
+    assert cache.stats() == {'entries': 0, 'hits': 0, 'misses': 0, 'evictions': 0, 'stored': 0, 'hit_rate': 0.0}
+
+
+def test_cached_solver():
+    goal = goal_state(3)
+    start = scramble(3, 40, 8)
+    calls = []
+
+    def solver(start, goal, **options):
+        calls.append(options)
+        return astar(start, goal, heuristic_manhattan)
+
+    cache = SolutionCache()
+    solve = cached(solver, cache)
+    path, expansions = solve(start, goal)
+    assert expansions > 0
+    assert follow(start, path) == goal
+    # Any board on the stored path is now answered without calling the solver
+    middle = boards_along(start, path)[len(path) // 2]
+    assert solve(middle, goal) == (path[len(path) // 2:], 0)
+    assert len(calls) == 1
+
+
+def test_concurrent_puts_and_gets():
+    goal = goal_state(3)
+    starts = [scramble(3, 30, seed) for seed in range(8)]
+    paths = [astar(start, goal, heuristic_manhattan)[0] for start in starts]
+    cache = SolutionCache(max_entries=50)
+
+    def work():
+        for _ in range(20):
+            for start, path in zip(starts, paths):
+                cache.put(start, path, goal)
+                hit = cache.get(start, goal)
+                assert hit is None or len(hit) == len(path)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) <= 50
+    assert cache.stored == 4 * 20 * 8
@@ -0,0 +1,52 @@
+import pytest
+
+from algorithms.astar import astar
+from algorithms.bfs import bfs
+from algorithms.distance_table import table_solve, load_distance_table, UNREACHED
+from algorithms.registry import goal_state
+from heuristics.manhattan import heuristic_manhattan
+from logic.puzzle_state import PuzzleState
+from logic.ranking import rank_index
+from conftest import scramble, follow
+
+
+def test_paths_are_valid_and_shortest():
+    goal = goal_state(3)
+    for seed in range(20):
+        start = scramble(3, 80, seed)
+        path, expansions = table_solve(start, goal)
+        assert follow(start, path) == goal
+        assert len(path) == len(astar(start, goal, heuristic_manhattan)[0])
+        assert expansions == len(path)
+
+
+def test_agrees_with_bfs():
+    goal = goal_state(3)
+    for seed in range(3):
+        start = scramble(3, 30, seed)
+        assert len(table_solve(start, goal)[0]) == len(bfs(start, goal)[0])
+
+
+def test_start_is_goal():
+    goal = goal_state(3)
+    assert table_solve(goal, goal) == ([], 0)
+
+
+def test_other_class_has_no_path():
+    goal = goal_state(3)
+    # Swapping two tiles moves the board into the other reachability class
+    tiles = bytearray(goal.tiles)
+    tiles[0], tiles[1] = tiles[1], tiles[0]
+    assert table_solve(PuzzleState.from_tiles(bytes(tiles), 3), goal) == ([], 0)
+
+
+def test_every_board_of_the_class_is_reached():
+    table = bytes(load_distance_table(goal_state(3)))
+    assert UNREACHED not in table
+    assert max(table) == 31
+    assert table[rank_index(goal_state(3).tiles, 3)] == 0
+
+
+def test_larger_boards_are_rejected():
+    with pytest.raises(ValueError):
+        table_solve(scramble(4, 10, 0), goal_state(4))
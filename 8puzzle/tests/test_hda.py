@@ -0,0 +1,38 @@
+import pytest
+
+from algorithms.bfs import bfs
+from algorithms.hda import hda_star
+from algorithms.registry import goal_state
+from algorithms.stats import SearchStats
+from heuristics.manhattan import heuristic_manhattan
+from heuristics.pdb import pattern_database
+from conftest import scramble, follow
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_paths_are_shortest(workers):
+    goal = goal_state(3)
+    for seed in range(4):
+        start = scramble(3, 40, seed)
+        path, expansions = hda_star(start, goal, heuristic_manhattan, workers=workers, budget=64)
+        assert follow(start, path) == goal
+        assert len(path) == len(bfs(start, goal)[0])
+        assert expansions > 0
+
+
+def test_stats_cover_every_worker():
+    goal = goal_state(3)
+    stats = SearchStats()
+    hda_star(scramble(3, 40, 9), goal, heuristic_manhattan, workers=2, stats=stats)
+    assert len(stats.extra['worker_expansions']) == 2
+    assert sum(stats.extra['worker_expansions']) == stats.expanded
+
+
+def test_start_is_goal():
+    goal = goal_state(3)
+    assert hda_star(goal, goal, heuristic_manhattan, workers=2)[0] == []
+
+
+def test_rejects_inconsistent_heuristics():
+    with pytest.raises(ValueError):
+        hda_star(scramble(3, 20, 0), goal_state(3), pattern_database, workers=2)
@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from algorithms.registry import goal_state
+from heuristics.manhattan import heuristic_manhattan
+from heuristics.misplaced import misplaced_tiles
+from heuristics.linear_conflict import linear_conflict
+from heuristics.walking_distance import walking_distance, MAX_WALKING_DISTANCE_SIZE
+from heuristics.tables import compile_heuristic, encode_states
+from logic.puzzle_state import PuzzleState
+
+
+def random_walk(size, steps, seed):
+    """Yield (parent, child) pairs along a random walk from the goal"""
+    rng = random.Random(seed)
+    state = goal_state(size)
+    for _ in range(steps):
+        _, child = rng.choice(state.get_successors())
+        yield state, child
+        state = child
+
+
+def plain_manhattan(state, goal):
+    size = state.size
+    total = 0
+    for index, value in enumerate(state.tiles):
+        if value:
+            row, col = divmod(index, size)
+            goal_row, goal_col = divmod(goal.tiles.index(value), size)
+            total += abs(row - goal_row) + abs(col - goal_col)
+    return total
+
+
+def plain_misplaced(state, goal):
+    return sum(1 for value, wanted in zip(state.tiles, goal.tiles) if value and value != wanted)
+
+
+@pytest.mark.parametrize("heuristic, reference", [
+    (heuristic_manhattan, plain_manhattan),
+    (misplaced_tiles, plain_misplaced),
+])
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_delta_matches_full_recompute(heuristic, reference, size):
+    goal = goal_state(size)
+    for parent, child in random_walk(size, 300, size):
+        assert heuristic(child, goal) == reference(child, goal)
+        assert heuristic.delta(parent, child, goal) == reference(child, goal) - reference(parent, goal)
+
+
+@pytest.mark.parametrize("name, reference", [('manhattan', plain_manhattan), ('misplaced', plain_misplaced)])
+def test_compiled_tables_for_another_goal(name, reference):
+    # A goal with the blank in the middle, so the tables differ from the standard goal's
+    goal = PuzzleState.from_tiles(bytes([1, 2, 3, 4, 0, 5, 6, 7, 8]), 3)
+    compiled = compile_heuristic(name, goal)
+    assert compile_heuristic(name, goal) is compiled
+    rng = random.Random(7)
+    state = goal
+    for _ in range(300):
+        _, child = rng.choice(state.get_successors())
+        tile = state.tiles[child.blank]
+        assert compiled(child) == reference(child, goal)
+        assert compiled.tile_delta(tile, child.blank, state.blank) == reference(child, goal) - reference(state, goal)
+        state = child
+
+
+@pytest.mark.parametrize("name, reference", [('manhattan', plain_manhattan), ('misplaced', plain_misplaced)])
+def test_batch_matches_scalar(name, reference):
+    pytest.importorskip("numpy")
+    goal = goal_state(4)
+    states = [child for _, child in random_walk(4, 200, 11)]
+    compiled = compile_heuristic(name, goal)
+    assert compiled.batch(encode_states(states)).tolist() == [reference(state, goal) for state in states]
+    assert compiled.score_states(states) == [compiled(state) for state in states]
+
+
+def test_unknown_table_heuristic():
+    with pytest.raises(ValueError):
+        compile_heuristic('euclidean', goal_state(3))
+
+
+def distances_from(goal, max_depth):
+    """Exact distance of every board within max_depth moves of goal, by breadth-first search"""
+    distances = {goal: 0}
+    layer = [goal]
+    for depth in range(1, max_depth + 1):
+        next_layer = []
+        for state in layer:
+            for _, child in state.get_successors():
+                if child not in distances:
+                    distances[child] = depth
+                    next_layer.append(child)
+        layer = next_layer
+    return distances
+
+
+@pytest.mark.parametrize("size", [3, 4, 5])
+def test_linear_conflict_deltas_match_full_recompute(size):
+    goal = goal_state(size)
+    compiled = linear_conflict.compile(goal)
+    for parent, child in random_walk(size, 300, size):
+        change = linear_conflict(child, goal) - linear_conflict(parent, goal)
+        assert linear_conflict.delta(parent, child, goal) == change
+        board = bytearray(child.tiles)
+        tile = parent.tiles[child.blank]
+        assert compiled.move_delta(board, tile, child.blank, parent.blank) == change
+        assert board == child.tiles
+        assert linear_conflict(child, goal) >= plain_manhattan(child, goal)
+
+
+@pytest.mark.parametrize("heuristic", [linear_conflict, walking_distance])
+def test_admissible_near_the_goal(heuristic):
+    goal = goal_state(3)
+    for state, distance in distances_from(goal, 14).items():
+        assert heuristic(state, goal) <= distance
+
+
+def test_walking_distance_size_limit():
+    size = MAX_WALKING_DISTANCE_SIZE + 1
+    with pytest.raises(ValueError):
+        walking_distance(goal_state(size), goal_state(size))
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from logic.ranking import state_count, board_class, rank_index, unrank_index, Bitset
+from logic.puzzle_state import PuzzleState
+
+
+@pytest.mark.parametrize("size", [2, 3])
+def test_every_index_round_trips(size):
+    for klass in (0, 1):
+        for index in range(state_count(size)):
+            tiles = unrank_index(index, size, klass)
+            assert board_class(tiles, size) == klass
+            assert rank_index(tiles, size) == index
+
+
+def test_ranks_are_a_perfect_hash_of_one_class():
+    boards = {unrank_index(index, 3, 0) for index in range(state_count(3))}
+    assert len(boards) == state_count(3)
+
+
+@pytest.mark.parametrize("size", [4, 5])
+def test_random_boards_round_trip(size):
+    rng = random.Random(size)
+    for _ in range(500):
+        tiles = list(range(size * size))
+        rng.shuffle(tiles)
+        tiles = bytes(tiles)
+        index = rank_index(tiles, size)
+        assert 0 <= index < state_count(size)
+        assert unrank_index(index, size, board_class(tiles, size)) == tiles
+
+
+@pytest.mark.parametrize("size", [2, 3, 4])
+def test_moves_keep_the_class(size):
+    rng = random.Random(size)
+    state = PuzzleState.from_tiles(bytes(range(1, size * size)) + b"\x00", size, size * size - 1)
+    klass = board_class(state.tiles, size)
+    for _ in range(200):
+        _, state = rng.choice(state.get_successors())
+        assert board_class(state.tiles, size) == klass
+
+
+def test_bitset():
+    seen = Bitset(100)
+    for value in (0, 7, 8, 99):
+        seen.add(value)
+    assert [value for value in range(100) if value in seen] == [0, 7, 8, 99]
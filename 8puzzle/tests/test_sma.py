@@ -0,0 +1,63 @@
+import pytest
+
+from algorithms.astar import astar
+from algorithms.sma import sma_star, node_footprint
+from algorithms.registry import goal_state
+from algorithms.stats import SearchStats
+from heuristics.manhattan import heuristic_manhattan
+from heuristics.misplaced import misplaced_tiles
+from heuristics.pdb import PatternDatabase
+from conftest import scramble, follow
+
+
+@pytest.mark.parametrize("max_nodes", [None, 5000, 200, 60])
+@pytest.mark.parametrize("heuristic", [heuristic_manhattan, misplaced_tiles])
+def test_paths_are_shortest(heuristic, max_nodes):
+    goal = goal_state(3)
+    for seed in range(5):
+        start = scramble(3, 60, seed)
+        path, _ = sma_star(start, goal, heuristic, max_nodes=max_nodes)
+        assert follow(start, path) == goal
+        assert len(path) == len(astar(start, goal, heuristic_manhattan)[0])
+
+
+def test_never_holds_more_than_the_budget():
+    goal = goal_state(3)
+    stats = SearchStats()
+    path, _ = sma_star(scramble(3, 60, 1), goal, heuristic_manhattan, max_nodes=100, stats=stats)
+    assert path
+    assert stats.peak_open <= 100
+    assert stats.extra['evictions'] > 0
+
+
+def test_byte_budget_becomes_a_node_budget():
+    goal = goal_state(3)
+    stats = SearchStats()
+    sma_star(scramble(3, 60, 2), goal, heuristic_manhattan, max_bytes=150 * node_footprint(3), stats=stats)
+    assert stats.peak_open <= 150
+
+
+def test_budget_too_small_for_the_solution():
+    goal = goal_state(3)
+    start = scramble(3, 60, 3)
+    assert sma_star(start, goal, heuristic_manhattan, max_nodes=3)[0] == []
+
+
+def test_inconsistent_heuristic_stays_optimal(tmp_path):
+    # The additive pattern database is admissible but not consistent
+    goal = goal_state(3)
+    database = PatternDatabase(goal, directory=str(tmp_path))
+
+    def heuristic(state, goal):
+        return database(state)
+
+    for seed in range(5):
+        start = scramble(3, 60, seed)
+        path, _ = sma_star(start, goal, heuristic, max_nodes=200)
+        assert follow(start, path) == goal
+        assert len(path) == len(astar(start, goal, heuristic_manhattan)[0])
+
+
+def test_budget_must_hold_two_nodes():
+    with pytest.raises(ValueError):
+        sma_star(scramble(3, 10, 0), goal_state(3), heuristic_manhattan, max_nodes=1)
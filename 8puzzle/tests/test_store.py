@@ -0,0 +1,124 @@
+import random
+import multiprocessing
+
+import pytest
+
+from algorithms.store import SolutionStore, pack_path, unpack_path, stored
+from algorithms.astar import astar
+from algorithms.registry import goal_state
+from heuristics.manhattan import heuristic_manhattan
+from logic.moves import MOVES
+from conftest import scramble, follow
+
+
+@pytest.mark.parametrize("length", [0, 1, 3, 4, 5, 31, 80])
+def test_pack_round_trip(length):
+    rng = random.Random(length)
+    path = [rng.choice(MOVES) for _ in range(length)]
+    packed = pack_path(path)
+    assert len(packed) == (length + 3) // 4
+    assert unpack_path(packed, length) == path
+
+
+def test_empty_path_packs_to_nothing():
+    assert pack_path([]) == b""
+    assert unpack_path(b"", 0) == []
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SolutionStore(str(tmp_path / "solutions.sqlite"))
+    yield store
+    store.close()
+
+
+def test_put_and_get(store):
+    goal = goal_state(3)
+    start = scramble(3, 40, 0)
+    path, expansions = astar(start, goal, heuristic_manhattan)
+    assert store.get(start, goal, 'astar-manhattan') is None
+    store.put(start, goal, 'astar-manhattan', path, expansions, 0.5)
+    assert store.get(start, goal, 'astar-manhattan') == (path, expansions, 0.5)
+    # Entries are per algorithm and per goal
+    assert store.get(start, goal, 'bfs') is None
+    assert store.get(start, scramble(3, 10, 1), 'astar-manhattan') is None
+    assert len(store) == 1
+    assert store.stats()['hits'] == 1 and store.stats()['misses'] == 3
+
+
+def test_goal_itself_stores_an_empty_path(store):
+    goal = goal_state(3)
+    store.put(goal, goal, 'bfs', [])
+    assert store.get(goal, goal, 'bfs') == ([], 0, 0.0)
+
+
+def test_conflicting_put_only_replaces_a_longer_path(store):
+    goal = goal_state(3)
+    start = scramble(3, 40, 2)
+    best, _ = astar(start, goal, heuristic_manhattan)
+    detour = ["Up", "Down"] if "Up" in dict(start.get_successors()) else ["Down", "Up"]
+    longer = detour + best
+
+    store.put(start, goal, 'dfs', longer, 100, 1.0)
+    store.put(start, goal, 'dfs', best, 50, 2.0)
+    assert store.get(start, goal, 'dfs') == (best, 50, 2.0)
+    # A longer or equally long path leaves the entry alone
+    store.put(start, goal, 'dfs', longer, 10, 3.0)
+    store.put(start, goal, 'dfs', best, 20, 4.0)
+    assert store.get(start, goal, 'dfs') == (best, 50, 2.0)
+    assert len(store) == 1
+
+
+def test_persists_across_connections(tmp_path):
+    goal = goal_state(3)
+    start = scramble(3, 30, 3)
+    path, _ = astar(start, goal, heuristic_manhattan)
+    first = SolutionStore(str(tmp_path / "solutions.sqlite"))
+    first.put(start, goal, 'astar-manhattan', path, 7)
+    first.close()
+    second = SolutionStore(str(tmp_path / "solutions.sqlite"))
+    assert second.get(start, goal, 'astar-manhattan')[0] == path
+    second.close()
+
+
+def _write(database, seed):
+    goal = goal_state(3)
+    store = SolutionStore(database)
+    for offset in range(10):
+        start = scramble(3, 30, seed * 100 + offset)
+        store.put(start, goal, 'astar-manhattan', astar(start, goal, heuristic_manhattan)[0])
+    store.close()
+
+
+def test_concurrent_writers(tmp_path):
+    database = str(tmp_path / "solutions.sqlite")
+    SolutionStore(database).close()
+    processes = [multiprocessing.Process(target=_write, args=(database, seed)) for seed in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    store = SolutionStore(database)
+    goal = goal_state(3)
+    for seed in range(3):
+        for offset in range(10):
+            start = scramble(3, 30, seed * 100 + offset)
+            hit = store.get(start, goal, 'astar-manhattan')
+            assert hit is not None and follow(start, hit[0]) == goal
+    store.close()
+
+
+def test_stored_solver(store):
+    goal = goal_state(3)
+    start = scramble(3, 40, 4)
+    calls = []
+
+    def solver(start, goal, **options):
+        calls.append(options)
+        return astar(start, goal, heuristic_manhattan)
+
+    solve = stored(solver, store, 'astar-manhattan')
+    first = solve(start, goal)
+    assert solve(start, goal) == first
+    assert len(calls) == 1
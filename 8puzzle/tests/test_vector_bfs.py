@@ -0,0 +1,75 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from algorithms.astar import astar
+from algorithms.bfs import bfs
+from algorithms.vector_bfs import vector_bfs, bfs_layers, encode_board, decode_boards
+from algorithms.registry import goal_state
+from heuristics.manhattan import heuristic_manhattan
+from logic.puzzle_state import PuzzleState
+from logic.ranking import state_count
+from conftest import scramble, follow
+
+
+def test_layers_enumerate_the_whole_3x3_class():
+    layers = list(bfs_layers(goal_state(3)))
+    assert sum(len(layer) for layer in layers) == state_count(3) == 181440
+    assert len(layers) == 32
+    # No board appears twice, within a layer or across layers
+    assert len(np.unique(np.concatenate(layers))) == 181440
+    for layer in layers:
+        assert np.all(layer[:-1] < layer[1:])
+
+
+def test_layers_match_bfs_distances():
+    goal = goal_state(3)
+    for depth, layer in enumerate(bfs_layers(goal, max_depth=8)):
+        for tiles in decode_boards(layer[:20], 3):
+            state = PuzzleState.from_tiles(bytes(tiles), 3)
+            assert len(bfs(state, goal)[0]) == depth
+
+
+@pytest.mark.parametrize("size, moves", [(2, 10), (3, 24)])
+def test_paths_match_bfs(size, moves):
+    goal = goal_state(size)
+    for seed in range(4):
+        start = scramble(size, moves, seed)
+        path, _ = vector_bfs(start, goal)
+        assert follow(start, path) == goal
+        assert len(path) == len(bfs(start, goal)[0])
+
+
+def test_paths_are_shortest_on_4x4():
+    goal = goal_state(4)
+    for seed in range(4):
+        start = scramble(4, 30, seed)
+        path, _ = vector_bfs(start, goal)
+        assert follow(start, path) == goal
+        assert len(path) == len(astar(start, goal, heuristic_manhattan)[0])
+
+
+def test_start_is_goal():
+    goal = goal_state(3)
+    assert vector_bfs(goal, goal)[0] == []
+
+
+def test_max_depth_cutoff():
+    goal = goal_state(3)
+    start = scramble(3, 60, 1)
+    optimal = len(astar(start, goal, heuristic_manhattan)[0])
+    assert len(vector_bfs(start, goal, max_depth=optimal)[0]) == optimal
+    assert vector_bfs(start, goal, max_depth=optimal - 1)[0] == []
+
+
+def test_encode_round_trip():
+    state = scramble(4, 50, 3)
+    decoded = decode_boards(np.array([encode_board(state.tiles)], dtype=np.uint64), 4)
+    assert bytes(decoded[0]) == state.tiles
+
+
+def test_larger_boards_are_rejected():
+    with pytest.raises(ValueError):
+        vector_bfs(scramble(5, 10, 0), goal_state(5))
+    with pytest.raises(ValueError):
+        next(bfs_layers(goal_state(5)))